@@ -50,7 +50,20 @@ class InterlisImporterExporter:
 
         self.current_progress = 0
 
-    def interlis_import(self, xtf_file_input, show_selection_dialog=False, logs_next_to_file=True):
+    def interlis_import(
+        self,
+        xtf_file_input,
+        show_selection_dialog=False,
+        logs_next_to_file=True,
+        fast_import=False,
+    ):
+        """
+        Imports a xtf file into TWW.
+
+        Args:
+            fast_import:    imports the core SIA405 classes with set-based SQL statements instead of the ORM,
+                            not available with the selection dialog which needs the imported objects in the session
+        """
         # Configure logging
         if logs_next_to_file:
             self.base_log_path = xtf_file_input
@@ -103,7 +116,9 @@ class InterlisImporterExporter:
         try:
             # Import from the temporary ili2pg model
             self._progress_done(40, "Converting to TEKSI Wastewater...")
-            tww_session = self._import_from_intermediate_schema(import_model)
+            tww_session = self._import_from_intermediate_schema(
+                import_model, fast_import=fast_import and not show_selection_dialog
+            )
 
             if show_selection_dialog:
                 self._progress_done(90, "Import objects selection...")
@@ -244,7 +259,7 @@ class InterlisImporterExporter:
                 log_path,
             )
 
-    def _import_from_intermediate_schema(self, import_model):
+    def _import_from_intermediate_schema(self, import_model, fast_import=False):
         log_handler = logging.FileHandler(
             make_log_path(self.base_log_path, "tww2ili-import"), mode="w", encoding="utf-8"
         )
@@ -259,6 +274,7 @@ class InterlisImporterExporter:
             model_classes_tww_od=self.model_classes_tww_od,
             model_classes_tww_vl=self.model_classes_tww_vl,
             callback_progress_done=self._progress_done_intermediate_schema,
+            fast_import=fast_import,
         )
 
         with LoggingHandlerContext(log_handler):
@@ -60,6 +60,10 @@ class InterlisExporterToIntermediateSchema:
         self.abwasser_session = None
         self.tid_maker = utils.ili2db.TidMaker(id_attribute="obj_id")
 
+        # Value list caches, code -> (value_de, vsacode) and vl_table -> code -> value_de
+        self.vl_codes = None
+        self.vl_codes_by_table = {}
+
         self.current_basket = None
         self.basket_topic_sia405_administration = None
         self.basket_topic_sia405_abwasser = None
@@ -482,8 +486,8 @@ class InterlisExporterToIntermediateSchema:
                 bemerkung=self.truncate(self.emptystr_to_null(row.remark), 255),
                 bezeichnung=self.null_to_emptystr(row.identifier),
                 kurzbezeichnung=row.identifier_short,
-                organisationstyp=self.get_vl(row.organisation_type__REL),
-                astatus=self.get_vl(row.status__REL),
+                organisationstyp=self.get_vl(row.organisation_type),
+                astatus=self.get_vl(row.status),
             )
             self.abwasser_session.add(organisation)
             print(".", end="")
@@ -503,14 +507,14 @@ class InterlisExporterToIntermediateSchema:
                 # --- abwasserbauwerk ---
                 **self.wastewater_structure_common(row, "kanal"),
                 # --- kanal ---
-                bettung_umhuellung=self.get_vl(row.bedding_encasement__REL),
-                funktionhierarchisch=self.get_vl(row.function_hierarchic__REL),
-                funktionhydraulisch=self.get_vl(row.function_hydraulic__REL),
-                nutzungsart_geplant=self.get_vl(row.usage_planned__REL),
-                nutzungsart_ist=self.get_vl(row.usage_current__REL),
+                bettung_umhuellung=self.get_vl(row.bedding_encasement),
+                funktionhierarchisch=self.get_vl(row.function_hierarchic),
+                funktionhydraulisch=self.get_vl(row.function_hydraulic),
+                nutzungsart_geplant=self.get_vl(row.usage_planned),
+                nutzungsart_ist=self.get_vl(row.usage_current),
                 rohrlaenge=row.pipe_length,
                 spuelintervall=row.jetting_interval,
-                verbindungsart=self.get_vl(row.connection_type__REL),
+                verbindungsart=self.get_vl(row.connection_type),
             )
             self.abwasser_session.add(kanal)
             print(".", end="")
@@ -531,9 +535,9 @@ class InterlisExporterToIntermediateSchema:
                 # --- normschacht ---
                 dimension1=row.dimension1,
                 dimension2=row.dimension2,
-                funktion=self.get_vl(row.function__REL),
-                material=self.get_vl(row.material__REL),
-                oberflaechenzulauf=self.get_vl(row.surface_inflow__REL),
+                funktion=self.get_vl(row.function),
+                material=self.get_vl(row.material),
+                oberflaechenzulauf=self.get_vl(row.surface_inflow),
             )
             self.abwasser_session.add(normschacht)
             print(".", end="")
@@ -553,7 +557,7 @@ class InterlisExporterToIntermediateSchema:
                 **self.wastewater_structure_common(row, "einleitstelle"),
                 # --- einleitstelle ---
                 hochwasserkote=row.highwater_level,
-                relevanz=self.get_vl(row.relevance__REL),
+                relevanz=self.get_vl(row.relevance),
                 terrainkote=row.terrain_level,
                 wasserspiegel_hydraulik=row.waterlevel_hydraulic,
             )
@@ -579,10 +583,10 @@ class InterlisExporterToIntermediateSchema:
                 **self.wastewater_structure_common(row, "spezialbauwerk"),
                 # --- spezialbauwerk ---
                 # TODO : WARNING : upper_elevation is not mapped
-                bypass=self.get_vl(row.bypass__REL),
-                funktion=self.get_vl(row.function__REL),
-                notueberlauf=self.get_vl(row.emergency_overflow__REL),
-                regenbecken_anordnung=self.get_vl(row.stormwater_tank_arrangement__REL),
+                bypass=self.get_vl(row.bypass),
+                funktion=self.get_vl(row.function),
+                notueberlauf=self.get_vl(row.emergency_overflow),
+                regenbecken_anordnung=self.get_vl(row.stormwater_tank_arrangement),
             )
             self.abwasser_session.add(spezialbauwerk)
             print(".", end="")
@@ -606,17 +610,17 @@ class InterlisExporterToIntermediateSchema:
                 **self.wastewater_structure_common(row, "versickerungsanlage"),
                 # --- versickerungsanlage ---
                 # TODO : NOT MAPPED : upper_elevation
-                art=self.get_vl(row.kind__REL),
-                beschriftung=self.get_vl(row.labeling__REL),
+                art=self.get_vl(row.kind),
+                beschriftung=self.get_vl(row.labeling),
                 dimension1=row.dimension1,
                 dimension2=row.dimension2,
                 gwdistanz=row.distance_to_aquifer,
-                maengel=self.get_vl(row.defects__REL),
-                notueberlauf=self.get_vl(row.emergency_overflow__REL),
-                saugwagen=self.get_vl(row.vehicle_access__REL),
+                maengel=self.get_vl(row.defects),
+                notueberlauf=self.get_vl(row.emergency_overflow),
+                saugwagen=self.get_vl(row.vehicle_access),
                 schluckvermoegen=row.absorption_capacity,
-                versickerungswasser=self.get_vl(row.seepage_utilization__REL),
-                wasserdichtheit=self.get_vl(row.watertightness__REL),
+                versickerungswasser=self.get_vl(row.seepage_utilization),
+                wasserdichtheit=self.get_vl(row.watertightness),
                 wirksameflaeche=row.effective_area,
             )
             self.abwasser_session.add(versickerungsanlage)
@@ -651,7 +655,7 @@ class InterlisExporterToIntermediateSchema:
                 bemerkung=self.truncate(self.emptystr_to_null(row.remark), 80),
                 bezeichnung=self.null_to_emptystr(row.identifier),
                 hoehenbreitenverhaeltnis=row.height_width_ratio,
-                profiltyp=self.get_vl(row.profile_type__REL),
+                profiltyp=self.get_vl(row.profile_type),
             )
             self.abwasser_session.add(rohrprofil)
             print(".", end="")
@@ -694,10 +698,10 @@ class InterlisExporterToIntermediateSchema:
                 abwassernetzelementref=self.check_fk_in_subsetid(
                     row.fk_wastewater_networkelement__REL
                 ),
-                auslaufform=self.get_vl(row.outlet_shape__REL),
+                auslaufform=self.get_vl(row.outlet_shape),
                 bemerkung=self.truncate(self.emptystr_to_null(row.remark), 80),
                 bezeichnung=self.null_to_emptystr(row.identifier),
-                hoehengenauigkeit=self.get_vl(row.elevation_accuracy__REL),
+                hoehengenauigkeit=self.get_vl(row.elevation_accuracy),
                 kote=row.level,
                 lage=ST_Force2D(row.situation3d_geometry),
                 lage_anschluss=row.position_of_connection,
@@ -777,17 +781,17 @@ class InterlisExporterToIntermediateSchema:
                 **self.wastewater_networkelement_common(row, "haltung"),
                 # --- haltung ---
                 # NOT MAPPED : elevation_determination
-                innenschutz=self.get_vl(row.inside_coating__REL),
+                innenschutz=self.get_vl(row.inside_coating),
                 laengeeffektiv=row.length_effective,
-                lagebestimmung=self.get_vl(row.horizontal_positioning__REL),
+                lagebestimmung=self.get_vl(row.horizontal_positioning),
                 lichte_hoehe=row.clear_height,
-                material=self.get_vl(row.material__REL),
+                material=self.get_vl(row.material),
                 nachhaltungspunktref=self.get_tid(row.fk_reach_point_to__REL),
                 plangefaelle=row.slope_building_plan,  # TODO : check, does this need conversion ?
                 reibungsbeiwert=row.coefficient_of_friction,
-                reliner_art=self.get_vl(row.relining_kind__REL),
-                reliner_bautechnik=self.get_vl(row.relining_construction__REL),
-                reliner_material=self.get_vl(row.reliner_material__REL),
+                reliner_art=self.get_vl(row.relining_kind),
+                reliner_bautechnik=self.get_vl(row.relining_construction),
+                reliner_material=self.get_vl(row.reliner_material),
                 reliner_nennweite=row.reliner_nominal_size,
                 ringsteifigkeit=row.ring_stiffness,
                 rohrprofilref=self.get_tid(row.fk_pipe_profile__REL),
@@ -811,7 +815,7 @@ class InterlisExporterToIntermediateSchema:
             haltung_alternativverlauf = self.model_classes_interlis.haltung_alternativverlauf(
                 **self.base_common(row, "haltung_alternativverlauf"),
                 # --- haltung_alternativverlauf ---
-                plantyp=self.get_vl(row.plantype__REL),
+                plantyp=self.get_vl(row.plantype),
                 verlauf=row.progression_geometry,
                 haltungref=self.get_tid(row.fk_reach__REL),
             )
@@ -889,7 +893,7 @@ class InterlisExporterToIntermediateSchema:
                 # --- bauwerksteil ---
                 **self.structure_part_common(row, "einstiegshilfe"),
                 # --- einstiegshilfe ---
-                art=self.get_vl(row.kind__REL),
+                art=self.get_vl(row.kind),
             )
             self.abwasser_session.add(einstiegshilfe)
             print(".", end="")
@@ -927,7 +931,7 @@ class InterlisExporterToIntermediateSchema:
                 # --- bauwerksteil ---
                 **self.structure_part_common(row, "trockenwetterrinne"),
                 # --- trockenwetterrinne ---
-                material=self.get_vl(row.material__REL),
+                material=self.get_vl(row.material),
             )
             self.abwasser_session.add(trockenwetterrinne)
             print(".", end="")
@@ -965,16 +969,16 @@ class InterlisExporterToIntermediateSchema:
                 # --- bauwerksteil ---
                 **self.structure_part_common(row, "deckel"),
                 # --- deckel ---
-                deckelform=self.get_vl(row.cover_shape__REL),
+                deckelform=self.get_vl(row.cover_shape),
                 durchmesser=row.diameter,
-                entlueftung=self.get_vl(row.venting__REL),
+                entlueftung=self.get_vl(row.venting),
                 fabrikat=row.brand,
                 kote=row.level,
                 lage=ST_Force2D(row.situation3d_geometry),
-                lagegenauigkeit=self.get_vl(row.positional_accuracy__REL),
-                material=self.get_vl(row.material__REL),
-                schlammeimer=self.get_vl(row.sludge_bucket__REL),
-                verschluss=self.get_vl(row.fastening__REL),
+                lagegenauigkeit=self.get_vl(row.positional_accuracy),
+                material=self.get_vl(row.material),
+                schlammeimer=self.get_vl(row.sludge_bucket),
+                verschluss=self.get_vl(row.fastening),
             )
             self.abwasser_session.add(deckel)
             print(".", end="")
@@ -1012,7 +1016,7 @@ class InterlisExporterToIntermediateSchema:
                 # --- bauwerksteil ---
                 **self.structure_part_common(row, "bankett"),
                 # --- bankett ---
-                art=self.get_vl(row.kind__REL),
+                art=self.get_vl(row.kind),
             )
             self.abwasser_session.add(bankett)
             print(".", end="")
@@ -1035,7 +1039,7 @@ class InterlisExporterToIntermediateSchema:
                 # FIELDS TO MAP TO ABWASSER.abwasserbauwerk_symbol
                 # --- abwasserbauwerk_symbol ---
                 **self.base_common(row, "abwasserbauwerk_symbol"),
-                plantyp=self.get_vl(row.plantype__REL),
+                plantyp=self.get_vl(row.plantype),
                 symbolskalierunghoch=row.symbol_scaling_height,
                 symbolskalierunglaengs=row.symbol_scaling_width,
                 symbolori=row.symbolori,
@@ -1092,7 +1096,7 @@ class InterlisExporterToIntermediateSchema:
                 bezeichnung=row.identifier,
                 art=row.kind,
                 nh4=row.nh4,
-                betreibertyp=self.get_vl(row.operator_type__REL),
+                betreibertyp=self.get_vl(row.operator_type),
                 einwohner_angeschlossen=row.population_connected,
                 einwohner_total=row.population_total,
                 bemerkung=self.truncate(self.emptystr_to_null(row.remark), 255),
@@ -1140,7 +1144,7 @@ class InterlisExporterToIntermediateSchema:
                 **self.vsa_base_common(row, "abwasserbehandlung"),
                 # --- abwasserbehandlung ---
                 bezeichnung=row.identifier,
-                art=self.get_vl(row.kind__REL),
+                art=self.get_vl(row.kind),
                 bemerkung=row.remark,
                 abwasserreinigungsanlageref=self.get_tid(row.fk_waste_water_treatment_plant__REL),
             )
@@ -1171,7 +1175,7 @@ class InterlisExporterToIntermediateSchema:
                 mischschlammvoreindickung=row.predensification_of_mixed_sludge,
                 primaerschlammvoreindickung=row.predensification_of_primary_sludge,
                 bemerkung=row.remark,
-                stabilisierung=self.get_vl(row.stabilisation__REL),
+                stabilisierung=self.get_vl(row.stabilisation),
                 entwaessertklaerschlammstapelung=row.stacking_of_dehydrated_sludge,
                 fluessigklaerschlammstapelung=row.stacking_of_liquid_sludge,
                 abwasserreinigungsanlageref=self.get_tid(row.fk_waste_water_treatment_plant__REL),
@@ -1195,7 +1199,7 @@ class InterlisExporterToIntermediateSchema:
                 # --- bauwerksteil ---
                 **self.wastewater_structure_common(row, "arabauwerk"),
                 # --- arabauwerk ---
-                art=self.get_vl(row.kind__REL),
+                art=self.get_vl(row.kind),
                 abwasserreinigungsanlageref=self.get_tid(row.fk_waste_water_treatment_plant__REL),
             )
             self.abwasser_session.add(arabauwerk)
@@ -1238,7 +1242,7 @@ class InterlisExporterToIntermediateSchema:
             abflusslose_toilette = self.model_classes_interlis.abflusslose_toilette(
                 **self.wastewater_structure_common(row, "abflusslose_toilette"),
                 # --- drainless_toilet ---
-                art=self.get_vl(row.kind__REL),
+                art=self.get_vl(row.kind),
             )
             self.abwasser_session.add(abflusslose_toilette)
             print(".", end="")
@@ -1262,17 +1266,17 @@ class InterlisExporterToIntermediateSchema:
             absperr_drosselorgan = self.model_classes_interlis.absperr_drosselorgan(
                 **self.vsa_base_common(row, "absperr_drosselorgan"),
                 # --- throttle_shut_off_unit ---
-                antrieb=self.get_vl(row.actuation__REL),
-                verstellbarkeit=self.get_vl(row.adjustability__REL),
-                steuerung=self.get_vl(row.control__REL),
+                antrieb=self.get_vl(row.actuation),
+                verstellbarkeit=self.get_vl(row.adjustability),
+                steuerung=self.get_vl(row.control),
                 querschnitt=row.cross_section,
                 wirksamer_qs=row.effective_cross_section,
                 bruttokosten=row.gross_costs,
                 bezeichnung=row.identifier,
-                art=self.get_vl(row.kind__REL),
+                art=self.get_vl(row.kind),
                 fabrikat=row.manufacturer,
                 bemerkung=row.remark,
-                signaluebermittlung=self.get_vl(row.signal_transmission__REL),
+                signaluebermittlung=self.get_vl(row.signal_transmission),
                 subventionen=row.subsidies,
                 drosselorgan_oeffnung_ist=row.throttle_unit_opening_current,
                 drosselorgan_oeffnung_ist_optimiert=row.throttle_unit_opening_current_optimized,
@@ -1302,7 +1306,7 @@ class InterlisExporterToIntermediateSchema:
                 # --- tank_emptying ---
                 leistung=row.flow,
                 bruttokosten=row.gross_costs,
-                art=self.get_vl(row.kind__REL),
+                art=self.get_vl(row.kind),
                 ersatzjahr=row.year_of_replacement,
                 absperr_drosselorganref=self.get_tid(row.fk_throttle_shut_off_unit__REL),
                 ueberlaufref=self.get_tid(row.fk_overflow__REL),
@@ -1328,7 +1332,7 @@ class InterlisExporterToIntermediateSchema:
                 **self.structure_part_common(row, "beckenreinigung"),
                 # --- tank_cleaning ---
                 bruttokosten=row.gross_costs,
-                art=self.get_vl(row.kind__REL),
+                art=self.get_vl(row.kind),
                 ersatzjahr=row.year_of_replacement,
             )
             self.abwasser_session.add(beckenreinigung)
@@ -1352,20 +1356,20 @@ class InterlisExporterToIntermediateSchema:
             biol_oekol_gesamtbeurteilung = self.model_classes_interlis.biol_oekol_gesamtbeurteilung(
                 **self.maintenance_event_common(row, "biol_oekol_gesamtbeurteilung"),
                 # --- bio_ecol_assessment ---
-                vergleich_letzte_untersuchung=self.get_vl(row.comparison_last__REL),
+                vergleich_letzte_untersuchung=self.get_vl(row.comparison_last),
                 datum_letzte_untersuchung=row.date_last_examen,
-                einfluss_hilfsindikatoren=self.get_vl(row.impact_auxiliary_indic__REL),
-                einfluss_aeusserer_aspekt=self.get_vl(row.impact_external_aspect__REL),
-                einfluss_makroinvertebraten=self.get_vl(row.impact_macroinvertebrates__REL),
-                einfluss_wasserpflanzen=self.get_vl(row.impact_water_plants__REL),
-                handlungsbedarf=self.get_vl(row.intervention_demand__REL),
-                immissionsorientierte_berechnung=self.get_vl(row.io_calculation__REL),
+                einfluss_hilfsindikatoren=self.get_vl(row.impact_auxiliary_indic),
+                einfluss_aeusserer_aspekt=self.get_vl(row.impact_external_aspect),
+                einfluss_makroinvertebraten=self.get_vl(row.impact_macroinvertebrates),
+                einfluss_wasserpflanzen=self.get_vl(row.impact_water_plants),
+                handlungsbedarf=self.get_vl(row.intervention_demand),
+                immissionsorientierte_berechnung=self.get_vl(row.io_calculation),
                 auslaufrohr_lichte_hoehe=row.outlet_pipe_clear_height,
                 q347=row.q347,
-                relevanzmatrix=self.get_vl(row.relevance_matrix__REL),
+                relevanzmatrix=self.get_vl(row.relevance_matrix),
                 relevantes_gefaelle=row.relevant_slope,
                 oberflaechengewaesser=row.surface_water_bodies,
-                gewaesserart=self.get_vl(row.kind_water_body__REL),
+                gewaesserart=self.get_vl(row.kind_water_body),
                 gewaesserspezifische_entlastungsfracht_nh4_n_ist=row.water_specific_discharge_freight_nh4_n_current,
                 gewaesserspezifische_entlastungsfracht_nh4_n_ist_optimiert=row.water_specific_discharge_freight_nh4_n_current_opt,
                 gewaesserspezifische_entlastungsfracht_nh4_n_geplant=row.water_specific_discharge_freight_nh4_n_planned,
@@ -1454,9 +1458,9 @@ class InterlisExporterToIntermediateSchema:
             einzelflaeche = self.model_classes_interlis.einzelflaeche(
                 **self.connection_object_common(row, "einzelflaeche"),
                 # --- individual_surface ---
-                funktion=self.get_vl(row.function__REL),
+                funktion=self.get_vl(row.function),
                 neigung=row.inclination,
-                befestigung=self.get_vl(row.pavement__REL),
+                befestigung=self.get_vl(row.pavement),
                 perimeter=row.perimeter_geometry,
             )
             self.abwasser_session.add(einzelflaeche)
@@ -1487,25 +1491,23 @@ class InterlisExporterToIntermediateSchema:
             einzugsgebiet = self.model_classes_interlis.einzugsgebiet(
                 **self.vsa_base_common(row, "einzugsgebiet"),
                 # --- catchment_area ---
-                direkteinleitung_in_gewaesser_ist=self.get_vl(row.direct_discharge_current__REL),
-                direkteinleitung_in_gewaesser_geplant=self.get_vl(
-                    row.direct_discharge_planned__REL
-                ),
+                direkteinleitung_in_gewaesser_ist=self.get_vl(row.direct_discharge_current),
+                direkteinleitung_in_gewaesser_geplant=self.get_vl(row.direct_discharge_planned),
                 abflussbeiwert_rw_ist=row.discharge_coefficient_rw_current,
                 abflussbeiwert_rw_geplant=row.discharge_coefficient_rw_planned,
                 abflussbeiwert_sw_ist=row.discharge_coefficient_ww_current,
                 abflussbeiwert_sw_geplant=row.discharge_coefficient_ww_planned,
-                entwaesserungssystem_ist=self.get_vl(row.drainage_system_current__REL),
-                entwaesserungssystem_geplant=self.get_vl(row.drainage_system_planned__REL),
+                entwaesserungssystem_ist=self.get_vl(row.drainage_system_current),
+                entwaesserungssystem_geplant=self.get_vl(row.drainage_system_planned),
                 bezeichnung=row.identifier,
-                versickerung_ist=self.get_vl(row.infiltration_current__REL),
-                versickerung_geplant=self.get_vl(row.infiltration_planned__REL),
+                versickerung_ist=self.get_vl(row.infiltration_current),
+                versickerung_geplant=self.get_vl(row.infiltration_planned),
                 perimeter=row.perimeter_geometry,
                 einwohnerdichte_ist=row.population_density_current,
                 einwohnerdichte_geplant=row.population_density_planned,
                 bemerkung=row.remark,
-                retention_ist=self.get_vl(row.retention_current__REL),
-                retention_geplant=self.get_vl(row.retention_planned__REL),
+                retention_ist=self.get_vl(row.retention_current),
+                retention_geplant=self.get_vl(row.retention_planned),
                 abflussbegrenzung_ist=row.runoff_limit_current,
                 abflussbegrenzung_geplant=row.runoff_limit_planned,
                 befestigungsgrad_rw_ist=row.seal_factor_rw_current,
@@ -1556,7 +1558,7 @@ class InterlisExporterToIntermediateSchema:
                 **self.structure_part_common(row, "elektrischeeinrichtung"),
                 # --- electric_equipment ---
                 bruttokosten=row.gross_costs,
-                art=self.get_vl(row.kind__REL),
+                art=self.get_vl(row.kind),
                 ersatzjahr=row.year_of_replacement,
             )
             self.abwasser_session.add(elektrischeeinrichtung)
@@ -1580,7 +1582,7 @@ class InterlisExporterToIntermediateSchema:
                 **self.structure_part_common(row, "elektromechanischeausruestung"),
                 # --- electromechanical_equipment ---
                 bruttokosten=row.gross_costs,
-                art=self.get_vl(row.kind__REL),
+                art=self.get_vl(row.kind),
                 ersatzjahr=row.year_of_replacement,
             )
             self.abwasser_session.add(elektromechanischeausruestung)
@@ -1605,8 +1607,8 @@ class InterlisExporterToIntermediateSchema:
                 # --- disposal ---
                 entsorgungsintervall_ist=row.disposal_interval_current,
                 entsorgungsintervall_soll=row.disposal_interval_nominal,
-                entsorgungsort_ist=self.get_vl(row.disposal_place_current__REL),
-                entsorgungsort_geplant=self.get_vl(row.disposal_place_planned__REL),
+                entsorgungsort_ist=self.get_vl(row.disposal_place_current),
+                entsorgungsort_geplant=self.get_vl(row.disposal_place_planned),
                 volumenabflusslosegrube=row.volume_pit_without_drain,
                 versickerungsanlageref=self.get_tid(row.fk_infiltration_installation__REL),
                 einleitstelleref=self.get_tid(row.fk_discharge_point__REL),
@@ -1629,7 +1631,7 @@ class InterlisExporterToIntermediateSchema:
             entwaesserungssystem = self.model_classes_interlis.entwaesserungssystem(
                 **self.zone_common(row, "entwaesserungssystem"),
                 # --- drainage_system ---
-                art=self.get_vl(row.kind__REL),
+                art=self.get_vl(row.kind),
                 perimeter=row.perimeter_geometry,
             )
             self.abwasser_session.add(entwaesserungssystem)
@@ -1655,7 +1657,7 @@ class InterlisExporterToIntermediateSchema:
                 dimensionierungswert=row.dimensioning_value,
                 bruttokosten=row.gross_costs,
                 anspringkote=row.overflow_level,
-                art=self.get_vl(row.kind__REL),
+                art=self.get_vl(row.kind),
                 ersatzjahr=row.year_of_replacement,
             )
             self.abwasser_session.add(feststoffrueckhalt)
@@ -1678,10 +1680,10 @@ class InterlisExporterToIntermediateSchema:
             foerderaggregat = self.model_classes_interlis.foerderaggregat(
                 **self.overflow_common(row, "foerderaggregat"),
                 # --- pump ---
-                bauart=self.get_vl(row.construction_type__REL),
+                bauart=self.get_vl(row.construction_type),
                 arbeitspunkt=row.operating_point,
-                aufstellungantrieb=self.get_vl(row.placement_of_actuation__REL),
-                aufstellungfoerderaggregat=self.get_vl(row.placement_of_pump__REL),
+                aufstellungantrieb=self.get_vl(row.placement_of_actuation),
+                aufstellungfoerderaggregat=self.get_vl(row.placement_of_pump),
                 foerderstrommax_einzel=row.pump_flow_max_single,
                 foerderstrommin_einzel=row.pump_flow_min_single,
                 kotestart=row.start_level,
@@ -1736,17 +1738,17 @@ class InterlisExporterToIntermediateSchema:
                 kirchesitzplaetze=row.church_seats,
                 campingflaeche=row.camping_area,
                 campinguebernachtungen=row.camping_lodgings,
-                anschlusspflicht=self.get_vl(row.connecting_obligation__REL),
-                anschlussara=self.get_vl(row.connection_wwtp__REL),
+                anschlusspflicht=self.get_vl(row.connecting_obligation),
+                anschlussara=self.get_vl(row.connection_wwtp),
                 gewerbebeschaeftigte=row.craft_employees,
                 schlafsaalbetten=row.dorm_beds,
                 schlafsaaluebernachtungen=row.dorm_overnight_stays,
-                entwaesserungsplan=self.get_vl(row.drainage_map__REL),
-                trinkwassernetzanschluss=self.get_vl(row.drinking_water_network__REL),
-                trinkwasserandere=self.get_vl(row.drinking_water_others__REL),
-                stromanschluss=self.get_vl(row.electric_connection__REL),
+                entwaesserungsplan=self.get_vl(row.drainage_map),
+                trinkwassernetzanschluss=self.get_vl(row.drinking_water_network),
+                trinkwasserandere=self.get_vl(row.drinking_water_others),
+                stromanschluss=self.get_vl(row.electric_connection),
                 veranstaltungbesucher=row.event_visitors,
-                funktion=self.get_vl(row.function__REL),
+                funktion=self.get_vl(row.function),
                 turnhalleflaeche=row.gym_area,
                 ferienuebernachtungen=row.holiday_accomodation,
                 spitalbetten=row.hospital_beds,
@@ -1758,7 +1760,7 @@ class InterlisExporterToIntermediateSchema:
                 einwohnerwerte=row.population_equivalent,
                 bemerkung=row.remark,
                 sanierungsdatum=row.renovation_date,
-                sanierungsbedarf=self.get_vl(row.renovation_necessity__REL),
+                sanierungsbedarf=self.get_vl(row.renovation_necessity),
                 raststaettesitzplaetze=row.restaurant_seats,
                 restaurantsitzplaetze_saalgarten=row.restaurant_seats_hall_garden,
                 restaurantsitzplaetze_permanent=row.restaurant_seats_permanent,
@@ -1930,18 +1932,18 @@ class InterlisExporterToIntermediateSchema:
                 # --- hydraulic_char_data ---
                 qan=row.qon,
                 bemerkung=row.remark,
-                astatus=self.get_vl(row.status__REL),
+                astatus=self.get_vl(row.status),
                 aggregatezahl=row.aggregate_number,
                 foerderhoehe_geodaetisch=row.delivery_height_geodaetic,
                 bezeichnung=row.identifier,
-                springt_an=self.get_vl(row.is_overflowing__REL),
-                hauptwehrart=self.get_vl(row.main_weir_kind__REL),
+                springt_an=self.get_vl(row.is_overflowing),
+                hauptwehrart=self.get_vl(row.main_weir_kind),
                 mehrbelastung=row.overcharge,
                 ueberlaufdauer=row.overflow_duration,
                 ueberlauffracht=row.overflow_freight,
                 ueberlaufhaeufigkeit=row.overflow_frequency,
                 ueberlaufmenge=row.overflow_volume,
-                pumpenregime=self.get_vl(row.pump_characteristics__REL),
+                pumpenregime=self.get_vl(row.pump_characteristics),
                 foerderstrommax=row.pump_flow_max,
                 foerderstrommin=row.pump_flow_min,
                 qab=row.q_discharge,
@@ -1966,9 +1968,9 @@ class InterlisExporterToIntermediateSchema:
                 **self.wastewater_structure_common(row, "klara"),
                 # --- small_treatment_plant ---
                 bewilligungsnummer=row.approval_number,
-                funktion=self.get_vl(row.function__REL),
+                funktion=self.get_vl(row.function),
                 anlagenummer=row.installation_number,
-                fernueberwachung=self.get_vl(row.remote_monitoring__REL),
+                fernueberwachung=self.get_vl(row.remote_monitoring),
             )
             self.abwasser_session.add(klara)
             print(".", end="")
@@ -1995,21 +1997,21 @@ class InterlisExporterToIntermediateSchema:
                 # --- farm ---
                 nutzflaechelandwirtschaft=row.agriculture_arable_surface,
                 guellegrubebemerkung=row.cesspit_comment,
-                guellegrubevolumen=self.get_vl(row.cesspit_volume__REL),
+                guellegrubevolumen=self.get_vl(row.cesspit_volume),
                 guellegrubevolumen_ist=row.cesspit_volume_current,
                 guellegrubevolumen_soll=row.cesspit_volume_nominal,
                 guellegrubevolumen_sw_behandelt=row.cesspit_volume_ww_treated,
                 guellegrubebewilligungsjahr=row.cesspit_year_of_approval,
-                konformitaet=self.get_vl(row.conformity__REL),
-                fortbestand=self.get_vl(row.continuance__REL),
+                konformitaet=self.get_vl(row.conformity),
+                fortbestand=self.get_vl(row.continuance),
                 fortbestandbemerkung=row.continuance_comment,
                 mistplatzflaeche_ist=row.dung_heap_area_current,
                 mistplatzflaeche_soll=row.dung_heap_area_nominal,
                 bemerkung=row.remark,
                 hirtenhuettebemerkung=row.shepherds_hut_comment,
                 hirtenhuetteegw=row.shepherds_hut_population_equivalent,
-                hirtenhuetteabwasser=self.get_vl(row.shepherds_hut_wastewater__REL),
-                stallvieh=self.get_vl(row.stable_cattle__REL),
+                hirtenhuetteabwasser=self.get_vl(row.shepherds_hut_wastewater),
+                stallvieh=self.get_vl(row.stable_cattle),
                 stallgrossvieheinheit_fremdvieh=row.stable_cattle_equivalent_other_cattle,
                 stallgrossvieheinheit_eigenesvieh=row.stable_cattle_equivalent_own_cattle,
                 gebaeudegrupperef=self.get_tid(row.fk_building_group__REL),
@@ -2035,7 +2037,7 @@ class InterlisExporterToIntermediateSchema:
                 **self.overflow_common(row, "leapingwehr"),
                 # --- leapingweir ---
                 laenge=row.length,
-                oeffnungsform=self.get_vl(row.opening_shape__REL),
+                oeffnungsform=self.get_vl(row.opening_shape),
                 breite=row.width,
             )
             self.abwasser_session.add(leapingwehr)
@@ -2054,15 +2056,15 @@ class InterlisExporterToIntermediateSchema:
                 # --- measure ---
                 datum_eingang=row.date_entry,
                 beschreibung=row.description,
-                kategorie=self.get_vl(row.category__REL),
+                kategorie=self.get_vl(row.category),
                 bezeichnung=row.identifier,
                 handlungsbedarf=row.intervention_demand,
                 linie=row.line_geometry,
                 verweis=row.link,
                 perimeter=row.perimeter_geometry,
-                prioritaet=self.get_vl(row.priority__REL),
+                prioritaet=self.get_vl(row.priority),
                 bemerkung=row.remark,
-                astatus=self.get_vl(row.status__REL),
+                astatus=self.get_vl(row.status),
                 symbolpos=row.symbolpos_geometry,
                 gesamtkosten=row.total_cost,
                 jahr_umsetzung_effektiv=row.year_implementation_effective,
@@ -2091,7 +2093,7 @@ class InterlisExporterToIntermediateSchema:
                 **self.vsa_base_common(row, "mechanischevorreinigung"),
                 # --- mechanical_pretreatment ---
                 bezeichnung=row.identifier,
-                art=self.get_vl(row.kind__REL),
+                art=self.get_vl(row.kind),
                 bemerkung=row.remark,
                 abwasserbauwerkref=self.get_tid(row.fk_wastewater_structure__REL),
             )
@@ -2119,7 +2121,7 @@ class InterlisExporterToIntermediateSchema:
                 seriennummer=row.serial_number,
                 fabrikat=row.brand,
                 bezeichnung=row.identifier,
-                art=self.get_vl(row.kind__REL),
+                art=self.get_vl(row.kind),
                 bemerkung=row.remark,
                 messstelleref=self.get_tid(row.fk_measuring_point__REL),
             )
@@ -2146,7 +2148,7 @@ class InterlisExporterToIntermediateSchema:
                 # --- measurement_series ---
                 dimension=row.dimension,
                 bezeichnung=row.identifier,
-                art=self.get_vl(row.kind__REL),
+                art=self.get_vl(row.kind),
                 bemerkung=row.remark,
                 messstelleref=self.get_tid(row.fk_measuring_point__REL),
                 abwassernetzelementref=self.get_tid(row.fk_wastewater_networkelement__REL),
@@ -2174,7 +2176,7 @@ class InterlisExporterToIntermediateSchema:
                 **self.vsa_base_common(row, "messresultat"),
                 # --- measurement_result ---
                 bezeichnung=row.identifier,
-                messart=self.get_vl(row.measurement_type__REL),
+                messart=self.get_vl(row.measurement_type),
                 messdauer=row.measuring_duration,
                 bemerkung=row.remark,
                 zeit=row.time,
@@ -2205,11 +2207,11 @@ class InterlisExporterToIntermediateSchema:
                 # --- measuring_point ---
                 # zweck is a valuelist
                 # zweck=row.purpose,
-                zweck=self.get_vl(row.purpose__REL),
+                zweck=self.get_vl(row.purpose),
                 bemerkung=row.remark,
                 # staukoerper is a valuelist
                 # staukoerper=row.damming_device,
-                staukoerper=self.get_vl(row.damming_device__REL),
+                staukoerper=self.get_vl(row.damming_device),
                 bezeichnung=row.identifier,
                 # here art is not a value list
                 art=row.kind,
@@ -2236,7 +2238,7 @@ class InterlisExporterToIntermediateSchema:
                 klasse=row.classname,
                 mutationsdatum=row.date_mutation,
                 aufnahmedatum=row.date_time,
-                art=self.get_vl(row.kind__REL),
+                art=self.get_vl(row.kind),
                 letzter_wert=row.last_value,
                 objekt=row.object,
                 aufnehmer=row.recorded_by,
@@ -2284,7 +2286,7 @@ class InterlisExporterToIntermediateSchema:
                 **self.vsa_base_common(row, "retentionskoerper"),
                 # --- retention_body ---
                 bezeichnung=row.identifier,
-                art=self.get_vl(row.kind__REL),
+                art=self.get_vl(row.kind),
                 bemerkung=row.remark,
                 retention_volumen=row.volume,
                 versickerungsanlageref=self.get_tid(row.fk_infiltration_installation__REL),
@@ -2346,7 +2348,7 @@ class InterlisExporterToIntermediateSchema:
                 **self.structure_part_common(row, "rueckstausicherung"),
                 # --- backflow_prevention ---
                 bruttokosten=row.gross_costs,
-                art=self.get_vl(row.kind__REL),
+                art=self.get_vl(row.kind),
                 ersatzjahr=row.year_of_replacement,
                 absperr_drosselorganref=self.get_tid(row.fk_throttle_shut_off_unit__REL),
                 foerderaggregatref=self.get_tid(row.fk_pump__REL),
@@ -2368,8 +2370,8 @@ class InterlisExporterToIntermediateSchema:
             stammkarte = self.model_classes_interlis.stammkarte(
                 **self.vsa_base_common(row, "stammkarte"),
                 # --- log_card ---
-                steuerung_fernwirkung=self.get_vl(row.control_remote_control__REL),
-                informationsquelle=self.get_vl(row.information_source__REL),
+                steuerung_fernwirkung=self.get_vl(row.control_remote_control),
+                informationsquelle=self.get_vl(row.information_source),
                 sachbearbeiter=row.person_in_charge,
                 bemerkung=row.remark,
                 paa_knotenref=self.get_tid(row.fk_pwwf_wastewater_node__REL),
@@ -2399,8 +2401,8 @@ class InterlisExporterToIntermediateSchema:
                 hydrueberfalllaenge=row.hydraulic_overflow_length,
                 kotemax=row.level_max,
                 kotemin=row.level_min,
-                ueberfallkante=self.get_vl(row.weir_edge__REL),
-                wehr_art=self.get_vl(row.weir_kind__REL),
+                ueberfallkante=self.get_vl(row.weir_edge),
+                wehr_art=self.get_vl(row.weir_kind),
             )
             self.abwasser_session.add(streichwehr)
             print(".", end="")
@@ -2417,7 +2419,7 @@ class InterlisExporterToIntermediateSchema:
                 **self.vsa_base_common(row, "ueberlaufcharakteristik"),
                 # --- overflow_char ---
                 bezeichnung=row.identifier,
-                kennlinie_typ=self.get_vl(row.kind_overflow_char__REL),
+                kennlinie_typ=self.get_vl(row.kind_overflow_char),
                 bemerkung=row.remark,
             )
             self.abwasser_session.add(ueberlaufcharakteristik)
@@ -2441,7 +2443,7 @@ class InterlisExporterToIntermediateSchema:
             unterhalt = self.model_classes_interlis.unterhalt(
                 **self.maintenance_event_common(row, "unterhalt"),
                 # --- maintenance ---
-                art=self.get_vl(row.kind__REL),
+                art=self.get_vl(row.kind),
             )
             self.abwasser_session.add(unterhalt)
             print(".", end="")
@@ -2459,7 +2461,7 @@ class InterlisExporterToIntermediateSchema:
             versickerungsbereich = self.model_classes_interlis.versickerungsbereich(
                 **self.zone_common(row, "versickerungsbereich"),
                 # --- infiltration_zone ---
-                versickerungsmoeglichkeit=self.get_vl(row.infiltration_capacity__REL),
+                versickerungsmoeglichkeit=self.get_vl(row.infiltration_capacity),
                 perimeter=row.perimeter_geometry,
             )
             self.abwasser_session.add(versickerungsbereich)
@@ -2484,7 +2486,7 @@ class InterlisExporterToIntermediateSchema:
                 # --- baseclass ---
                 **self.vsa_base_common(row, "untersuchung"),
                 # --- erhaltungsereignis ---
-                astatus=self.get_vl(row.status__REL),
+                astatus=self.get_vl(row.status),
                 ausfuehrende_firmaref=self.get_tid(row.fk_operating_company__REL),
                 ausfuehrender=row.operator,
                 bemerkung=self.truncate(self.emptystr_to_null(row.remark), 80),
@@ -2498,14 +2500,14 @@ class InterlisExporterToIntermediateSchema:
                 zeitpunkt=row.time_point,
                 # --- untersuchung ---
                 bispunktbezeichnung=row.to_point_identifier,
-                erfassungsart=self.get_vl(row.recording_type__REL),
+                erfassungsart=self.get_vl(row.recording_type),
                 fahrzeug=row.vehicle,
                 geraet=row.equipment,
                 haltungspunktref=self.get_tid(row.fk_reach_point__REL),
                 inspizierte_laenge=row.inspected_length,
                 videonummer=row.videonumber,
                 vonpunktbezeichnung=row.from_point_identifier,
-                witterung=self.get_vl(row.weather__REL),
+                witterung=self.get_vl(row.weather),
             )
             self.abwasser_session.add(untersuchung)
             print(".", end="")
@@ -2535,14 +2537,14 @@ class InterlisExporterToIntermediateSchema:
                 anmerkung=row.comments,
                 ansichtsparameter=row.view_parameters,
                 untersuchungref=self.get_tid(row.fk_examination__REL),
-                verbindung=self.get_vl(row.connection__REL),
+                verbindung=self.get_vl(row.connection),
                 videozaehlerstand=row.video_counter,
                 # --- normschachtschaden ---
                 distanz=row.manhole_distance,
                 quantifizierung1=row.manhole_quantification1,
                 quantifizierung2=row.manhole_quantification2,
-                schachtbereich=self.get_vl(row.manhole_shaft_area__REL),
-                schachtschadencode=self.get_vl(row.manhole_damage_code__REL),
+                schachtbereich=self.get_vl(row.manhole_shaft_area),
+                schachtschadencode=self.get_vl(row.manhole_damage_code),
                 schadenlageanfang=row.manhole_damage_begin,
                 schadenlageende=row.manhole_damage_end,
             )
@@ -2573,14 +2575,14 @@ class InterlisExporterToIntermediateSchema:
                 # --- schaden ---
                 anmerkung=row.comments,
                 ansichtsparameter=row.view_parameters,
-                einzelschadenklasse=self.get_vl(row.single_damage_class__REL),
+                einzelschadenklasse=self.get_vl(row.single_damage_class),
                 streckenschaden=row.damage_reach,
                 untersuchungref=self.get_tid(row.fk_examination__REL),
-                verbindung=self.get_vl(row.connection__REL),
+                verbindung=self.get_vl(row.connection),
                 videozaehlerstand=row.video_counter,
                 # --- kanalschaden ---
                 distanz=row.channel_distance,
-                kanalschadencode=self.get_vl(row.channel_damage_code__REL),
+                kanalschadencode=self.get_vl(row.channel_damage_code),
                 quantifizierung1=row.channel_quantification1,
                 quantifizierung2=row.channel_quantification2,
                 schadenlageanfang=row.channel_damage_begin,
@@ -2609,7 +2611,7 @@ class InterlisExporterToIntermediateSchema:
                 # --- vsa_baseclass ---
                 **self.vsa_base_common(row, "datentraeger"),
                 # --- datentraeger ---
-                art=self.get_vl(row.kind__REL),
+                art=self.get_vl(row.kind),
                 bemerkung=self.truncate(self.emptystr_to_null(row.remark), 80),
                 bezeichnung=self.null_to_emptystr(row.identifier),
                 pfad=row.path,
@@ -2652,7 +2654,7 @@ class InterlisExporterToIntermediateSchema:
                 # --- vsa_baseclass ---
                 **self.vsa_base_common(row, "datei"),
                 # --- datei ---
-                art=self.get_vl(row.kind__REL) or "andere",
+                art=self.get_vl(row.kind) or "andere",
                 bemerkung=self.truncate(self.emptystr_to_null(row.remark), 80),
                 bezeichnung=self.null_to_emptystr(row.identifier),
                 datentraegerref=self.get_tid(row.fk_data_media__REL),
@@ -2759,38 +2761,64 @@ class InterlisExporterToIntermediateSchema:
             return None
         return self.tid_maker.tid_for_row(relation)
 
-    def get_vl(self, relation):
+    def get_vl(self, code):
         """
-        Gets a literal value from a value list relation
+        Gets a literal value from a value list code
         """
-        if relation is None:
+        if code is None:
             return None
-        elif relation.code == relation.vsacode:
-            return relation.value_de
-        elif self.use_vsacode:
-            # use vsacode instead of code
 
-            vsacode_value_de = self.get_vl_by_code(
-                self.model_classes_tww_vl.value_list_base, relation.vsacode
+        if self.vl_codes is None:
+            self._load_vl_codes()
+
+        if code not in self.vl_codes:
+            logger.warning(
+                f'Could not find code `{code}` in value list "{self.model_classes_tww_vl.value_list_base.__table__.schema}.value_list_base". Setting to None instead.'
             )
-            if vsacode_value_de is None:
+            return None
+
+        value_de, vsacode = self.vl_codes[code]
+        if code == vsacode:
+            return value_de
+        elif self.use_vsacode:
+            # use vsacode instead of code
+            if vsacode not in self.vl_codes:
                 logger.warning(
-                    f"Code {relation.code}: Usage of vsacode returned none. Falling back to {relation.value_de}. This will probably cause validation errors",
+                    f"Code {code}: Usage of vsacode returned none. Falling back to {value_de}. This will probably cause validation errors",
                 )
-                return relation.value_de
-            return vsacode_value_de
+                return value_de
+            return self.vl_codes[vsacode][0]
         else:  # value list extension for other type
-            return relation.value_de
+            return value_de
 
     def get_vl_by_code(self, vl_table, vl_code):
-        instance = self.tww_session.query(vl_table).filter(vl_table.code == vl_code).first()
-        if instance is None:
+        if vl_code is None:
+            return None
+
+        if vl_table not in self.vl_codes_by_table:
+            self.vl_codes_by_table[vl_table] = dict(
+                self.tww_session.query(vl_table.code, vl_table.value_de)
+            )
+
+        if vl_code not in self.vl_codes_by_table[vl_table]:
             logger.warning(
                 f'Could not find code `{vl_code}` in value list "{vl_table.__table__.schema}.{vl_table.__name__}". Setting to None instead.'
             )
             return None
 
-        return instance.value_de
+        return self.vl_codes_by_table[vl_table][vl_code]
+
+    def _load_vl_codes(self):
+        """
+        Loads all the value list codes at once, value_list_base includes the rows of all the value lists
+        """
+        vl_table = self.model_classes_tww_vl.value_list_base
+        self.vl_codes = {
+            code: (value_de, vsacode)
+            for code, vsacode, value_de in self.tww_session.query(
+                vl_table.code, vl_table.vsacode, vl_table.value_de
+            )
+        }
 
     def null_to_emptystr(self, val):
         """
@@ -2950,9 +2978,9 @@ class InterlisExporterToIntermediateSchema:
         return {
             **self.vsa_base_common(row, type_name),
             "akten": row.records,
-            "astatus": self.get_vl(row.status__REL),
+            "astatus": self.get_vl(row.status),
             "baujahr": row.year_of_construction,
-            "baulicherzustand": self.get_vl(row.structure_condition__REL),
+            "baulicherzustand": self.get_vl(row.structure_condition),
             "baulos": row.contract_section,
             "bemerkung": self.truncate(self.emptystr_to_null(row.remark), 80),
             "betreiberref": self.get_tid(row.fk_operator__REL),
@@ -2961,15 +2989,15 @@ class InterlisExporterToIntermediateSchema:
             "detailgeometrie": ST_Force2D(row.detail_geometry3d_geometry),
             "eigentuemerref": eigentuemerref,
             "ersatzjahr": row.year_of_replacement,
-            "finanzierung": self.get_vl(row.financing__REL),
+            "finanzierung": self.get_vl(row.financing),
             "inspektionsintervall": row.inspection_interval,
-            "sanierungsbedarf": self.get_vl(row.renovation_necessity__REL),
+            "sanierungsbedarf": self.get_vl(row.renovation_necessity),
             "standortname": row.location_name,
             "subventionen": row.subsidies,
             "wbw_basisjahr": row.rv_base_year,
-            "wbw_bauart": self.get_vl(row.rv_construction_type__REL),
+            "wbw_bauart": self.get_vl(row.rv_construction_type),
             "wiederbeschaffungswert": row.replacement_value,
-            "zugaenglichkeit": self.get_vl(row.accessibility__REL),
+            "zugaenglichkeit": self.get_vl(row.accessibility),
         }
 
     def wastewater_networkelement_common(self, row, type_name):
@@ -2992,7 +3020,7 @@ class InterlisExporterToIntermediateSchema:
             "abwasserbauwerkref": self.get_tid(row.fk_wastewater_structure__REL),
             "bemerkung": self.truncate(self.emptystr_to_null(row.remark), 80),
             "bezeichnung": self.null_to_emptystr(row.identifier),
-            "instandstellung": self.get_vl(row.renovation_demand__REL),
+            "instandstellung": self.get_vl(row.renovation_demand),
         }
 
     def maintenance_event_common(self, row, type_name):
@@ -3010,7 +3038,7 @@ class InterlisExporterToIntermediateSchema:
             "ergebnis": row.result,
             "grund": row.reason,
             "kosten": row.cost,
-            "astatus": self.get_vl(row.status__REL),
+            "astatus": self.get_vl(row.status),
             "zeitpunkt": row.time_point,
             "ausfuehrende_firmaref": self.get_tid(row.fk_operating_company__REL),
             "massnahmeref": self.get_tid(row.fk_measure__REL),
@@ -3085,15 +3113,15 @@ class InterlisExporterToIntermediateSchema:
             **self.vsa_base_common(row, type_name),
             "bezeichnung": row.identifier,
             "bemerkung": row.remark,
-            "antrieb": self.get_vl(row.actuation__REL),
-            "verstellbarkeit": self.get_vl(row.adjustability__REL),
+            "antrieb": self.get_vl(row.actuation),
+            "verstellbarkeit": self.get_vl(row.adjustability),
             "fabrikat": row.brand,
-            "steuerung": self.get_vl(row.control__REL),
+            "steuerung": self.get_vl(row.control),
             "einleitstelle": row.discharge_point,
-            "funktion": self.get_vl(row.function__REL),
+            "funktion": self.get_vl(row.function),
             "bruttokosten": row.gross_costs,
             "qan_dim": row.qon_dim,
-            "signaluebermittlung": self.get_vl(row.signal_transmission__REL),
+            "signaluebermittlung": self.get_vl(row.signal_transmission),
             "subventionen": row.subsidies,
             "abwasserknotenref": self.get_tid(row.fk_wastewater_node__REL),
             "ueberlaufnachref": self.get_tid(row.fk_overflow_to__REL),
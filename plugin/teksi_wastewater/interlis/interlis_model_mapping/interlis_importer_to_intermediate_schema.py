@@ -1,12 +1,18 @@
 from datetime import date, datetime
 
 from geoalchemy2.functions import ST_Force3D
+from sqlalchemy import exists, func, inspect, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import flag_dirty
 from sqlalchemy.sql import text
 
 from ...utils.plugin_utils import logger
 from .. import config, utils
+from ..utils import wkb
+
+# Number of obj_id per query when loading the existing instances
+PREFETCH_CHUNK_SIZE = 1000
 
 
 class InterlisImporterToIntermediateSchema:
@@ -17,9 +23,19 @@ class InterlisImporterToIntermediateSchema:
         model_classes_tww_od,
         model_classes_tww_vl,
         callback_progress_done=None,
+        fast_import=False,
     ):
+        """
+        Import data from the ili2pg model into the TWW model.
+
+        Args:
+            fast_import:    if True, the core SIA405 classes (kanal, normschacht, abwasserknoten, haltung,
+                            haltungspunkt, deckel) are imported with set-based SQL statements instead of
+                            the ORM. These objects are then not in the session (e.g. for the selection dialog).
+        """
         self.model = model
         self.callback_progress_done = callback_progress_done
+        self.fast_import = fast_import
 
         self.model_classes_interlis = model_classes_interlis
         self.model_classes_tww_od = model_classes_tww_od
@@ -28,6 +44,13 @@ class InterlisImporterToIntermediateSchema:
         self.session_interlis = None
         self.session_tww = None
 
+        # Value lists loaded from the database, {vl_table: {value_de: instance}}
+        self.vl_instances = {}
+        # Values not found in the value lists, {(vl_table_name, value_de): count}
+        self.vl_unknown_values = {}
+        # Existing instances loaded before importing a class, {cls: {obj_id: instance}}
+        self.existing_instances = {}
+
     def tww_import(self, skip_closing_tww_session=False):
         try:
             self._tww_import(skip_closing_tww_session)
@@ -71,6 +94,8 @@ class InterlisImporterToIntermediateSchema:
         if self.model == config.MODEL_NAME_VSA_KEK:
             self._import_vsa_kek()
 
+        self._log_unknown_vl_values()
+
         self.close_sessions(skip_closing_tww_session=skip_closing_tww_session)
 
     def _import_sia405_abwasser(self):
@@ -393,15 +418,23 @@ class InterlisImporterToIntermediateSchema:
 
     def get_vl_instance(self, vl_table, value_de):
         """
-        Gets a value list instance from the value_de name. Returns None and a warning if not found.
+        Gets a value list instance from the value_de name. Returns None if not found, the values
+        not found are reported at the end of the import.
+        The whole value list is loaded the first time it is used.
         """
-        # TODO : memoize (and get the whole table at once) to improve N+1 performance issue
         # TODO : return "other" (or other applicable value) rather than None, or even throwing an exception, would probably be better
-        instance = self.session_tww.query(vl_table).filter(vl_table.value_de == value_de).first()
+        instances = self.vl_instances.get(vl_table)
+        if instances is None:
+            instances = {}
+            # The lowest code is taken if several entries have the same value_de, as in fast_vl_code
+            for instance in self.session_tww.query(vl_table).order_by(vl_table.code):
+                instances.setdefault(instance.value_de, instance)
+            self.vl_instances[vl_table] = instances
+
+        instance = instances.get(value_de)
         if instance is None:
-            logger.warning(
-                f'Could not find value `{value_de}` in value list "{vl_table.__table__.schema}.{vl_table.__name__}". Setting to None instead.'
-            )
+            key = (f"{vl_table.__table__.schema}.{vl_table.__name__}", value_de)
+            self.vl_unknown_values[key] = self.vl_unknown_values.get(key, 0) + 1
             return None
         return instance
 
@@ -414,6 +447,23 @@ class InterlisImporterToIntermediateSchema:
             return None
         return instance.code
 
+    def _log_unknown_vl_values(self):
+        """
+        Logs the values which were not found in the value lists, set to None instead
+        """
+        if not self.vl_unknown_values:
+            return
+        lines = [
+            f'`{value_de}` in value list "{vl_table_name}" ({count} times)'
+            for (vl_table_name, value_de), count in sorted(
+                self.vl_unknown_values.items(), key=lambda item: (item[0][0], str(item[0][1]))
+            )
+        ]
+        logger.warning(
+            "Could not find the following values, they were set to None instead:\n"
+            + "\n".join(lines)
+        )
+
     def get_pk(self, relation):
         """
         Returns the primary key for a relation
@@ -427,6 +477,7 @@ class InterlisImporterToIntermediateSchema:
     ):
         """
         Checks if levelattribute or geometryattribut is Null or empty and calls ST_Force3D accordingly as else 3D geometry will be set to NULL if levelattribute is missing - see https://github.com/teksi/wastewater/issues/475#issuecomment-2441032526 and https://trac.osgeo.org/postgis/ticket/5804#comment:1
+        The geometry is converted locally (see utils.wkb.force_3d), without a query per row.
         """
         if levelattribute is None or levelattribute == "":
             if geometryattribute is None or geometryattribute == "":
@@ -438,7 +489,7 @@ class InterlisImporterToIntermediateSchema:
 
             else:
                 # geometry attribute but no levelattribute provided
-                geom = self.session_tww.scalar(ST_Force3D(geometryattribute))
+                geom = wkb.force_3d(geometryattribute)
                 logger.info(
                     f"No {classname_attributename} provided for object {obj_id}- situation3d_geometry with no z-value created: {geom}."
                 )
@@ -452,12 +503,29 @@ class InterlisImporterToIntermediateSchema:
                 return None
             else:
                 # Levelattribute and geometry attribute provided - 3D coordinate can be created as expected
-                geom = self.session_tww.scalar(ST_Force3D(geometryattribute, levelattribute))
+                geom = wkb.force_3d(geometryattribute, levelattribute)
                 logger.debug(
                     f" debug: situation3d_geometry created with geometry (x,y) and level (z): {geom}."
                 )
                 return geom
 
+    def prefetch_instances(self, cls, interlis_cls):
+        """
+        Loads the instances of cls whose obj_id is found in the interlis class at once, so that
+        create_or_update doesn't need to query the database for each row.
+        """
+        obj_ids = [
+            obj_id
+            for obj_id, in self.session_interlis.query(interlis_cls.t_ili_tid)
+            if obj_id is not None
+        ]
+        instances = {}
+        for i in range(0, len(obj_ids), PREFETCH_CHUNK_SIZE):
+            chunk = obj_ids[i : i + PREFETCH_CHUNK_SIZE]
+            for instance in self.session_tww.query(cls).filter(cls.obj_id.in_(chunk)):
+                instances[instance.obj_id] = instance
+        self.existing_instances[cls] = instances
+
     def create_or_update(self, cls, **kwargs):
         """
         Updates an existing instance (if obj_id is found) or creates an instance of the provided class
@@ -465,10 +533,13 @@ class InterlisImporterToIntermediateSchema:
         """
         instance = None
 
-        # We try to get the instance from the session/database
+        # We try to get the instance from the prefetched instances or the session/database
         obj_id = kwargs.get("obj_id", None)
         if obj_id:
-            instance = self.session_tww.get(cls, obj_id)
+            if cls in self.existing_instances:
+                instance = self.existing_instances[cls].get(obj_id)
+            else:
+                instance = self.session_tww.get(cls, obj_id)
 
         if instance:
             flag_dirty(
@@ -514,90 +585,269 @@ class InterlisImporterToIntermediateSchema:
 
         return instance
 
-    def base_common(self, row):
+    def mapped_values(self, row, mapping):
         """
-        Returns common attributes for base
+        Returns the attributes for create_or_update of a row of an interlis class
+
+        Args:
+            mapping:    maps the columns of the TWW class to (kind, interlis attribute, *arguments),
+                        see the *_mapping methods. kind is one of:
+                        "value":        the value of the attribute as is
+                        "vl":           the code of the value list (argument) for the value_de of the attribute
+                        "pk":           the primary key of the object the attribute refers to
+                        "force3d":      the geometry of the attribute with a z-value of 0
+                        "geometry3d":   the geometry of the attribute with the z-value of the level attribute
+                                        and the description of the level (arguments), see geometry3D_convert
+        """
+        values = {}
+        for column, (kind, attribute, *arguments) in mapping.items():
+            if kind == "vl":
+                values[column] = self.get_vl_code(arguments[0], getattr(row, attribute))
+            elif kind == "pk":
+                values[column] = self.get_pk(getattr(row, f"{attribute}__REL"))
+            elif kind == "force3d":
+                geometry = getattr(row, attribute)
+                values[column] = geometry if geometry is None else wkb.force_3d(geometry)
+            elif kind == "geometry3d":
+                level_attribute, level_description = arguments
+                values[column] = self.geometry3D_convert(
+                    getattr(row, attribute),
+                    getattr(row, level_attribute),
+                    row.t_ili_tid,
+                    level_description,
+                )
+            else:
+                values[column] = getattr(row, attribute)
+        return values
+
+    def mapped_expressions(self, c, mapping):
+        """
+        Returns the SQL expressions computing the values of mapped_values from the columns c
+        of an interlis class
+        """
+        expressions = {}
+        for column, (kind, attribute, *arguments) in mapping.items():
+            if kind == "vl":
+                expressions[column] = self.fast_vl_code(arguments[0], c[attribute])
+            elif kind == "pk":
+                expressions[column] = self.fast_pk(c[attribute])
+            elif kind == "force3d":
+                expressions[column] = ST_Force3D(c[attribute])
+            elif kind == "geometry3d":
+                expressions[column] = self.fast_geometry3D(c[attribute], c[arguments[0]])
+            else:
+                expressions[column] = c[attribute]
+        return expressions
+
+    def fast_import_common(self, tww_cls, interlis_cls, mapping):
+        """
+        Imports all the rows of interlis_cls into tww_cls with one
+        INSERT ... SELECT ... ON CONFLICT (obj_id) DO UPDATE per table of tww_cls, from the parent table
+        to the child table. Only the rows with a changed value are updated.
+        The unknown value list values and the missing geometries and levels are reported as by the ORM import.
+
+        Args:
+            mapping:    the same mapping as for mapped_values
+        """
+        c = inspect(interlis_cls).c
+        interlis_selectable = inspect(interlis_cls).persist_selectable
+        values = self.mapped_expressions(c, mapping)
+        source = (
+            select(*[value.label(key) for key, value in values.items()])
+            .select_from(interlis_selectable)
+            .subquery()
+        )
+
+        for mapper in reversed(list(inspect(tww_cls).iterate_to_root())):
+            table = mapper.local_table
+            columns = [column.name for column in table.columns if column.name in source.c]
+            update_columns = [column for column in columns if column != "obj_id"]
+
+            statement = insert(table).from_select(
+                columns, select(*[source.c[column] for column in columns])
+            )
+            if update_columns:
+                statement = statement.on_conflict_do_update(
+                    index_elements=[table.c.obj_id],
+                    set_={column: statement.excluded[column] for column in update_columns},
+                    where=tuple_(*[table.c[column] for column in update_columns]).is_distinct_from(
+                        tuple_(*[statement.excluded[column] for column in update_columns])
+                    ),
+                )
+            else:
+                statement = statement.on_conflict_do_nothing(index_elements=[table.c.obj_id])
+
+            result = self.session_tww.execute(statement)
+            logger.info(
+                f"{result.rowcount} rows inserted or updated in {table.schema}.{table.name}"
+            )
+
+        for kind, attribute, *arguments in mapping.values():
+            if kind == "vl":
+                # Values not found in the value lists are set to NULL
+                vl_table = arguments[0]
+                vl = vl_table.__table__.alias()
+                query = (
+                    select(c[attribute], func.count())
+                    .select_from(interlis_selectable)
+                    .where(
+                        c[attribute].isnot(None), ~exists().where(vl.c.value_de == c[attribute])
+                    )
+                    .group_by(c[attribute])
+                )
+                for value_de, count in self.session_tww.execute(query):
+                    key = (f"{vl_table.__table__.schema}.{vl_table.__name__}", value_de)
+                    self.vl_unknown_values[key] = self.vl_unknown_values.get(key, 0) + count
+            elif kind == "geometry3d":
+                # Only the incomplete rows are logged by geometry3D_convert
+                level_attribute, level_description = arguments
+                query = (
+                    select(c[attribute], c[level_attribute], c.t_ili_tid)
+                    .select_from(interlis_selectable)
+                    .where((c[attribute].is_(None)) | (c[level_attribute].is_(None)))
+                )
+                for geometry, level, obj_id in self.session_tww.execute(query):
+                    self.geometry3D_convert(geometry, level, obj_id, level_description)
+
+    def fast_vl_code(self, vl_table, column):
+        """
+        SQL expression returning the value list code for the value_de in column.
+        Like get_vl_instance, the lowest code is taken if several entries have this value_de.
+        """
+        vl = vl_table.__table__.alias()
+        return (
+            select(vl.c.code)
+            .where(vl.c.value_de == column)
+            .order_by(vl.c.code)
+            .limit(1)
+            .scalar_subquery()
+        )
+
+    def fast_pk(self, column):
+        """
+        SQL expression returning the primary key for a reference column (t_id)
+        """
+        baseclass = inspect(self.model_classes_interlis.baseclass).local_table.alias()
+        return select(baseclass.c.t_ili_tid).where(baseclass.c.t_id == column).scalar_subquery()
+
+    def fast_geometry3D(self, geometrycolumn, levelcolumn):
+        """
+        SQL expression of geometry3D_convert, the z-value is 0 if levelcolumn is NULL
+        """
+        return ST_Force3D(geometrycolumn, func.coalesce(levelcolumn, 0))
+
+    def base_common_mapping(self):
+        """
+        Returns the mapping of the common attributes for base
         """
         return {
-            "obj_id": row.t_ili_tid,
-            "fk_dataowner": row.datenherrref,
-            "fk_provider": row.datenlieferantref,
-            "last_modification": row.letzte_aenderung,
+            "obj_id": ("value", "t_ili_tid"),
+            "fk_dataowner": ("value", "datenherrref"),
+            "fk_provider": ("value", "datenlieferantref"),
+            "last_modification": ("value", "letzte_aenderung"),
         }
 
-    def wastewater_structure_common(self, row):
+    def wastewater_structure_common_mapping(self):
         """
-        Returns common attributes for wastewater_structure
+        Returns the mapping of the common attributes for wastewater_structure
         """
         return {
-            "accessibility": self.get_vl_code(
-                self.model_classes_tww_od.wastewater_structure_accessibility, row.zugaenglichkeit
-            ),
-            "contract_section": row.baulos,
-            "detail_geometry3d_geometry": (
-                row.detailgeometrie
-                if row.detailgeometrie is None
-                else self.session_tww.scalar(ST_Force3D(row.detailgeometrie))
+            "accessibility": (
+                "vl",
+                "zugaenglichkeit",
+                self.model_classes_tww_od.wastewater_structure_accessibility,
             ),
+            "contract_section": ("value", "baulos"),
+            "detail_geometry3d_geometry": ("force3d", "detailgeometrie"),
             # TODO : NOT MAPPED VSA-DSS 3D
-            # "elevation_determination": self.get_vl_code(
-            #    self.model_classes_tww_od.wastewater_structure_elevation_determination, row.hoehenbestimmung
+            # "elevation_determination": (
+            #    "vl", "hoehenbestimmung", self.model_classes_tww_od.wastewater_structure_elevation_determination
             # ),
-            "financing": self.get_vl_code(
-                self.model_classes_tww_od.wastewater_structure_financing, row.finanzierung
+            "financing": (
+                "vl",
+                "finanzierung",
+                self.model_classes_tww_od.wastewater_structure_financing,
             ),
-            "fk_operator": row.betreiberref,
-            "fk_owner": row.eigentuemerref,
-            "gross_costs": row.bruttokosten,
-            "identifier": row.bezeichnung,
-            "inspection_interval": row.inspektionsintervall,
-            "location_name": row.standortname,
-            "records": row.akten,
-            "remark": row.bemerkung,
-            "renovation_necessity": self.get_vl_code(
+            "fk_operator": ("value", "betreiberref"),
+            "fk_owner": ("value", "eigentuemerref"),
+            "gross_costs": ("value", "bruttokosten"),
+            "identifier": ("value", "bezeichnung"),
+            "inspection_interval": ("value", "inspektionsintervall"),
+            "location_name": ("value", "standortname"),
+            "records": ("value", "akten"),
+            "remark": ("value", "bemerkung"),
+            "renovation_necessity": (
+                "vl",
+                "sanierungsbedarf",
                 self.model_classes_tww_od.wastewater_structure_renovation_necessity,
-                row.sanierungsbedarf,
-            ),
-            "replacement_value": row.wiederbeschaffungswert,
-            "rv_base_year": row.wbw_basisjahr,
-            "rv_construction_type": self.get_vl_code(
-                self.model_classes_tww_od.wastewater_structure_rv_construction_type, row.wbw_bauart
             ),
-            "status": self.get_vl_code(
-                self.model_classes_tww_vl.wastewater_structure_status, row.astatus
+            "replacement_value": ("value", "wiederbeschaffungswert"),
+            "rv_base_year": ("value", "wbw_basisjahr"),
+            "rv_construction_type": (
+                "vl",
+                "wbw_bauart",
+                self.model_classes_tww_od.wastewater_structure_rv_construction_type,
             ),
-            "structure_condition": self.get_vl_code(
+            "status": ("vl", "astatus", self.model_classes_tww_vl.wastewater_structure_status),
+            "structure_condition": (
+                "vl",
+                "baulicherzustand",
                 self.model_classes_tww_od.wastewater_structure_structure_condition,
-                row.baulicherzustand,
             ),
-            "subsidies": row.subventionen,
-            "year_of_construction": row.baujahr,
-            "year_of_replacement": row.ersatzjahr,
+            "subsidies": ("value", "subventionen"),
+            "year_of_construction": ("value", "baujahr"),
+            "year_of_replacement": ("value", "ersatzjahr"),
         }
 
-    def wastewater_networkelement_common(self, row):
+    def wastewater_networkelement_common_mapping(self):
         """
-        Returns common attributes for network_element
+        Returns the mapping of the common attributes for network_element
         """
         return {
-            "fk_wastewater_structure": self.get_pk(row.abwasserbauwerkref__REL),
-            "identifier": row.bezeichnung,
-            "remark": row.bemerkung,
+            "fk_wastewater_structure": ("pk", "abwasserbauwerkref"),
+            "identifier": ("value", "bezeichnung"),
+            "remark": ("value", "bemerkung"),
         }
 
-    def structure_part_common(self, row):
+    def structure_part_common_mapping(self):
         """
-        Returns common attributes for structure_part
+        Returns the mapping of the common attributes for structure_part
         """
         return {
-            "fk_wastewater_structure": self.get_pk(row.abwasserbauwerkref__REL),
-            "identifier": row.bezeichnung,
-            "remark": row.bemerkung,
-            "renovation_demand": self.get_vl_code(
-                self.model_classes_tww_od.structure_part_renovation_demand, row.instandstellung
+            "fk_wastewater_structure": ("pk", "abwasserbauwerkref"),
+            "identifier": ("value", "bezeichnung"),
+            "remark": ("value", "bemerkung"),
+            "renovation_demand": (
+                "vl",
+                "instandstellung",
+                self.model_classes_tww_od.structure_part_renovation_demand,
             ),
         }
 
+    def base_common(self, row):
+        """
+        Returns common attributes for base
+        """
+        return self.mapped_values(row, self.base_common_mapping())
+
+    def wastewater_structure_common(self, row):
+        """
+        Returns common attributes for wastewater_structure
+        """
+        return self.mapped_values(row, self.wastewater_structure_common_mapping())
+
+    def wastewater_networkelement_common(self, row):
+        """
+        Returns common attributes for network_element
+        """
+        return self.mapped_values(row, self.wastewater_networkelement_common_mapping())
+
+    def structure_part_common(self, row):
+        """
+        Returns common attributes for structure_part
+        """
+        return self.mapped_values(row, self.structure_part_common_mapping())
+
     def maintenance_event_common(self, row):
         """
         Returns common attributes for connection_object
@@ -686,6 +936,9 @@ class InterlisImporterToIntermediateSchema:
         }
 
     def _import_organisation(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.organisation, self.model_classes_interlis.organisation
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.organisation):
             organisation = self.create_or_update(
                 self.model_classes_tww_od.organisation,
@@ -710,62 +963,97 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_kanal(self):
+        mapping = {
+            **self.base_common_mapping(),
+            # --- wastewater_structure ---
+            **self.wastewater_structure_common_mapping(),
+            # --- channel ---
+            "bedding_encasement": (
+                "vl",
+                "bettung_umhuellung",
+                self.model_classes_tww_od.channel_bedding_encasement,
+            ),
+            "connection_type": (
+                "vl",
+                "verbindungsart",
+                self.model_classes_tww_od.channel_connection_type,
+            ),
+            "function_hierarchic": (
+                "vl",
+                "funktionhierarchisch",
+                self.model_classes_tww_od.channel_function_hierarchic,
+            ),
+            "function_hydraulic": (
+                "vl",
+                "funktionhydraulisch",
+                self.model_classes_tww_od.channel_function_hydraulic,
+            ),
+            "jetting_interval": ("value", "spuelintervall"),
+            "pipe_length": ("value", "rohrlaenge"),
+            "usage_current": (
+                "vl",
+                "nutzungsart_ist",
+                self.model_classes_tww_od.channel_usage_current,
+            ),
+            "usage_planned": (
+                "vl",
+                "nutzungsart_geplant",
+                self.model_classes_tww_od.channel_usage_planned,
+            ),
+        }
+        if self.fast_import:
+            self.fast_import_common(
+                self.model_classes_tww_od.channel, self.model_classes_interlis.kanal, mapping
+            )
+            return
+
+        self.prefetch_instances(
+            self.model_classes_tww_od.channel, self.model_classes_interlis.kanal
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.kanal):
             channel = self.create_or_update(
-                self.model_classes_tww_od.channel,
-                **self.base_common(row),
-                # --- wastewater_structure ---
-                **self.wastewater_structure_common(row),
-                # --- channel ---
-                bedding_encasement=self.get_vl_code(
-                    self.model_classes_tww_od.channel_bedding_encasement, row.bettung_umhuellung
-                ),
-                connection_type=self.get_vl_code(
-                    self.model_classes_tww_od.channel_connection_type, row.verbindungsart
-                ),
-                function_hierarchic=self.get_vl_code(
-                    self.model_classes_tww_od.channel_function_hierarchic, row.funktionhierarchisch
-                ),
-                function_hydraulic=self.get_vl_code(
-                    self.model_classes_tww_od.channel_function_hydraulic, row.funktionhydraulisch
-                ),
-                jetting_interval=row.spuelintervall,
-                pipe_length=row.rohrlaenge,
-                usage_current=self.get_vl_code(
-                    self.model_classes_tww_od.channel_usage_current, row.nutzungsart_ist
-                ),
-                usage_planned=self.get_vl_code(
-                    self.model_classes_tww_od.channel_usage_planned, row.nutzungsart_geplant
-                ),
+                self.model_classes_tww_od.channel, **self.mapped_values(row, mapping)
             )
             self.session_tww.add(channel)
             print(".", end="")
 
     def _import_normschacht(self):
+        mapping = {
+            **self.base_common_mapping(),
+            # --- wastewater_structure ---
+            **self.wastewater_structure_common_mapping(),
+            # --- manhole ---
+            # "_orientation": ("value", "REPLACE_ME"),
+            "dimension1": ("value", "dimension1"),
+            "dimension2": ("value", "dimension2"),
+            "function": ("vl", "funktion", self.model_classes_tww_vl.manhole_function),
+            "material": ("vl", "material", self.model_classes_tww_vl.manhole_material),
+            "surface_inflow": (
+                "vl",
+                "oberflaechenzulauf",
+                self.model_classes_tww_od.manhole_surface_inflow,
+            ),
+        }
+        if self.fast_import:
+            self.fast_import_common(
+                self.model_classes_tww_od.manhole, self.model_classes_interlis.normschacht, mapping
+            )
+            return
+
+        self.prefetch_instances(
+            self.model_classes_tww_od.manhole, self.model_classes_interlis.normschacht
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.normschacht):
             manhole = self.create_or_update(
-                self.model_classes_tww_od.manhole,
-                **self.base_common(row),
-                # --- wastewater_structure ---
-                **self.wastewater_structure_common(row),
-                # --- manhole ---
-                # _orientation=row.REPLACE_ME,
-                dimension1=row.dimension1,
-                dimension2=row.dimension2,
-                function=self.get_vl_code(
-                    self.model_classes_tww_vl.manhole_function, row.funktion
-                ),
-                material=self.get_vl_code(
-                    self.model_classes_tww_vl.manhole_material, row.material
-                ),
-                surface_inflow=self.get_vl_code(
-                    self.model_classes_tww_od.manhole_surface_inflow, row.oberflaechenzulauf
-                ),
+                self.model_classes_tww_od.manhole, **self.mapped_values(row, mapping)
             )
             self.session_tww.add(manhole)
             print(".", end="")
 
     def _import_einleitstelle(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.discharge_point, self.model_classes_interlis.einleitstelle
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.einleitstelle):
             discharge_point = self.create_or_update(
                 self.model_classes_tww_od.discharge_point,
@@ -787,6 +1075,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_spezialbauwerk(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.special_structure, self.model_classes_interlis.spezialbauwerk
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.spezialbauwerk):
             special_structure = self.create_or_update(
                 self.model_classes_tww_od.special_structure,
@@ -815,6 +1106,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_versickerungsanlage(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.infiltration_installation,
+            self.model_classes_interlis.versickerungsanlage,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.versickerungsanlage):
             infiltration_installation = self.create_or_update(
                 self.model_classes_tww_od.infiltration_installation,
@@ -860,6 +1155,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_abwasserreinigungsanlage(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.waste_water_treatment_plant,
+            self.model_classes_interlis.abwasserreinigungsanlage,
+        )
         for row in self.session_interlis.query(
             self.model_classes_interlis.abwasserreinigungsanlage
         ):
@@ -892,6 +1191,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_araenergienutzung(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.wwtp_energy_use,
+            self.model_classes_interlis.araenergienutzung,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.araenergienutzung):
             wwtp_energy_use = self.create_or_update(
                 self.model_classes_tww_od.wwtp_energy_use,
@@ -908,6 +1211,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_abwasserbehandlung(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.waste_water_treatment,
+            self.model_classes_interlis.abwasserbehandlung,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.abwasserbehandlung):
             waste_water_treatment = self.create_or_update(
                 self.model_classes_tww_od.waste_water_treatment,
@@ -924,6 +1231,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_schlammbehandlung(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.sludge_treatment,
+            self.model_classes_interlis.schlammbehandlung,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.schlammbehandlung):
             sludge_treatment = self.create_or_update(
                 self.model_classes_tww_od.sludge_treatment,
@@ -951,6 +1262,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_arabauwerk(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.wwtp_structure, self.model_classes_interlis.arabauwerk
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.arabauwerk):
             wwtp_structure = self.create_or_update(
                 self.model_classes_tww_od.wwtp_structure,
@@ -965,6 +1279,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_steuerungszentrale(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.control_center,
+            self.model_classes_interlis.steuerungszentrale,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.steuerungszentrale):
             control_center = self.create_or_update(
                 self.model_classes_tww_od.control_center,
@@ -977,6 +1295,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_abflusslose_toilette(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.drainless_toilet,
+            self.model_classes_interlis.abflusslose_toilette,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.abflusslose_toilette):
             drainless_toilet = self.create_or_update(
                 self.model_classes_tww_od.drainless_toilet,
@@ -989,6 +1311,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_absperr_drosselorgan(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.throttle_shut_off_unit,
+            self.model_classes_interlis.absperr_drosselorgan,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.absperr_drosselorgan):
             throttle_shut_off_unit = self.create_or_update(
                 self.model_classes_tww_od.throttle_shut_off_unit,
@@ -1028,6 +1354,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_beckenentleerung(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.tank_emptying, self.model_classes_interlis.beckenentleerung
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.beckenentleerung):
             tank_emptying = self.create_or_update(
                 self.model_classes_tww_od.tank_emptying,
@@ -1045,6 +1374,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_beckenreinigung(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.tank_cleaning, self.model_classes_interlis.beckenreinigung
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.beckenreinigung):
             tank_cleaning = self.create_or_update(
                 self.model_classes_tww_od.tank_cleaning,
@@ -1059,6 +1391,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_biol_oekol_gesamtbeurteilung(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.bio_ecol_assessment,
+            self.model_classes_interlis.biol_oekol_gesamtbeurteilung,
+        )
         for row in self.session_interlis.query(
             self.model_classes_interlis.biol_oekol_gesamtbeurteilung
         ):
@@ -1115,6 +1451,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_brunnen(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.fountain, self.model_classes_interlis.brunnen
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.brunnen):
             fountain = self.create_or_update(
                 self.model_classes_tww_od.fountain,
@@ -1128,6 +1467,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_ezg_parameter_allg(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.param_ca_general,
+            self.model_classes_interlis.ezg_parameter_allg,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.ezg_parameter_allg):
             param_ca_general = self.create_or_update(
                 self.model_classes_tww_od.param_ca_general,
@@ -1144,6 +1487,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_ezg_parameter_mouse1(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.param_ca_mouse1,
+            self.model_classes_interlis.ezg_parameter_mouse1,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.ezg_parameter_mouse1):
             param_ca_mouse1 = self.create_or_update(
                 self.model_classes_tww_od.param_ca_mouse1,
@@ -1161,6 +1508,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_einzelflaeche(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.individual_surface, self.model_classes_interlis.einzelflaeche
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.einzelflaeche):
             individual_surface = self.create_or_update(
                 self.model_classes_tww_od.individual_surface,
@@ -1180,6 +1530,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_einzugsgebiet(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.catchment_area, self.model_classes_interlis.einzugsgebiet
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.einzugsgebiet):
             catchment_area = self.create_or_update(
                 self.model_classes_tww_od.catchment_area,
@@ -1257,6 +1610,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_elektrischeeinrichtung(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.electric_equipment,
+            self.model_classes_interlis.elektrischeeinrichtung,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.elektrischeeinrichtung):
             electric_equipment = self.create_or_update(
                 self.model_classes_tww_od.electric_equipment,
@@ -1271,6 +1628,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_elektromechanischeausruestung(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.electromechanical_equipment,
+            self.model_classes_interlis.elektromechanischeausruestung,
+        )
         for row in self.session_interlis.query(
             self.model_classes_interlis.elektromechanischeausruestung
         ):
@@ -1289,6 +1650,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_entsorgung(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.disposal, self.model_classes_interlis.entsorgung
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.entsorgung):
             disposal = self.create_or_update(
                 self.model_classes_tww_od.disposal,
@@ -1313,6 +1677,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_entwaesserungssystem(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.drainage_system,
+            self.model_classes_interlis.entwaesserungssystem,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.entwaesserungssystem):
             drainage_system = self.create_or_update(
                 self.model_classes_tww_od.drainage_system,
@@ -1326,6 +1694,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_feststoffrueckhalt(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.solids_retention,
+            self.model_classes_interlis.feststoffrueckhalt,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.feststoffrueckhalt):
             solids_retention = self.create_or_update(
                 self.model_classes_tww_od.solids_retention,
@@ -1342,6 +1714,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_foerderaggregat(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.pump, self.model_classes_interlis.foerderaggregat
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.foerderaggregat):
             pump = self.create_or_update(
                 self.model_classes_tww_od.pump,
@@ -1368,6 +1743,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_gebaeude(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.building, self.model_classes_interlis.gebaeude
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.gebaeude):
             building = self.create_or_update(
                 self.model_classes_tww_od.building,
@@ -1383,6 +1761,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_gebaeudegruppe(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.building_group, self.model_classes_interlis.gebaeudegruppe
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.gebaeudegruppe):
             building_group = self.create_or_update(
                 self.model_classes_tww_od.building_group,
@@ -1449,6 +1830,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_gebaeudegruppe_baugwr(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.building_group_baugwr,
+            self.model_classes_interlis.gebaeudegruppe_baugwr,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.gebaeudegruppe_baugwr):
             building_group_baugwr = self.create_or_update(
                 self.model_classes_tww_od.building_group_baugwr,
@@ -1461,6 +1846,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_gesamteinzugsgebiet(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.catchment_area_totals,
+            self.model_classes_interlis.gesamteinzugsgebiet,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.gesamteinzugsgebiet):
             catchment_area_totals = self.create_or_update(
                 self.model_classes_tww_od.catchment_area_totals,
@@ -1486,6 +1875,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_hq_relation(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.hq_relation, self.model_classes_interlis.hq_relation
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.hq_relation):
             hq_relation = self.create_or_update(
                 self.model_classes_tww_od.hq_relation,
@@ -1500,6 +1892,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_hydr_geomrelation(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.hydr_geom_relation,
+            self.model_classes_interlis.hydr_geomrelation,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.hydr_geomrelation):
             hydr_geom_relation = self.create_or_update(
                 self.model_classes_tww_od.hydr_geom_relation,
@@ -1514,6 +1910,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_hydr_geometrie(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.hydr_geometry, self.model_classes_interlis.hydr_geometrie
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.hydr_geometrie):
             hydr_geometry = self.create_or_update(
                 self.model_classes_tww_od.hydr_geometry,
@@ -1531,6 +1930,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_hydr_kennwerte(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.hydraulic_char_data,
+            self.model_classes_interlis.hydr_kennwerte,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.hydr_kennwerte):
             hydraulic_char_data = self.create_or_update(
                 self.model_classes_tww_od.hydraulic_char_data,
@@ -1570,6 +1973,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_klara(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.small_treatment_plant, self.model_classes_interlis.klara
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.klara):
             small_treatment_plant = self.create_or_update(
                 self.model_classes_tww_od.small_treatment_plant,
@@ -1590,6 +1996,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_landwirtschaftsbetrieb(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.farm, self.model_classes_interlis.landwirtschaftsbetrieb
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.landwirtschaftsbetrieb):
             farm = self.create_or_update(
                 self.model_classes_tww_od.farm,
@@ -1631,6 +2040,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_leapingwehr(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.leapingweir, self.model_classes_interlis.leapingwehr
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.leapingwehr):
             leapingweir = self.create_or_update(
                 self.model_classes_tww_od.leapingweir,
@@ -1647,6 +2059,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_massnahme(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.measure, self.model_classes_interlis.massnahme
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.massnahme):
             measure = self.create_or_update(
                 self.model_classes_tww_od.measure,
@@ -1678,6 +2093,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_mechanischevorreinigung(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.mechanical_pretreatment,
+            self.model_classes_interlis.mechanischevorreinigung,
+        )
         for row in self.session_interlis.query(
             self.model_classes_interlis.mechanischevorreinigung
         ):
@@ -1696,6 +2115,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_messgeraet(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.measuring_device, self.model_classes_interlis.messgeraet
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.messgeraet):
             measuring_device = self.create_or_update(
                 self.model_classes_tww_od.measuring_device,
@@ -1712,6 +2134,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_messreihe(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.measurement_series, self.model_classes_interlis.messreihe
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.messreihe):
             measurement_series = self.create_or_update(
                 self.model_classes_tww_od.measurement_series,
@@ -1728,6 +2153,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_messresultat(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.measurement_result, self.model_classes_interlis.messresultat
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.messresultat):
             measurement_result = self.create_or_update(
                 self.model_classes_tww_od.measurement_result,
@@ -1748,6 +2176,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_messstelle(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.measuring_point, self.model_classes_interlis.messstelle
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.messstelle):
             measuring_point = self.create_or_update(
                 self.model_classes_tww_od.measuring_point,
@@ -1776,6 +2207,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_mutation(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.mutation, self.model_classes_interlis.mutation
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.mutation):
             mutation = self.create_or_update(
                 self.model_classes_tww_od.mutation,
@@ -1796,6 +2230,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_reservoir(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.reservoir, self.model_classes_interlis.reservoir
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.reservoir):
             reservoir = self.create_or_update(
                 self.model_classes_tww_od.reservoir,
@@ -1809,6 +2246,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_retentionskoerper(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.retention_body, self.model_classes_interlis.retentionskoerper
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.retentionskoerper):
             retention_body = self.create_or_update(
                 self.model_classes_tww_od.retention_body,
@@ -1824,6 +2264,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_rohrprofil_geometrie(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.profile_geometry,
+            self.model_classes_interlis.rohrprofil_geometrie,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.rohrprofil_geometrie):
             profile_geometry = self.create_or_update(
                 self.model_classes_tww_od.profile_geometry,
@@ -1838,6 +2282,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_rueckstausicherung(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.backflow_prevention,
+            self.model_classes_interlis.rueckstausicherung,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.rueckstausicherung):
             backflow_prevention = self.create_or_update(
                 self.model_classes_tww_od.backflow_prevention,
@@ -1854,6 +2302,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_stammkarte(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.log_card, self.model_classes_interlis.stammkarte
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.stammkarte):
             log_card = self.create_or_update(
                 self.model_classes_tww_od.log_card,
@@ -1876,6 +2327,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_streichwehr(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.prank_weir, self.model_classes_interlis.streichwehr
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.streichwehr):
             prank_weir = self.create_or_update(
                 self.model_classes_tww_od.prank_weir,
@@ -1896,6 +2350,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_ueberlaufcharakteristik(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.overflow_char,
+            self.model_classes_interlis.ueberlaufcharakteristik,
+        )
         for row in self.session_interlis.query(
             self.model_classes_interlis.ueberlaufcharakteristik
         ):
@@ -1913,6 +2371,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_unterhalt(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.maintenance, self.model_classes_interlis.unterhalt
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.unterhalt):
             maintenance = self.create_or_update(
                 self.model_classes_tww_od.maintenance,
@@ -1925,6 +2386,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_versickerungsbereich(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.infiltration_zone,
+            self.model_classes_interlis.versickerungsbereich,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.versickerungsbereich):
             infiltration_zone = self.create_or_update(
                 self.model_classes_tww_od.infiltration_zone,
@@ -1941,6 +2406,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_rohrprofil(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.pipe_profile, self.model_classes_interlis.rohrprofil
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.rohrprofil):
             pipe_profile = self.create_or_update(
                 self.model_classes_tww_od.pipe_profile,
@@ -1957,30 +2425,54 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_haltungspunkt(self):
+        mapping = {
+            **self.base_common_mapping(),
+            # --- reach_point ---
+            "elevation_accuracy": (
+                "vl",
+                "hoehengenauigkeit",
+                self.model_classes_tww_od.reach_point_elevation_accuracy,
+            ),
+            "fk_wastewater_networkelement": ("pk", "abwassernetzelementref"),
+            "identifier": ("value", "bezeichnung"),
+            "level": ("value", "kote"),
+            "outlet_shape": (
+                "vl",
+                "auslaufform",
+                self.model_classes_tww_od.reach_point_outlet_shape,
+            ),
+            "position_of_connection": ("value", "lage_anschluss"),
+            "remark": ("value", "bemerkung"),
+            "situation3d_geometry": (
+                "geometry3d",
+                "lage",
+                "kote",
+                "reach_point.cote (Haltungpunkt.Kote)",
+            ),
+        }
+        if self.fast_import:
+            self.fast_import_common(
+                self.model_classes_tww_od.reach_point,
+                self.model_classes_interlis.haltungspunkt,
+                mapping,
+            )
+            return
+
+        self.prefetch_instances(
+            self.model_classes_tww_od.reach_point, self.model_classes_interlis.haltungspunkt
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.haltungspunkt):
             reach_point = self.create_or_update(
-                self.model_classes_tww_od.reach_point,
-                **self.base_common(row),
-                # --- reach_point ---
-                elevation_accuracy=self.get_vl_code(
-                    self.model_classes_tww_od.reach_point_elevation_accuracy, row.hoehengenauigkeit
-                ),
-                fk_wastewater_networkelement=self.get_pk(row.abwassernetzelementref__REL),
-                identifier=row.bezeichnung,
-                level=row.kote,
-                outlet_shape=self.get_vl_code(
-                    self.model_classes_tww_od.reach_point_outlet_shape, row.auslaufform
-                ),
-                position_of_connection=row.lage_anschluss,
-                remark=row.bemerkung,
-                situation3d_geometry=self.geometry3D_convert(
-                    row.lage, row.kote, row.t_ili_tid, "reach_point.cote (Haltungpunkt.Kote)"
-                ),
+                self.model_classes_tww_od.reach_point, **self.mapped_values(row, mapping)
             )
             self.session_tww.add(reach_point)
             print(".", end="")
 
     def _import_haltung_alternativverlauf(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.reach_progression_alternative,
+            self.model_classes_interlis.haltung_alternativverlauf,
+        )
         for row in self.session_interlis.query(
             self.model_classes_interlis.haltung_alternativverlauf
         ):
@@ -1997,70 +2489,107 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_abwasserknoten(self):
+        mapping = {
+            **self.base_common_mapping(),
+            # --- wastewater_networkelement ---
+            **self.wastewater_networkelement_common_mapping(),
+            # --- wastewater_node ---
+            # "fk_hydr_geometry": ("value", "REPLACE_ME"),  # TODO : NOT MAPPED
+            "backflow_level_current": ("value", "rueckstaukote_ist"),
+            "bottom_level": ("value", "sohlenkote"),
+            "situation3d_geometry": (
+                "geometry3d",
+                "lage",
+                "sohlenkote",
+                "wastewater_node.bottom_level (Abwasserknoten.Sohlenkote)",
+            ),
+        }
+        if self.fast_import:
+            self.fast_import_common(
+                self.model_classes_tww_od.wastewater_node,
+                self.model_classes_interlis.abwasserknoten,
+                mapping,
+            )
+            return
+
+        self.prefetch_instances(
+            self.model_classes_tww_od.wastewater_node, self.model_classes_interlis.abwasserknoten
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.abwasserknoten):
             wastewater_node = self.create_or_update(
-                self.model_classes_tww_od.wastewater_node,
-                **self.base_common(row),
-                # --- wastewater_networkelement ---
-                **self.wastewater_networkelement_common(row),
-                # --- wastewater_node ---
-                # fk_hydr_geometry=row.REPLACE_ME,  # TODO : NOT MAPPED
-                backflow_level_current=row.rueckstaukote_ist,
-                bottom_level=row.sohlenkote,
-                situation3d_geometry=self.geometry3D_convert(
-                    row.lage,
-                    row.sohlenkote,
-                    row.t_ili_tid,
-                    "wastewater_node.bottom_level (Abwasserknoten.Sohlenkote)",
-                ),
+                self.model_classes_tww_od.wastewater_node, **self.mapped_values(row, mapping)
             )
             self.session_tww.add(wastewater_node)
             print(".", end="")
 
     def _import_haltung(self):
+        mapping = {
+            **self.base_common_mapping(),
+            # --- wastewater_networkelement ---
+            **self.wastewater_networkelement_common_mapping(),
+            # --- reach ---
+            "clear_height": ("value", "lichte_hoehe"),
+            "coefficient_of_friction": ("value", "reibungsbeiwert"),
+            # TODO : NOT MAPPED VSA-DSS 3D
+            # "elevation_determination": (
+            #    "vl", "hoehenbestimmung", self.model_classes_tww_od.wastewater_structure_elevation_determination
+            # ),
+            "fk_pipe_profile": ("pk", "rohrprofilref"),
+            "fk_reach_point_from": ("pk", "vonhaltungspunktref"),
+            "fk_reach_point_to": ("pk", "nachhaltungspunktref"),
+            "horizontal_positioning": (
+                "vl",
+                "lagebestimmung",
+                self.model_classes_tww_od.reach_horizontal_positioning,
+            ),
+            "inside_coating": (
+                "vl",
+                "innenschutz",
+                self.model_classes_tww_od.reach_inside_coating,
+            ),
+            "length_effective": ("value", "laengeeffektiv"),
+            "material": ("vl", "material", self.model_classes_tww_vl.reach_material),
+            "progression3d_geometry": ("force3d", "verlauf"),
+            "reliner_material": (
+                "vl",
+                "reliner_material",
+                self.model_classes_tww_od.reach_reliner_material,
+            ),
+            "reliner_nominal_size": ("value", "reliner_nennweite"),
+            "relining_construction": (
+                "vl",
+                "reliner_bautechnik",
+                self.model_classes_tww_od.reach_relining_construction,
+            ),
+            "relining_kind": ("vl", "reliner_art", self.model_classes_tww_od.reach_relining_kind),
+            "ring_stiffness": ("value", "ringsteifigkeit"),
+            "slope_building_plan": (
+                "value",
+                "plangefaelle",
+            ),  # TODO : check, does this need conversion ?
+            "wall_roughness": ("value", "wandrauhigkeit"),
+        }
+        if self.fast_import:
+            self.fast_import_common(
+                self.model_classes_tww_od.reach, self.model_classes_interlis.haltung, mapping
+            )
+            return
+
+        self.prefetch_instances(
+            self.model_classes_tww_od.reach, self.model_classes_interlis.haltung
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.haltung):
             reach = self.create_or_update(
-                self.model_classes_tww_od.reach,
-                **self.base_common(row),
-                # --- wastewater_networkelement ---
-                **self.wastewater_networkelement_common(row),
-                # --- reach ---
-                clear_height=row.lichte_hoehe,
-                coefficient_of_friction=row.reibungsbeiwert,
-                # TODO : NOT MAPPED VSA-DSS 3D
-                # self.get_vl_code(
-                #    self.model_classes_tww_od.wastewater_structure_elevation_determination, row.hoehenbestimmung
-                # ),
-                fk_pipe_profile=self.get_pk(row.rohrprofilref__REL),
-                fk_reach_point_from=self.get_pk(row.vonhaltungspunktref__REL),
-                fk_reach_point_to=self.get_pk(row.nachhaltungspunktref__REL),
-                horizontal_positioning=self.get_vl_code(
-                    self.model_classes_tww_od.reach_horizontal_positioning, row.lagebestimmung
-                ),
-                inside_coating=self.get_vl_code(
-                    self.model_classes_tww_od.reach_inside_coating, row.innenschutz
-                ),
-                length_effective=row.laengeeffektiv,
-                material=self.get_vl_code(self.model_classes_tww_vl.reach_material, row.material),
-                progression3d_geometry=self.session_tww.scalar(ST_Force3D(row.verlauf)),
-                reliner_material=self.get_vl_code(
-                    self.model_classes_tww_od.reach_reliner_material, row.reliner_material
-                ),
-                reliner_nominal_size=row.reliner_nennweite,
-                relining_construction=self.get_vl_code(
-                    self.model_classes_tww_od.reach_relining_construction, row.reliner_bautechnik
-                ),
-                relining_kind=self.get_vl_code(
-                    self.model_classes_tww_od.reach_relining_kind, row.reliner_art
-                ),
-                ring_stiffness=row.ringsteifigkeit,
-                slope_building_plan=row.plangefaelle,  # TODO : check, does this need conversion ?
-                wall_roughness=row.wandrauhigkeit,
+                self.model_classes_tww_od.reach, **self.mapped_values(row, mapping)
             )
             self.session_tww.add(reach)
             print(".", end="")
 
     def _import_trockenwetterfallrohr(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.dryweather_downspout,
+            self.model_classes_interlis.trockenwetterfallrohr,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.trockenwetterfallrohr):
             dryweather_downspout = self.create_or_update(
                 self.model_classes_tww_od.dryweather_downspout,
@@ -2074,6 +2603,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_einstiegshilfe(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.access_aid, self.model_classes_interlis.einstiegshilfe
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.einstiegshilfe):
             access_aid = self.create_or_update(
                 self.model_classes_tww_od.access_aid,
@@ -2087,6 +2619,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_trockenwetterrinne(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.dryweather_flume,
+            self.model_classes_interlis.trockenwetterrinne,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.trockenwetterrinne):
             dryweather_flume = self.create_or_update(
                 self.model_classes_tww_od.dryweather_flume,
@@ -2102,38 +2638,55 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_deckel(self):
+        mapping = {
+            **self.base_common_mapping(),
+            # --- structure_part ---
+            **self.structure_part_common_mapping(),
+            # --- cover ---
+            "brand": ("value", "fabrikat"),
+            "cover_shape": ("vl", "deckelform", self.model_classes_tww_vl.cover_cover_shape),
+            "diameter": ("value", "durchmesser"),
+            "fastening": ("vl", "verschluss", self.model_classes_tww_vl.cover_fastening),
+            "level": ("value", "kote"),
+            "material": ("vl", "material", self.model_classes_tww_vl.cover_material),
+            "positional_accuracy": (
+                "vl",
+                "lagegenauigkeit",
+                self.model_classes_tww_od.cover_positional_accuracy,
+            ),
+            "situation3d_geometry": (
+                "geometry3d",
+                "lage",
+                "kote",
+                "cover.level (Deckel.Deckelkote)",
+            ),
+            "sludge_bucket": (
+                "vl",
+                "schlammeimer",
+                self.model_classes_tww_od.cover_sludge_bucket,
+            ),
+            "venting": ("vl", "entlueftung", self.model_classes_tww_vl.cover_venting),
+        }
+        if self.fast_import:
+            self.fast_import_common(
+                self.model_classes_tww_od.cover, self.model_classes_interlis.deckel, mapping
+            )
+            return
+
+        self.prefetch_instances(
+            self.model_classes_tww_od.cover, self.model_classes_interlis.deckel
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.deckel):
             cover = self.create_or_update(
-                self.model_classes_tww_od.cover,
-                **self.base_common(row),
-                # --- structure_part ---
-                **self.structure_part_common(row),
-                # --- cover ---
-                brand=row.fabrikat,
-                cover_shape=self.get_vl_code(
-                    self.model_classes_tww_vl.cover_cover_shape, row.deckelform
-                ),
-                diameter=row.durchmesser,
-                fastening=self.get_vl_code(
-                    self.model_classes_tww_vl.cover_fastening, row.verschluss
-                ),
-                level=row.kote,
-                material=self.get_vl_code(self.model_classes_tww_vl.cover_material, row.material),
-                positional_accuracy=self.get_vl_code(
-                    self.model_classes_tww_od.cover_positional_accuracy, row.lagegenauigkeit
-                ),
-                situation3d_geometry=self.geometry3D_convert(
-                    row.lage, row.kote, row.t_ili_tid, "cover.level (Deckel.Deckelkote)"
-                ),
-                sludge_bucket=self.get_vl_code(
-                    self.model_classes_tww_od.cover_sludge_bucket, row.schlammeimer
-                ),
-                venting=self.get_vl_code(self.model_classes_tww_vl.cover_venting, row.entlueftung),
+                self.model_classes_tww_od.cover, **self.mapped_values(row, mapping)
             )
             self.session_tww.add(cover)
             print(".", end="")
 
     def _import_bankett(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.benching, self.model_classes_interlis.bankett
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.bankett):
             benching = self.create_or_update(
                 self.model_classes_tww_od.benching,
@@ -2147,6 +2700,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_spuelstutzen(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.flushing_nozzle, self.model_classes_interlis.spuelstutzen
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.spuelstutzen):
             flushing_nozzle = self.create_or_update(
                 self.model_classes_tww_od.flushing_nozzle,
@@ -2159,6 +2715,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_abwasserbauwerk_symbol(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.wastewater_structure_symbol,
+            self.model_classes_interlis.abwasserbauwerk_symbol,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.abwasserbauwerk_symbol):
             wastewater_structure_symbol = self.create_or_update(
                 self.model_classes_tww_od.wastewater_structure_symbol,
@@ -2177,6 +2737,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_untersuchung(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.examination, self.model_classes_interlis.untersuchung
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.untersuchung):
             examination = self.create_or_update(
                 self.model_classes_tww_od.examination,
@@ -2251,6 +2814,10 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_normschachtschaden(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.damage_manhole,
+            self.model_classes_interlis.normschachtschaden,
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.normschachtschaden):
             damage_manhole = self.create_or_update(
                 self.model_classes_tww_od.damage_manhole,
@@ -2290,6 +2857,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_kanalschaden(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.damage_channel, self.model_classes_interlis.kanalschaden
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.kanalschaden):
             # Note : in TWW, some attributes are on the base damage class,
             # while they are on the normschachtschaden/kanalschaden subclasses
@@ -2325,6 +2895,9 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_datentraeger(self):
+        self.prefetch_instances(
+            self.model_classes_tww_od.data_media, self.model_classes_interlis.datentraeger
+        )
         for row in self.session_interlis.query(self.model_classes_interlis.datentraeger):
             data_media = self.create_or_update(
                 self.model_classes_tww_od.data_media,
@@ -2340,6 +2913,7 @@ class InterlisImporterToIntermediateSchema:
             print(".", end="")
 
     def _import_datei(self):
+        self.prefetch_instances(self.model_classes_tww_od.file, self.model_classes_interlis.datei)
         for row in self.session_interlis.query(self.model_classes_interlis.datei):
             file_table_row = self.create_or_update(
                 self.model_classes_tww_od.file,
@@ -0,0 +1,119 @@
+import math
+import struct
+
+from geoalchemy2.elements import WKBElement
+
+# EWKB flags of the geometry type
+EWKB_Z = 0x80000000
+EWKB_M = 0x40000000
+EWKB_SRID = 0x20000000
+
+# WKB geometry types
+WKB_POINT = 1
+WKB_LINESTRING = 2
+WKB_POLYGON = 3
+WKB_CIRCULARSTRING = 8
+WKB_TRIANGLE = 17
+WKB_COLLECTIONS = (
+    4,  # MultiPoint
+    5,  # MultiLineString
+    6,  # MultiPolygon
+    7,  # GeometryCollection
+    9,  # CompoundCurve
+    10,  # CurvePolygon
+    11,  # MultiCurve
+    12,  # MultiSurface
+    15,  # PolyhedralSurface
+    16,  # TIN
+)
+
+
+class WkbException(Exception):
+    pass
+
+
+def force_3d(element, zvalue=None):
+    """
+    Same as PostGIS ST_Force3D, but done locally on the (E)WKB to avoid a round trip to the
+    database for each geometry. Returns a WKBElement with an EWKB geometry, or None.
+    """
+    if element is None:
+        return None
+
+    data = element.data
+    if isinstance(data, str):
+        data = bytes.fromhex(data)
+    else:
+        data = bytes(data)
+
+    srid = element.srid if element.srid is not None and element.srid > 0 else None
+    out = bytearray()
+    _, srid = _force_3d_geometry(data, 0, out, 0.0 if zvalue is None else float(zvalue), srid)
+    return WKBElement(bytes(out), srid=srid or -1, extended=True)
+
+
+def _force_3d_geometry(data, pos, out, zvalue, srid=None):
+    """
+    Reads the geometry at pos in data and writes it with a Z dimension to out.
+    Returns the position after the geometry and its SRID.
+    """
+    endian = "<" if data[pos] == 1 else ">"
+    (wkb_type,) = struct.unpack_from(f"{endian}I", data, pos + 1)
+    pos += 5
+
+    has_z = bool(wkb_type & EWKB_Z)
+    has_m = bool(wkb_type & EWKB_M)
+    if wkb_type & EWKB_SRID:
+        (srid,) = struct.unpack_from(f"{endian}I", data, pos)
+        pos += 4
+    # ISO WKB uses 1000, 2000 and 3000 offsets instead of flags
+    iso_dimensions, geometry_type = divmod(wkb_type & 0x0FFFFFFF, 1000)
+    has_z = has_z or iso_dimensions in (1, 3)
+    has_m = has_m or iso_dimensions in (2, 3)
+    dimensions = 2 + has_z + has_m
+
+    # Only the top level geometry holds the SRID in EWKB
+    if srid is not None:
+        out += struct.pack("<BII", 1, geometry_type | EWKB_Z | EWKB_SRID, srid)
+    else:
+        out += struct.pack("<BI", 1, geometry_type | EWKB_Z)
+
+    def copy_points(pos, count):
+        values = struct.unpack_from(f"{endian}{count * dimensions}d", data, pos)
+        points = []
+        for i in range(0, len(values), dimensions):
+            x, y = values[i], values[i + 1]
+            if has_z:
+                z = values[i + 2]
+            elif math.isnan(x):
+                # empty point
+                z = math.nan
+            else:
+                z = zvalue
+            points.extend((x, y, z))
+        out.extend(struct.pack(f"<{count * 3}d", *points))
+        return pos + count * dimensions * 8
+
+    def read_count(pos):
+        (count,) = struct.unpack_from(f"{endian}I", data, pos)
+        out.extend(struct.pack("<I", count))
+        return pos + 4, count
+
+    if geometry_type == WKB_POINT:
+        pos = copy_points(pos, 1)
+    elif geometry_type in (WKB_LINESTRING, WKB_CIRCULARSTRING):
+        pos, count = read_count(pos)
+        pos = copy_points(pos, count)
+    elif geometry_type in (WKB_POLYGON, WKB_TRIANGLE):
+        pos, rings = read_count(pos)
+        for _ in range(rings):
+            pos, count = read_count(pos)
+            pos = copy_points(pos, count)
+    elif geometry_type in WKB_COLLECTIONS:
+        pos, geometries = read_count(pos)
+        for _ in range(geometries):
+            pos, _ = _force_3d_geometry(data, pos, out, zvalue)
+    else:
+        raise WkbException(f"Unsupported WKB geometry type {geometry_type}")
+
+    return pos, srid
@@ -18,13 +18,26 @@
 """
 
 import codecs
+import io
+import os
+import queue
+import re
+import shutil
+import struct
 import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from itertools import repeat
+
+import numpy as np
 
 try:
     import psycopg
+    from psycopg import sql as pgsql
 except ImportError:
     import psycopg2 as psycopg
+    from psycopg2 import sql as pgsql
 
 MEASURING_POINT_KIND = "Diverse kind of SWMM simulation parameters"
 MEASURING_DEVICE_REMARK = "SWMM Simulation"
@@ -110,9 +123,426 @@ SWMM_RESULTS_PARAMETERS["head"] = {
 
 NON_PHYSICAL_REM = "Non-physical point which materializes swmm simulations"
 
+SWMM_DATE_FORMAT = "%d/%m/%Y"
+
+# Number of rows fetched at once when writing the input file
+SWMM_FETCH_SIZE = 10000
+
+# Number of connections used to extract the swmm views concurrently
+SWMM_EXPORT_WORKERS = 4
+
+# Columns of the swmm views which are not written in the input file
+SWMM_NOT_PRINTED_FIELDS = [
+    "description",
+    "tag",
+    "geom",
+    "state",
+    "ws_obj_id",
+    "hierarchy",
+    "message",
+]
+
+# Number of measurement results staged before they are written to tww_od
+MEASUREMENT_RESULT_BATCH_SIZE = 500000
+
+# Columns of the node and link time series tables of the report file
+SWMM_TIME_SERIES_COLUMNS = {
+    "node": ["inflow", "flooding", "depth", "head"],
+    "link": ["flow", "velocity", "depth", "capacity"],
+}
+
+# Magic number at the beginning and at the end of the swmm binary output file
+SWMM_OUTPUT_MAGIC_NUMBER = 516114522
+
+# Index of the variables of the swmm binary output file for each column of the time series
+SWMM_OUTPUT_VARIABLES = {
+    "node": {"depth": 0, "head": 1, "inflow": 4, "flooding": 5},
+    "link": {"flow": 0, "depth": 1, "velocity": 2, "capacity": 4},
+}
+
+
+def read_swmm_template(template_file):
+    """
+    Split a swmm template file in sections
+
+    Parameters:
+    template_file (path): path of the INP file which store simulations parameters
+
+    Returns:
+    dic: text of each section, including its [NAME] header, by section name
+    """
+    sections = {}
+    name = None
+    with open(template_file) as f:
+        for line in f:
+            header = re.match(r"\s*\[(\w+)\]", line)
+            if header:
+                name = header.group(1)
+                if name in sections:
+                    # Only the first section of a name is used
+                    name = None
+                    continue
+                sections[name] = []
+            if name is not None:
+                sections[name].append(line)
+    return {name: "".join(lines) for name, lines in sections.items()}
+
+
+def run_swmm(bin_file, inp_file, rpt_file):
+    """
+    Run the swmm executable, the binary output file is written next to the report file
+
+    Parameters:
+    bin_file (path): path of the swmm executable
+    inp_file (path): path of the INP file
+    rpt_file (path): path of the report file to be written
+
+    Returns:
+    string: output of swmm
+    """
+    out_file = os.path.splitext(rpt_file)[0] + ".out"
+    return subprocess.run(
+        [bin_file, inp_file, rpt_file, out_file],
+        stdout=subprocess.PIPE,
+        stdin=subprocess.DEVNULL,
+        stderr=subprocess.STDOUT,
+        text=True,
+        creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+    ).stdout
+
+
+class SwmmReport:
+    """
+    Index of a SWMM report file
+
+    The report is scanned once: the analysis options are kept and the byte offsets of
+    the summary tables and of the time series of every node and link are recorded.
+    Sections are then read by seeking directly to them, so that reading all the time
+    series costs a single pass over the file.
+    """
+
+    SUMMARY_HEADING_LINES = 7
+    TIME_SERIES_HEADING_LINES = 5
+
+    def __init__(self, rpt_file):
+        """
+        Parameters:
+        rpt_file (path): path of the report file
+        """
+        self.rpt_file = rpt_file
+        self.options = {}
+        self.sections = {}
+        self.time_series_indexes = {}
+        self._index()
+
+    def _index(self):
+        line_number = -1
+        offset = 0
+        after_stars = False
+        current = None
+        with open(self.rpt_file, "rb") as f:
+            for raw_line in f:
+                line_number += 1
+                line_offset = offset
+                offset += len(raw_line)
+                line = raw_line.decode("utf-8").strip()
+
+                # Close the time series being indexed
+                if current is not None and line_number >= current["start_index"]:
+                    if line == "" or line.startswith("<<<") or line.find("*****") != -1:
+                        current["end_index"] = line_number
+                        current["end_offset"] = line_offset
+                        current = None
+                    elif line_number == current["start_index"]:
+                        current["offset"] = line_offset
+
+                if line.find("*****") != -1:
+                    # Section titles are framed by lines of stars
+                    after_stars = True
+                    current = None
+                    continue
+                if after_stars and line != "" and line not in self.sections:
+                    self.sections[line] = line_offset
+                after_stars = False
+
+                if line.startswith("<<< Node ") or line.startswith("<<< Link "):
+                    swmm_type, obj_id = line.split()[1:3]
+                    current = {
+                        "type": swmm_type.lower(),
+                        "title_index": line_number,
+                        "start_index": line_number + self.TIME_SERIES_HEADING_LINES,
+                        "end_index": line_number + self.TIME_SERIES_HEADING_LINES,
+                        "offset": offset,
+                        "end_offset": offset,
+                    }
+                    self.time_series_indexes[obj_id] = current
+                elif line.find(" ..") != -1:
+                    # Analysis options are written as "Name ...... value"
+                    self.options[line.split("..")[0].strip()] = line.split(".")[-1].strip()
+
+            if current is not None:
+                current["end_index"] = line_number + 1
+                current["end_offset"] = offset
+
+    def analysis_option(self, parameter):
+        """
+        Get the value of an analysis option, ie. "Starting Date"
+        """
+        if parameter in self.options:
+            return self.options[parameter]
+        value = None
+        for name, option_value in self.options.items():
+            if name.find(parameter) != -1:
+                value = option_value
+        return value
+
+    def summary_lines(self, table_title):
+        """
+        Get the rows of a summary table, ie. "Node Depth Summary"
+
+        Returns:
+        Array of array: values of each row
+        """
+        offset = self.sections.get(table_title)
+        if offset is None:
+            for title, title_offset in self.sections.items():
+                if title.find(table_title) != -1:
+                    offset = title_offset
+                    break
+        if offset is None:
+            return []
+
+        lines = []
+        with open(self.rpt_file, "rb") as f:
+            f.seek(offset)
+            for _ in range(self.SUMMARY_HEADING_LINES + 1):
+                f.readline()
+            for raw_line in f:
+                line = raw_line.decode("utf-8").rstrip()
+                if line == "":
+                    break
+                lines.append(line.split())
+        return lines
+
+    def time_series_rows(self, obj_id, f=None):
+        """
+        Get the rows of the time series of a node or a link
+
+        Parameters:
+        obj_id (string): id of the node or link in the report
+        f (file): report file opened in binary mode, opened here if not given
+
+        Returns:
+        Array of array: date, time and values of each time step
+        """
+        index = self.time_series_indexes[obj_id]
+        if f is None:
+            with open(self.rpt_file, "rb") as f:
+                return self.time_series_rows(obj_id, f)
+        f.seek(index["offset"])
+        data = f.read(index["end_offset"] - index["offset"]).decode("utf-8")
+        return [values for values in (line.split() for line in data.splitlines()) if values]
+
+    def time_series_arrays(self, obj_id, f=None):
+        """
+        Get the time series of a node or a link as columns
+
+        Parameters:
+        obj_id (string): id of the node or link in the report
+        f (file): report file opened in binary mode, opened here if not given
+
+        Returns:
+        dic: "time" as datetime64 array and a float array for each column of
+        SWMM_TIME_SERIES_COLUMNS
+        """
+        index = self.time_series_indexes[obj_id]
+        if f is None:
+            with open(self.rpt_file, "rb") as f:
+                return self.time_series_arrays(obj_id, f)
+        f.seek(index["offset"])
+        tokens = f.read(index["end_offset"] - index["offset"]).split()
+        columns = SWMM_TIME_SERIES_COLUMNS[index["type"]]
+        table = np.array(tokens).reshape(-1, 2 + len(columns))
+
+        # Dates and times only take a few distinct values, convert each of them once
+        dates, date_indexes = np.unique(table[:, 0], return_inverse=True)
+        days = np.array(
+            [datetime.strptime(d.decode("utf-8"), SWMM_DATE_FORMAT) for d in dates],
+            dtype="datetime64[s]",
+        )
+        times, time_indexes = np.unique(table[:, 1], return_inverse=True)
+        seconds = np.array(
+            [
+                int(h) * 3600 + int(m) * 60 + int(sec)
+                for h, m, sec in (t.decode("utf-8").split(":") for t in times)
+            ],
+            dtype="timedelta64[s]",
+        )
+
+        result = {"time": days[date_indexes] + seconds[time_indexes]}
+        for i, column in enumerate(columns):
+            result[column] = table[:, 2 + i].astype(np.float64)
+        return result
+
+    def iter_time_series_arrays(self):
+        """
+        Yield the time series of every node and link as columns, in the order of the report file
+
+        Yields:
+        (obj_id, swmm_type, columns)
+        """
+        with open(self.rpt_file, "rb") as f:
+            for obj_id, index in self.time_series_indexes.items():
+                yield obj_id, index["type"], self.time_series_arrays(obj_id, f)
+
+    def iter_time_series(self):
+        """
+        Yield the time series of every node and link in the order of the report file
+
+        Yields:
+        (obj_id, swmm_type, rows)
+        """
+        with open(self.rpt_file, "rb") as f:
+            for obj_id, index in self.time_series_indexes.items():
+                yield obj_id, index["type"], self.time_series_rows(obj_id, f)
+
+    def close(self):
+        """
+        Nothing to release, for compatibility with SwmmOutput
+        """
+
+
+class SwmmOutput:
+    """
+    Reader of a SWMM binary output file (.out)
+
+    The header is read once and the computed results are mapped with a NumPy memmap,
+    which gives random access to the time series of any node and link. It offers the
+    same time series methods as SwmmReport. The file stays mapped until close is called.
+    """
+
+    def __init__(self, out_file, obj_ids=None):
+        """
+        Parameters:
+        out_file (path): path of the binary output file
+        obj_ids (set): if given, only the time series of these nodes and links are read
+        """
+        self.out_file = out_file
+        with open(out_file, "rb") as f:
+            (magic, self.version, self.flow_units, n_subcatch, n_nodes, n_links, n_pollutants) = (
+                struct.unpack("<7i", f.read(28))
+            )
+            if magic != SWMM_OUTPUT_MAGIC_NUMBER:
+                raise ValueError(f"{out_file} is not a swmm binary output file")
+            f.seek(-24, os.SEEK_END)
+            (
+                ids_position,
+                properties_position,
+                results_position,
+                self.periods,
+                error_code,
+                magic,
+            ) = struct.unpack("<6i", f.read(24))
+            if magic != SWMM_OUTPUT_MAGIC_NUMBER or error_code != 0 or self.periods == 0:
+                raise ValueError(f"{out_file} does not contain valid results")
+
+            # Object ids
+            f.seek(ids_position)
+            ids = []
+            for _ in range(n_subcatch + n_nodes + n_links + n_pollutants):
+                (length,) = struct.unpack("<i", f.read(4))
+                ids.append(f.read(length).decode("utf-8"))
+            self.node_ids = ids[n_subcatch : n_subcatch + n_nodes]
+            self.link_ids = ids[n_subcatch + n_nodes : n_subcatch + n_nodes + n_links]
+
+            # Skip the properties of the subcatchments, nodes and links
+            f.seek(properties_position)
+            for n_objects in (n_subcatch, n_nodes, n_links):
+                (n_properties,) = struct.unpack("<i", f.read(4))
+                f.seek(4 * n_properties * (1 + n_objects), os.SEEK_CUR)
+
+            # Number of reported variables of subcatchments, nodes, links and system
+            n_variables = []
+            for _ in range(4):
+                (n,) = struct.unpack("<i", f.read(4))
+                f.seek(4 * n, os.SEEK_CUR)
+                n_variables.append(n)
+            self.start_date, self.report_step = struct.unpack("<di", f.read(12))
+
+        self.results = np.memmap(
+            out_file,
+            dtype=np.dtype(
+                [
+                    ("date", "<f8"),
+                    ("subcatchment", "<f4", (n_subcatch, n_variables[0])),
+                    ("node", "<f4", (n_nodes, n_variables[1])),
+                    ("link", "<f4", (n_links, n_variables[2])),
+                    ("system", "<f4", (n_variables[3],)),
+                ]
+            ),
+            mode="r",
+            offset=results_position,
+            shape=(self.periods,),
+        )
+        self.time_series_indexes = {}
+        for swmm_type, type_ids in (("node", self.node_ids), ("link", self.link_ids)):
+            for i, obj_id in enumerate(type_ids):
+                if obj_ids is None or obj_id in obj_ids:
+                    self.time_series_indexes[obj_id] = {"type": swmm_type, "index": i}
+
+        # Dates are stored as days since 30.12.1899
+        seconds = np.round(self.results["date"] * 86400).astype("timedelta64[s]")
+        self.times = np.datetime64("1899-12-30", "s") + seconds
+
+    def time_series_arrays(self, obj_id, f=None):
+        """
+        Get the time series of a node or a link as columns, see SwmmReport.time_series_arrays
+
+        Parameters:
+        obj_id (string): id of the node or link
+        f: unused, for compatibility with SwmmReport
+
+        Returns:
+        dic: "time" as datetime64 array and a float array for each column of
+        SWMM_TIME_SERIES_COLUMNS
+        """
+        index = self.time_series_indexes[obj_id]
+        values = self.results[index["type"]][:, index["index"], :]
+        result = {"time": self.times}
+        for column, variable in SWMM_OUTPUT_VARIABLES[index["type"]].items():
+            result[column] = np.array(values[:, variable], dtype=np.float64)
+        return result
+
+    def iter_time_series_arrays(self):
+        """
+        Yield the time series of every node and link as columns
+
+        Yields:
+        (obj_id, swmm_type, columns)
+        """
+        for obj_id, index in self.time_series_indexes.items():
+            yield obj_id, index["type"], self.time_series_arrays(obj_id)
+
+    def close(self):
+        """
+        Release the memmap, the file can then be overwritten or deleted (Windows)
+        """
+        self.results = None
+
 
 class TwwSwmm:
-    def __init__(self, title, service, state, inpfile, inptemplate, rptfile, binfile, feedback):
+    def __init__(
+        self,
+        title,
+        service,
+        state,
+        inpfile,
+        inptemplate,
+        rptfile,
+        binfile,
+        feedback,
+        template_sections=None,
+    ):
         """
         Initiate TwwSwmm
 
@@ -125,6 +555,8 @@ class TwwSwmm:
         rptfile (path): path of the OUT file which contains swmm results
         binfile (path): path of the swmm executable
         feedback (pyQGIS feedback)
+        template_sections (dic): sections of the template already read with read_swmm_template,
+            the template file is read if not given
         """
         self.title = title
         self.service = service
@@ -134,6 +566,10 @@ class TwwSwmm:
         self.bin_file = binfile
         self.feedback = feedback
         self.state = state
+        self._report = None
+        if template_sections is None and inptemplate is not None:
+            template_sections = read_swmm_template(inptemplate)
+        self.template_sections = dict(template_sections or {})
 
     def __enter__(self):
         if self.service is not None:
@@ -161,57 +597,68 @@ class TwwSwmm:
             self.feedback.setProgress(progress)
         return
 
-    def get_swmm_table(self, table_name, state, selected_structures, hierarchy):
+    def swmm_table_query(self, table_name, state, selected_structures, hierarchy):
         """
-        Extract data from the swmm views in the database
+        Build the query of a swmm view
 
         Parameters:
         table_name (string): Name of the view or table
         state (string): current or planned
         selected_structures ([string]): List of obj_id of the selected structures
+        hierarchy (string): hierarchy of the network to be extracted
 
         Returns:
-        dic: table content
-        array: table attributes
+        Composed: query
+        array: query parameters
 
         """
-
-        # Connects to service and get data and attributes from tableName
-        cur = self.con.cursor()
-
         # Configure the filters
         where_clauses = []
+        params = []
         if state == "planned":
-            where_clauses.append("(state = 'planned' OR state = 'current')")
+            where_clauses.append(pgsql.SQL("(state = 'planned' OR state = 'current')"))
         elif state == "current":
-            where_clauses.append("state = 'current'")
+            where_clauses.append(pgsql.SQL("state = 'current'"))
         if selected_structures:
-            where_clauses.append(
-                """
-                obj_id in ('{ids}')
-                """.format(
-                    ids="','".join(selected_structures)
-                )
-            )
+            where_clauses.append(pgsql.SQL("obj_id = ANY(%s)"))
+            params.append(list(selected_structures))
         if hierarchy:
-            where_clauses.append(f"""hierarchy = '{hierarchy}'""")
+            where_clauses.append(pgsql.SQL("hierarchy = %s"))
+            params.append(hierarchy)
 
-        sql = """
-        select * from tww_swmm.vw_{table_name}
-        """.format(
-            table_name=table_name
+        sql = pgsql.SQL("select * from tww_swmm.{view}").format(
+            view=pgsql.Identifier(f"vw_{table_name.lower()}")
         )
         # Add the filters to the sql
         if len(where_clauses) > 0:
-            sql = """
-                {sql} where {where_clauses}
-                """.format(
-                sql=sql, where_clauses=" AND ".join(where_clauses)
+            sql = pgsql.SQL("{sql} where {where_clauses}").format(
+                sql=sql, where_clauses=pgsql.SQL(" AND ").join(where_clauses)
             )
+        return sql, params
+
+    def get_swmm_table(self, table_name, state, selected_structures, hierarchy):
+        """
+        Extract data from the swmm views in the database
+
+        Parameters:
+        table_name (string): Name of the view or table
+        state (string): current or planned
+        selected_structures ([string]): List of obj_id of the selected structures
+
+        Returns:
+        dic: table content
+        array: table attributes
+
+        """
+
+        # Connects to service and get data and attributes from tableName
+        cur = self.con.cursor()
+        sql, params = self.swmm_table_query(table_name, state, selected_structures, hierarchy)
         try:
-            cur.execute(sql)
+            cur.execute(sql, params)
         except psycopg.ProgrammingError:
             self.feedback_push("error", f"Error while executing: {sql}")
+            self.con.rollback()
             return None, None
         self.feedback_push("info", f"Process vw_{table_name}")
         data = cur.fetchall()
@@ -220,64 +667,131 @@ class TwwSwmm:
 
         return data, attributes
 
-    def swmm_table(self, table_name, hierarchy=None, state=None, selected_structures=[]):
+    def write_swmm_table(
+        self,
+        f,
+        table_name,
+        hierarchy=None,
+        state=None,
+        selected_structures=[],
+        con=None,
+        messages=None,
+    ):
         """
         Write swmm objects extracted from TWW in swmm input file. Selects according
         to the state planned or current. If the object is a teksi wastewater structure
-        when the state is "planned" both "planned" and "operational" wastewater structures are selected
+        when the state is "planned" both "planned" and "operational" wastewater structures are selected.
+        The rows are streamed from a server-side cursor and written as they are fetched.
 
         Parameters:
+        f (file): swmm input file
         table_name (string): Name of the swmm section
         state (string): current or planned
         selected_structre ([string]). List of obj_id of the selected wastewater structures
-        ws (boolean): if the origin table is a wastewater structure
+        con (connection): connection to be used, the connection of TwwSwmm if not given
+        messages (array): if given, the messages are collected as (level, message) instead
+            of being pushed to the feedback
+
+        """
+        if con is None:
+            con = self.con
+        if messages is None:
+            feedback_push = self.feedback_push
+        else:
+
+            def feedback_push(level, message):
+                messages.append((level, message))
+
+        sql, params = self.swmm_table_query(table_name, state, selected_structures, hierarchy)
+        # A failing view must neither abort the transaction nor end it: the connection
+        # may hold the snapshot shared with the other sections
+        savepoint = pgsql.Identifier(f"swmm_{table_name.lower()}")
+        con.cursor().execute(pgsql.SQL("SAVEPOINT {savepoint}").format(savepoint=savepoint))
+        cur = con.cursor(name=f"swmm_{table_name.lower()}")
+        try:
+            cur.execute(sql, params)
+            rows = cur.fetchmany(SWMM_FETCH_SIZE)
+        except psycopg.ProgrammingError as e:
+            feedback_push("error", f"Error while executing: {sql}")
+            feedback_push("error", str(e))
+            # Rolling back to the savepoint also drops the server-side cursor
+            con.cursor().execute(
+                pgsql.SQL("ROLLBACK TO SAVEPOINT {savepoint}").format(savepoint=savepoint)
+            )
+            f.write("\n")
+            return
+        feedback_push("info", f"Process vw_{table_name}")
+        attributes = [desc[0] for desc in cur.description]
+
+        # Does not write values stored in columns descriptions, tags and geom
+        printed = [i for i, field in enumerate(attributes) if field not in SWMM_NOT_PRINTED_FIELDS]
+        description = attributes.index("description") if "description" in attributes else None
+        message = attributes.index("message") if "message" in attributes else None
+
+        # Create commented line which contains the field names
+        f.write("[" + table_name + "]\n;;")
+        f.write("".join(attributes[i] + "\t" for i in printed) + "\n")
+        while rows:
+            for feature in rows:
+                # Write description
+                if description is not None and feature[description] is not None:
+                    f.write(";" + str(feature[description]) + "\n")
+                f.write(
+                    "".join(
+                        ("" if feature[i] is None else str(feature[i])) + "\t" for i in printed
+                    )
+                    + "\n"
+                )
+                if message is not None and feature[message] != "":
+                    feedback_push("warning", feature[message])
+            rows = cur.fetchmany(SWMM_FETCH_SIZE)
+        f.write("\n")
+        cur.close()
+        con.cursor().execute(
+            pgsql.SQL("RELEASE SAVEPOINT {savepoint}").format(savepoint=savepoint)
+        )
+
+    def swmm_table(self, table_name, hierarchy=None, state=None, selected_structures=[]):
+        """
+        Get the swmm input paragraph of a section, see write_swmm_table
 
         Returns:
         String: table content
 
         """
-        notPrintedFields = [
-            "description",
-            "tag",
-            "geom",
-            "state",
-            "ws_obj_id",
-            "hierarchy",
-            "message",
-        ]
-        # Create commented line which contains the field names
-        fields = ""
-        data, attributes = self.get_swmm_table(table_name, state, selected_structures, hierarchy)
-        if data is not None:
-            for i, field in enumerate(attributes):
-                # Does not write values stored in columns descriptions, tags and geom
-                if field not in notPrintedFields:
-                    fields += field + "\t"
-
-            # Create input paragraph
-            tbl = "[" + table_name + "]\n" ";;" + fields + "\n"
-            for feature in data:
-                for i, v in enumerate(feature):
-                    # Write description
-                    if attributes[i] == "description" and v is not None:
-                        tbl += ";"
-                        tbl += str(v)
-                        tbl += "\n"
-
-                for i, v in enumerate(feature):
-                    # Does not write values stored in columns descriptions, tags and geom
-                    if attributes[i] not in notPrintedFields:
-                        if v is not None:
-                            tbl += str(v) + "\t"
-                        else:
-                            tbl += "\t"
-                    if attributes[i] == "message" and v != "":
-                        self.feedback_push("warning", v)
-                tbl += "\n"
-            tbl += "\n"
-            return tbl
-        else:
-            return "\n"
+        f = io.StringIO()
+        self.write_swmm_table(f, table_name, hierarchy, state, selected_structures)
+        return f.getvalue()
+
+    def get_template_section(self, parameter_name):
+        """
+        Get a section of the template
+
+        Parameters:
+        parameter_name (string): Name of the swmm section
+
+        Returns:
+        String: section content, None if the template has no such section
+        """
+        return self.template_sections.get(parameter_name)
+
+    def set_template_section(self, parameter_name, text):
+        """
+        Override a section of the template, ie. to change the rain of a scenario
+
+        Parameters:
+        parameter_name (string): Name of the swmm section
+        text (string): content of the section, with or without the [NAME] header.
+            None removes the section
+        """
+        if text is None:
+            self.template_sections.pop(parameter_name, None)
+            return
+        if not text.lstrip().startswith(f"[{parameter_name}]"):
+            text = f"[{parameter_name}]\n" + text
+        if not text.endswith("\n\n"):
+            text = text.rstrip("\n") + "\n\n"
+        self.template_sections[parameter_name] = text
 
     def copy_parameters_from_template(self, parameter_name):
         """
@@ -290,11 +804,8 @@ class TwwSwmm:
         String: section content
 
         """
-        # Read template
-        options_template = open(self.options_template_file).read()
-        # Find and extract options
-        index_start = options_template.find(f"[{parameter_name}]")
-        if index_start == -1:
+        option_text = self.get_template_section(parameter_name)
+        if option_text is None:
             # The balise options is not found
             self.feedback_push(
                 "info",
@@ -303,22 +814,20 @@ class TwwSwmm:
                 ),
             )
             return ""
-        else:
-            # Search for the next opening bracket
-            index_stop = options_template[index_start + 1 :].find("[")
-            if index_stop == -1:
-                # Copies text until the end of the file
-                index_stop = len(options_template)
-                option_text = options_template[index_start:index_stop] + "\n\n"
-            else:
-                index_stop = index_start + 1 + index_stop
-                option_text = options_template[index_start:index_stop]
-            return option_text
+        if not option_text.endswith("\n\n"):
+            option_text += "\n\n"
+        return option_text
 
-    def write_input(self, hierarchy, selected_structures, selected_reaches):
+    def write_input(
+        self, hierarchy, selected_structures, selected_reaches, workers=SWMM_EXPORT_WORKERS
+    ):
         """
         Write the swmm input file
 
+        Parameters:
+        workers (integer): number of connections used to extract the swmm views
+            concurrently, the views are extracted one after the other if 1
+
         """
 
         # From qgis swmm
@@ -329,120 +838,264 @@ class TwwSwmm:
         if selected_structures and selected_reaches:
             selected_ws_re = selected_structures + selected_reaches
 
-        with codecs.open(filename, "w", encoding="utf-8") as f:
-            # Title / Notes
-            # --------------
-            f.write("[TITLE]\n")
-            f.write(self.title + "\n\n")
-
-            # Options
-            # --------
-            f.write(self.copy_parameters_from_template("OPTIONS"))
-            f.write(self.copy_parameters_from_template("REPORT"))
-            f.write(self.copy_parameters_from_template("FILES"))
-            f.write(self.copy_parameters_from_template("EVENTS"))
-
-            # Climatology
-            # ------------
-            f.write(self.copy_parameters_from_template("HYDROGRAPHS"))
-            f.write(self.copy_parameters_from_template("EVAPORATION"))
-            f.write(self.copy_parameters_from_template("TEMPERATURE"))
-
-            # Hydrology
-            # ----------
-            self.feedback_set_progress(5)
-            f.write(self.swmm_table("RAINGAGES", hierarchy, state, selected_structures))
-            f.write(self.swmm_table("SYMBOLS", hierarchy, state, selected_structures))
-            self.feedback_set_progress(10)
-            f.write(self.swmm_table("SUBCATCHMENTS", hierarchy, state, selected_structures))
-            self.feedback_set_progress(15)
-            f.write(self.swmm_table("SUBAREAS", hierarchy, state, selected_structures))
-            self.feedback_set_progress(20)
-            f.write(self.swmm_table("AQUIFERS"))
-            self.feedback_set_progress(25)
-            f.write(self.swmm_table("INFILTRATION", hierarchy, state, selected_structures))
-            self.feedback_set_progress(30)
-            f.write(self.swmm_table("POLYGONS"))
-
-            f.write(self.copy_parameters_from_template("GROUNDWATER"))
-            f.write(self.copy_parameters_from_template("SNOWPACKS"))
-            f.write(self.copy_parameters_from_template("HYDROGAPHS"))
-            f.write(self.copy_parameters_from_template("LID_CONTROLS"))
-            f.write(self.copy_parameters_from_template("LID_USAGE"))
-
-            # Hydraulics: nodes
-            # ------------------
-            self.feedback_set_progress(35)
-            f.write(self.swmm_table("JUNCTIONS", hierarchy, state, selected_ws_re))
-            self.feedback_set_progress(40)
-            f.write(self.swmm_table("OUTFALLS", hierarchy, state, selected_structures))
-            self.feedback_set_progress(45)
-            f.write(self.swmm_table("STORAGES", hierarchy, state, selected_structures))
-            self.feedback_set_progress(50)
-            f.write(self.swmm_table("COORDINATES", hierarchy, state, selected_ws_re))
-            self.feedback_set_progress(55)
-            f.write(self.swmm_table("DWF", hierarchy, state, selected_structures))
-
-            f.write(self.copy_parameters_from_template("INFLOWS"))
-            f.write(self.swmm_table("DIVIDERS"))
-
-            # Hydraulics: links
-            # ------------------
-            self.feedback_set_progress(60)
-            f.write(self.swmm_table("CONDUITS", hierarchy, state, selected_reaches))
-            self.feedback_set_progress(65)
-            f.write(self.swmm_table("LOSSES", hierarchy, state, selected_structures))
-            self.feedback_set_progress(70)
-            f.write(self.swmm_table("PUMPS", hierarchy, state, selected_structures))
-            f.write(self.swmm_table("ORIFICES", hierarchy, state, selected_structures))
-            f.write(self.swmm_table("WEIRS", hierarchy, state, selected_structures))
-            self.feedback_set_progress(75)
-            f.write(self.swmm_table("XSECTIONS", hierarchy, state, selected_reaches))
-            self.feedback_set_progress(80)
-            f.write(self.swmm_table("LOSSES", hierarchy, state, selected_structures))
-            f.write(self.swmm_table("OUTLETS"))
-            self.feedback_set_progress(85)
-            f.write(self.swmm_table("VERTICES", hierarchy, state, selected_reaches))
-            f.write(self.copy_parameters_from_template("TRANSECTS"))
-            f.write(self.copy_parameters_from_template("CONTROLS"))
-
-            # Quality
-            # --------
-            self.feedback_set_progress(90)
-            f.write(self.swmm_table("LANDUSES"))
-            self.feedback_set_progress(93)
-            f.write(self.swmm_table("COVERAGES", None, None, selected_structures))
-
-            f.write(self.copy_parameters_from_template("POLLUTANTS"))
-            f.write(self.copy_parameters_from_template("BUILDUP"))
-            f.write(self.copy_parameters_from_template("WASHOFF"))
-            f.write(self.copy_parameters_from_template("TREATMENT"))
-            f.write(self.copy_parameters_from_template("RDII"))
-            f.write(self.copy_parameters_from_template("LOADINGS"))
-
-            # Curves
-            # -------
-            f.write(self.swmm_table("CURVES"))
-
-            # Time series
-            # ------------
-            f.write(self.copy_parameters_from_template("TIMESERIES"))
-
-            # Time patterns
-            # --------------
-            f.write(self.copy_parameters_from_template("PATTERNS"))
-
-            # Map labels
-            # -----------
-            f.write(self.copy_parameters_from_template("LABELS"))
-            self.feedback_set_progress(96)
-
-            # Tags
-            # ----
-            f.write(self.swmm_table("TAGS", state, selected_ws_re))
-        f.close()
+        # Sections of the input file in the required order, with the arguments of
+        # write_swmm_table for the sections extracted from the views
+        sections = []
+        # Title / Notes
+        # --------------
+        sections.append(("TITLE", None))
+
+        # Options
+        # --------
+        sections.append(("OPTIONS", None))
+        sections.append(("REPORT", None))
+        sections.append(("FILES", None))
+        sections.append(("EVENTS", None))
+
+        # Climatology
+        # ------------
+        sections.append(("HYDROGRAPHS", None))
+        sections.append(("EVAPORATION", None))
+        sections.append(("TEMPERATURE", None))
+
+        # Hydrology
+        # ----------
+        sections.append(("RAINGAGES", (hierarchy, state, selected_structures)))
+        sections.append(("SYMBOLS", (hierarchy, state, selected_structures)))
+        sections.append(("SUBCATCHMENTS", (hierarchy, state, selected_structures)))
+        sections.append(("SUBAREAS", (hierarchy, state, selected_structures)))
+        sections.append(("AQUIFERS", ()))
+        sections.append(("INFILTRATION", (hierarchy, state, selected_structures)))
+        sections.append(("POLYGONS", ()))
+
+        sections.append(("GROUNDWATER", None))
+        sections.append(("SNOWPACKS", None))
+        sections.append(("HYDROGAPHS", None))
+        sections.append(("LID_CONTROLS", None))
+        sections.append(("LID_USAGE", None))
+
+        # Hydraulics: nodes
+        # ------------------
+        sections.append(("JUNCTIONS", (hierarchy, state, selected_ws_re)))
+        sections.append(("OUTFALLS", (hierarchy, state, selected_structures)))
+        sections.append(("STORAGES", (hierarchy, state, selected_structures)))
+        sections.append(("COORDINATES", (hierarchy, state, selected_ws_re)))
+        sections.append(("DWF", (hierarchy, state, selected_structures)))
+
+        sections.append(("INFLOWS", None))
+        sections.append(("DIVIDERS", ()))
+
+        # Hydraulics: links
+        # ------------------
+        sections.append(("CONDUITS", (hierarchy, state, selected_reaches)))
+        sections.append(("LOSSES", (hierarchy, state, selected_structures)))
+        sections.append(("PUMPS", (hierarchy, state, selected_structures)))
+        sections.append(("ORIFICES", (hierarchy, state, selected_structures)))
+        sections.append(("WEIRS", (hierarchy, state, selected_structures)))
+        sections.append(("XSECTIONS", (hierarchy, state, selected_reaches)))
+        sections.append(("LOSSES", (hierarchy, state, selected_structures)))
+        sections.append(("OUTLETS", ()))
+        sections.append(("VERTICES", (hierarchy, state, selected_reaches)))
+        sections.append(("TRANSECTS", None))
+        sections.append(("CONTROLS", None))
+
+        # Quality
+        # --------
+        sections.append(("LANDUSES", ()))
+        sections.append(("COVERAGES", (None, None, selected_structures)))
+
+        sections.append(("POLLUTANTS", None))
+        sections.append(("BUILDUP", None))
+        sections.append(("WASHOFF", None))
+        sections.append(("TREATMENT", None))
+        sections.append(("RDII", None))
+        sections.append(("LOADINGS", None))
+
+        # Curves
+        # -------
+        sections.append(("CURVES", ()))
+
+        # Time series
+        # ------------
+        sections.append(("TIMESERIES", None))
+
+        # Time patterns
+        # --------------
+        sections.append(("PATTERNS", None))
+
+        # Map labels
+        # -----------
+        sections.append(("LABELS", None))
+
+        # Tags
+        # ----
+        sections.append(("TAGS", (state, selected_ws_re)))
+
+        # Extract the views concurrently in temporary files
+        tables = [(name, args) for name, args in sections if args is not None]
+        if workers > 1 and self.service is not None and len(tables) > 1:
+            fetched = iter(self.fetch_swmm_tables(tables, workers))
+        else:
+            fetched = None
+
+        with open(filename, "w", encoding="utf-8", newline="\n", buffering=1 << 20) as f:
+            for i, (name, args) in enumerate(sections):
+                self.feedback_set_progress(i * 96 / len(sections))
+                if name == "TITLE":
+                    # Title / Notes
+                    f.write("[TITLE]\n")
+                    f.write(self.title + "\n\n")
+                elif args is None:
+                    f.write(self.copy_parameters_from_template(name))
+                elif fetched is None:
+                    self.write_swmm_table(f, name, *args)
+                else:
+                    tmp, messages = next(fetched).result()
+                    for level, message in messages:
+                        self.feedback_push(level, message)
+                    tmp.seek(0)
+                    shutil.copyfileobj(tmp, f)
+                    tmp.close()
         return
 
+    def fetch_swmm_tables(self, tables, workers):
+        """
+        Extract swmm views concurrently, each one in a temporary file. The views are read
+        over a pool of read-only connections sharing one repeatable read snapshot, so that
+        the sections are consistent with each other. The snapshot is exported by a dedicated
+        connection, the transaction of the TwwSwmm connection is left untouched.
+
+        Parameters:
+        tables (array): name and arguments of write_swmm_table of each section
+        workers (integer): number of connections
+
+        Returns:
+        array: a future of (temporary file, messages) for each section, in the same order
+        """
+        snapshot_con = psycopg.connect(service=self.service)
+        connections = queue.Queue()
+        try:
+            cur = snapshot_con.cursor()
+            cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+            cur.execute("SELECT pg_export_snapshot()")
+            snapshot = cur.fetchone()[0]
+            del cur
+
+            for _ in range(min(workers, len(tables))):
+                con = psycopg.connect(service=self.service)
+                connections.put(con)
+                cur = con.cursor()
+                cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+                cur.execute(
+                    pgsql.SQL("SET TRANSACTION SNAPSHOT {snapshot}").format(
+                        snapshot=pgsql.Literal(snapshot)
+                    )
+                )
+                del cur
+
+            def fetch(name, args):
+                con = connections.get()
+                try:
+                    tmp = tempfile.TemporaryFile("w+", encoding="utf-8", newline="\n")
+                    messages = []
+                    self.write_swmm_table(tmp, name, *args, con=con, messages=messages)
+                    return tmp, messages
+                finally:
+                    connections.put(con)
+
+            with ThreadPoolExecutor(max_workers=connections.qsize()) as executor:
+                futures = [executor.submit(fetch, name, args) for name, args in tables]
+        finally:
+            # Closing the connections ends their read-only transactions and the snapshot
+            while not connections.empty():
+                connections.get().close()
+            snapshot_con.close()
+        return futures
+
+    def get_report(self):
+        """
+        Get the index of the report file, the file is scanned on the first call
+
+        Returns:
+        SwmmReport: index of the report file
+        """
+        if self._report is None:
+            self._report = SwmmReport(self.rpt_file)
+        return self._report
+
+    def get_out_file(self):
+        """
+        Get the path of the binary output file written by swmm next to the report file.
+        None if there is no such file or if it is older than the input file, in which case
+        it belongs to a previous run.
+        """
+        if self.rpt_file is None:
+            return None
+        out_file = os.path.splitext(self.rpt_file)[0] + ".out"
+        if not os.path.exists(out_file) or not os.path.exists(self.rpt_file):
+            return None
+        # swmm writes the report after the binary output, only the input file can tell
+        # that the binary output is stale
+        if (
+            self.input_file is not None
+            and os.path.exists(self.input_file)
+            and os.path.getmtime(out_file) < os.path.getmtime(self.input_file)
+        ):
+            self.feedback_push(
+                "info", "The binary output file is older than the input file, it is not used"
+            )
+            return None
+        return out_file
+
+    @staticmethod
+    def output_mismatch(output, report):
+        """
+        Check that a binary output file comes from the same run as a report file
+
+        Returns:
+        string: why the binary output does not match the report, None if it does
+        """
+        missing = set(report.time_series_indexes) - set(output.time_series_indexes)
+        if missing:
+            return f"{len(missing)} nodes or links of the report file are missing"
+        if report.time_series_indexes:
+            times = report.time_series_arrays(next(iter(report.time_series_indexes)))["time"]
+            if (
+                len(times) != len(output.times)
+                or times[0] != output.times[0]
+                or times[-1] != output.times[-1]
+            ):
+                return "its time steps differ from the ones of the report file"
+        return None
+
+    def get_time_series_reader(self):
+        """
+        Get the reader of the full time series: the binary output file if it is up to date
+        and matches the report file, the report file otherwise. Both only give the nodes
+        and links whose time series are in the report file. The reader must be closed
+        after use.
+
+        Returns:
+        SwmmOutput or SwmmReport
+        """
+        report = self.get_report()
+        out_file = self.get_out_file()
+        if out_file is None:
+            return report
+
+        try:
+            output = SwmmOutput(out_file, set(report.time_series_indexes))
+        except (ValueError, struct.error) as e:
+            self.feedback_push("info", f"The binary output file is not used: {e}")
+            return report
+
+        mismatch = self.output_mismatch(output, report)
+        if mismatch is not None:
+            output.close()
+            self.feedback_push("info", f"The binary output file is not used: {mismatch}")
+            return report
+        return output
+
     def extract_time_series_indexes(self):
         """
         Extract full time series from swmm report file
@@ -451,42 +1104,15 @@ class TwwSwmm:
         data_indexes (dictionary): dictionary of the object id with data indexes
 
         """
-
-        o = codecs.open(self.rpt_file, "r", encoding="utf-8")
-        line = o.readline()
-        title_found = False
-        line_number = -1
-        data_indexes = {}
-        heading_lines = 5
-        while line:
-            line_number += 1
-            line = line.rstrip()
-            # Search for the table title
-            if line.find("*****") != -1:
-                # The following title is found: stop the recording of the indexes
-                title_found = False
-
-            if line.find("<<< Link ") != -1 or line.find("<<< Node ") != -1:
-                title_found = True
-                line_after_title = 0
-                obj_id = line.strip().split(" ")[2]
-                data_indexes[obj_id] = {}
-                data_indexes[obj_id]["title_index"] = line_number
-                data_indexes[obj_id]["start_index"] = line_number + heading_lines
-                if line.find("Link") != -1:
-                    data_indexes[obj_id]["type"] = "link"
-                if line.find("Node") != -1:
-                    data_indexes[obj_id]["type"] = "node"
-
-            if title_found and line_after_title > heading_lines and line.strip() == "":
-                data_indexes[obj_id]["end_index"] = line_number - 1
-
-            if title_found:
-                line_after_title += 1
-
-            line = o.readline()
-        o.close()
-        return data_indexes
+        return {
+            obj_id: {
+                "type": index["type"],
+                "title_index": index["title_index"],
+                "start_index": index["start_index"],
+                "end_index": index["end_index"],
+            }
+            for obj_id, index in self.get_report().time_series_indexes.items()
+        }
 
     def extract_summary_lines(self, table_title):
         """
@@ -499,35 +1125,7 @@ class TwwSwmm:
         Array of array: Extracted computed values
 
         """
-
-        o = codecs.open(self.rpt_file, "r", encoding="utf-8")
-
-        line = o.readline()
-        no_line = 0
-        lines = []
-        title_found = False
-        end_table_found = False
-        while line:
-            line = line.rstrip()
-            # Search for the table title
-            if line.find(table_title) != -1:
-                title_found = True
-                line_after_title = 0
-
-            if title_found and line_after_title > 7 and line == "":
-                end_table_found = True
-
-            if title_found and end_table_found is False and line_after_title > 7:
-                lines.append(line.split())
-
-            if title_found:
-                line_after_title += 1
-
-            no_line += 1
-            line = o.readline()
-        o.close()
-
-        return lines
+        return self.get_report().summary_lines(table_title)
 
     def extract_node_depth_summary(self):
         """
@@ -592,7 +1190,10 @@ class TwwSwmm:
 
         """
 
-        command = [self.bin_file, self.input_file, self.rpt_file]
+        out_file = os.path.splitext(self.rpt_file)[0] + ".out"
+        command = [self.bin_file, self.input_file, self.rpt_file, out_file]
+        # The report file is rewritten
+        self._report = None
         self.feedback_push("info", "command: " + " ".join(map(str, command)))
         proc = subprocess.run(
             command,
@@ -605,28 +1206,119 @@ class TwwSwmm:
 
         return proc
 
+    def run_scenarios(self, scenarios, workers=None, import_summary=False):
+        """
+        Create the input files of several scenarios and run swmm on them in parallel
+
+        Parameters:
+        scenarios (array): dictionaries describing each scenario with the keys
+            title, inp_template, state, hierarchy, selected_structures, selected_reaches,
+            inp_file, rpt_file and template_sections (sections overriding the template)
+        workers (integer): maximum number of swmm processes running at the same time,
+            the number of processors if not given
+        import_summary (boolean): import the summary of the successful runs in the database,
+            the title of the scenario is used as simulation name
+
+        Returns:
+        array: dictionaries with title, inp_file, rpt_file, output and errors of each run
+        """
+        nscenarios = len(scenarios)
+        templates = {}
+
+        # The inputs are extracted one after the other, each of them uses the pool of
+        # write_input
+        for i, scenario in enumerate(scenarios):
+            self.feedback_push("info", f"Create input of {scenario['title']}")
+            if scenario["inp_template"] not in templates:
+                templates[scenario["inp_template"]] = read_swmm_template(scenario["inp_template"])
+            with TwwSwmm(
+                scenario["title"],
+                self.service,
+                scenario.get("state", "current"),
+                scenario["inp_file"],
+                scenario["inp_template"],
+                scenario["rpt_file"],
+                self.bin_file,
+                self.feedback,
+                templates[scenario["inp_template"]],
+            ) as qs:
+                for name, text in scenario.get("template_sections", {}).items():
+                    qs.set_template_section(name, text)
+                qs.write_input(
+                    scenario.get("hierarchy", "primary"),
+                    scenario.get("selected_structures"),
+                    scenario.get("selected_reaches"),
+                )
+            self.feedback_set_progress((i + 1) * 30 / nscenarios)
+
+        # Run swmm, one process per worker
+        results = []
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+            futures = {
+                executor.submit(
+                    run_swmm, self.bin_file, scenario["inp_file"], scenario["rpt_file"]
+                ): scenario
+                for scenario in scenarios
+            }
+            for future in as_completed(futures):
+                scenario = futures[future]
+                try:
+                    output = future.result()
+                except OSError as e:
+                    output = str(e)
+                errors = output is None or re.search("There are errors", output) is not None
+                results.append(
+                    {
+                        "title": scenario["title"],
+                        "inp_file": scenario["inp_file"],
+                        "rpt_file": scenario["rpt_file"],
+                        "output": output,
+                        "errors": errors,
+                    }
+                )
+                if errors:
+                    self.feedback_push("error", f"{scenario['title']}: {output}")
+                else:
+                    self.feedback_push("info", f"{scenario['title']}: done")
+                self.feedback_set_progress(
+                    30 + len(results) * (40 if import_summary else 70) / nscenarios
+                )
+
+        if import_summary:
+            for i, result in enumerate(results):
+                if result["errors"]:
+                    continue
+                self.feedback_push("info", f"Import summary of {result['title']}")
+                with TwwSwmm(
+                    result["title"],
+                    self.service,
+                    None,
+                    None,
+                    None,
+                    result["rpt_file"],
+                    None,
+                    self.feedback,
+                ) as qs:
+                    qs.import_summary(result["title"])
+                self.feedback_set_progress(70 + (i + 1) * 30 / nscenarios)
+
+        return results
+
     def get_analysis_option(self, parameter):
-        o = codecs.open(self.rpt_file, "r", encoding="utf-8")
-        line = o.readline()
-        while line:
-            line = line.rstrip()
-            # Search for the analyis option
-            if line.find(parameter) != -1:
-                value = line.split(".")[-1].strip()
-            line = o.readline()
-        o.close()
-        return value
+        return self.get_report().analysis_option(parameter)
 
     def convert_to_datetime(self, str_date):
-        date = datetime.strptime(str_date, "%d/%m/%Y %H:%M:%S")
+        date = datetime.strptime(str_date, SWMM_DATE_FORMAT + " %H:%M:%S")
         return date
 
-    def import_full_results(self, sim_description):
+    def import_full_results(self, sim_description, bulk=True):
         """
         Import the full results from an SWMM report file
 
         Parameters:
         sim_description (string): Title of the simulation
+        bulk (boolean): stage the measurement results with COPY and write them
+            with set-based statements instead of one query per value
 
         """
 
@@ -635,48 +1327,315 @@ class TwwSwmm:
         simulation_duration = simulation_end_date - simulation_start_date
         measuring_duration = simulation_duration.total_seconds()
 
-        data_indexes = self.extract_time_series_indexes()
-
-        ndata = len(data_indexes.keys())
-        self.feedback_push("info", "Import full results")
-        counter = 0
-        for obj_id in data_indexes.keys():
-            counter += 1
-            self.feedback_set_progress(counter * 100 / ndata)
-            # Create measuring point if necessary
-            if data_indexes[obj_id]["type"] == "node":
-                mp_obj_id = self.create_measuring_point_node(obj_id, sim_description)
-            if data_indexes[obj_id]["type"] == "link":
-                mp_obj_id = self.create_measuring_point_link(obj_id, sim_description)
-            if mp_obj_id:
-                # Create measuring device
-                self.create_measuring_device(mp_obj_id)
-                # Get measurement data of the current object
-                measurement_data = self.get_full_results(
-                    data_indexes[obj_id]["start_index"],
-                    data_indexes[obj_id]["end_index"],
-                    data_indexes[obj_id]["type"],
-                )
-                # Record each measurement
-                m_counter = 0
-                for m in measurement_data:
-                    m_counter += 1
-                    time = self.convert_to_datetime(m["date"] + " " + m["time"]).isoformat()
-                    for k in m.keys():
-                        if k in SWMM_RESULTS_PARAMETERS.keys():
-                            if SWMM_RESULTS_PARAMETERS[k]["recorded"]:
-                                ms_obj_id = self.create_measurement_series(
-                                    mp_obj_id,
-                                    k,
-                                    SWMM_RESULTS_PARAMETERS[k]["dimension"],
-                                )
-                                self.create_measurement_result(
-                                    ms_obj_id,
-                                    SWMM_RESULTS_PARAMETERS[k]["tww_measurement_type"],
-                                    measuring_duration,
-                                    time,
-                                    m[k],
+        report = self.get_time_series_reader()
+        try:
+            ndata = len(report.time_series_indexes)
+            self.feedback_push("info", "Import full results")
+
+            # Get or create the measuring points, devices and series of all objects at once
+            measuring_points = self.prepare_measuring_points(
+                sim_description,
+                [k for k, v in report.time_series_indexes.items() if v["type"] == "node"],
+                [k for k, v in report.time_series_indexes.items() if v["type"] == "link"],
+            )
+            measurement_series = self.prepare_measurement_series(
+                set(measuring_points.values()), SWMM_RESULTS_PARAMETERS
+            )
+
+            counter = 0
+            results = []
+            for obj_id, swmm_type, series in report.iter_time_series_arrays():
+                counter += 1
+                self.feedback_set_progress(counter * 100 / ndata)
+                mp_obj_id = measuring_points.get(obj_id)
+                if mp_obj_id:
+                    times = np.datetime_as_string(series["time"], unit="s").tolist()
+                    # Record each measurement
+                    for k in SWMM_TIME_SERIES_COLUMNS[swmm_type]:
+                        if not SWMM_RESULTS_PARAMETERS[k]["recorded"]:
+                            continue
+                        ms_obj_id = measurement_series.get((mp_obj_id, k))
+                        if ms_obj_id is None:
+                            continue
+                        measurement_type = SWMM_RESULTS_PARAMETERS[k]["tww_measurement_type"]
+                        values = series[k].tolist()
+                        if bulk:
+                            results.extend(
+                                zip(
+                                    repeat(ms_obj_id),
+                                    repeat(measurement_type),
+                                    repeat(measuring_duration),
+                                    times,
+                                    values,
                                 )
+                            )
+                            if len(results) >= MEASUREMENT_RESULT_BATCH_SIZE:
+                                self.upsert_measurement_results(results)
+                                results = []
+                            continue
+                        for time, value in zip(times, values):
+                            self.create_measurement_result(
+                                ms_obj_id, measurement_type, measuring_duration, time, value
+                            )
+            if bulk:
+                self.upsert_measurement_results(results)
+                self.con.commit()
+        finally:
+            report.close()
+        return
+
+    def prepare_measuring_points(self, sim_description, node_obj_ids, link_obj_ids):
+        """
+        Get the measuring points of a simulation for nodes and links. The existing measuring
+        points are fetched, the missing ones are created together with their measuring device.
+        The transaction is not committed, it is rolled back if a statement fails.
+
+        Parameters:
+        sim_description (string): name of the simulation
+        node_obj_ids ([string]): wastewater node object IDs
+        link_obj_ids ([string]): reach object IDs
+
+        Returns:
+        dic: measuring point object ID by node or reach object ID
+        """
+        cur = self.con.cursor()
+        try:
+            # 4594 = technical purpose [TO VALIDATE]
+            sql = """
+            INSERT INTO tww_od.measuring_point
+            (damming_device, identifier, kind,
+            purpose, remark, fk_wastewater_structure)
+            SELECT 5721, NULL, %(kind)s, 4594, %(remark)s, ws.obj_id
+            FROM (
+                SELECT ws.obj_id FROM tww_od.wastewater_structure ws
+                WHERE ws.fk_main_wastewater_node = ANY(%(nodes)s::text[])
+                UNION
+                SELECT ne.fk_wastewater_structure FROM tww_od.wastewater_networkelement ne
+                WHERE ne.obj_id = ANY(%(links)s::text[])
+            ) ws
+            WHERE ws.obj_id IS NOT NULL
+            AND NOT EXISTS (
+                SELECT 1 FROM tww_od.measuring_point mp
+                WHERE mp.fk_wastewater_structure = ws.obj_id
+                AND mp.remark = %(remark)s
+            )
+            """
+            params = {
+                "kind": MEASURING_POINT_KIND,
+                "remark": sim_description,
+                "nodes": list(node_obj_ids),
+                "links": list(link_obj_ids),
+            }
+            cur.execute(sql, params)
+
+            sql = """
+            SELECT ws.fk_main_wastewater_node, mp.obj_id
+            FROM tww_od.measuring_point mp
+            JOIN tww_od.wastewater_structure ws on mp.fk_wastewater_structure = ws.obj_id
+            WHERE ws.fk_main_wastewater_node = ANY(%(nodes)s::text[])
+            AND mp.remark = %(remark)s
+            UNION ALL
+            SELECT ne.obj_id, mp.obj_id
+            FROM tww_od.measuring_point mp
+            JOIN tww_od.wastewater_networkelement ne ON
+            ne.fk_wastewater_structure = mp.fk_wastewater_structure
+            WHERE ne.obj_id = ANY(%(links)s::text[])
+            AND mp.remark = %(remark)s
+            """
+            cur.execute(sql, params)
+            measuring_points = dict(cur.fetchall())
+
+            sql = """
+            INSERT INTO tww_od.measuring_device
+            (kind, remark, fk_measuring_point)
+            SELECT DISTINCT 5702, %(remark)s, mp.obj_id
+            FROM unnest(%(measuring_points)s::text[]) AS mp(obj_id)
+            WHERE NOT EXISTS (
+                SELECT 1 FROM tww_od.measuring_device md
+                WHERE md.fk_measuring_point = mp.obj_id
+                AND md.remark = %(remark)s
+            )
+            """
+            cur.execute(
+                sql,
+                {
+                    "remark": MEASURING_DEVICE_REMARK,
+                    "measuring_points": list(set(measuring_points.values())),
+                },
+            )
+        except psycopg.Error as e:
+            # The transaction is aborted, nothing can be written afterwards
+            self.con.rollback()
+            self.feedback_push("error", f"Error while excecuting: {sql}")
+            self.feedback_push("error", str(e))
+            raise
+        del cur
+        return measuring_points
+
+    def prepare_measurement_series(self, mp_obj_ids, parameters):
+        """
+        Get the measurement series of measuring points, the missing ones are created.
+        The transaction is not committed, it is rolled back if a statement fails.
+
+        Parameters:
+        mp_obj_ids ([string]): measuring point object IDs
+        parameters (dic): SWMM_RESULTS_PARAMETERS or SWMM_SUMMARY_PARAMETERS
+
+        Returns:
+        dic: measurement serie object ID by (measuring point object ID, parameter name)
+        """
+        names = [k for k, v in parameters.items() if v["recorded"]]
+        cur = self.con.cursor()
+        try:
+            sql = """
+            SELECT fk_measuring_point, remark, obj_id FROM tww_od.measurement_series
+            WHERE fk_measuring_point = ANY(%s::text[])
+            AND remark = ANY(%s::text[])
+            """
+            cur.execute(sql, (list(mp_obj_ids), names))
+            measurement_series = {(mp, name): ms for mp, name, ms in cur.fetchall()}
+
+            missing = [
+                (mp, name)
+                for mp in mp_obj_ids
+                for name in names
+                if (mp, name) not in measurement_series
+            ]
+            if missing:
+                # 3217 = other [TO VALIDATE]
+                sql = """
+                INSERT INTO tww_od.measurement_series
+                (identifier, dimension, kind, remark, fk_measuring_point)
+                SELECT null, s.dimension, 3217, s.remark, s.fk_measuring_point
+                FROM unnest(%s::text[], %s::text[], %s::text[])
+                AS s(fk_measuring_point, remark, dimension)
+                RETURNING fk_measuring_point, remark, obj_id
+                """
+                cur.execute(
+                    sql,
+                    (
+                        [mp for mp, name in missing],
+                        [name for mp, name in missing],
+                        [parameters[name]["dimension"] for mp, name in missing],
+                    ),
+                )
+                for mp, name, ms in cur.fetchall():
+                    measurement_series[(mp, name)] = ms
+        except psycopg.Error as e:
+            # The transaction is aborted, nothing can be written afterwards
+            self.con.rollback()
+            self.feedback_push("error", f"Error while excecuting: {sql}")
+            self.feedback_push("error", str(e))
+            raise
+        del cur
+        return measurement_series
+
+    def copy_rows(self, cur, table_name, columns, rows):
+        """
+        Copy rows into a table with COPY FROM STDIN
+
+        Parameters:
+        cur (cursor): cursor of the connection
+        table_name (string): name of the destination table
+        columns ([string]): names of the destination columns
+        rows (iterable): tuples of values
+        """
+        sql = "COPY {table_name} ({columns}) FROM STDIN".format(
+            table_name=table_name, columns=", ".join(columns)
+        )
+        if hasattr(cur, "copy"):
+            # psycopg 3
+            with cur.copy(sql) as copy:
+                for row in rows:
+                    copy.write_row(row)
+        else:
+            buffer = io.StringIO()
+            for row in rows:
+                buffer.write("\t".join("\\N" if v is None else str(v) for v in row))
+                buffer.write("\n")
+            buffer.seek(0)
+            cur.copy_expert(sql, buffer)
+
+    def upsert_measurement_results(self, results):
+        """
+        Creates or updates measurement results with set-based statements. The results are
+        staged in a temporary table, existing results (same measurement serie, same time,
+        same type) are updated if they changed and the others are inserted. If a result is
+        staged several times, the last one is written. The transaction is not committed,
+        it is rolled back if a statement fails.
+
+        Parameters:
+        results (array): tuples of measurement serie object ID, measurement type,
+            measuring duration, time and value
+        """
+        if not results:
+            return
+
+        cur = self.con.cursor()
+        sql = """
+        CREATE TEMP TABLE IF NOT EXISTS swmm_measurement_result
+        (fk_measurement_series varchar(16), measurement_type integer,
+        measuring_duration decimal(7,0), time timestamp, value real,
+        staging_order bigserial);
+        TRUNCATE swmm_measurement_result RESTART IDENTITY;
+        """
+        # Keep one staged row per result, the last one staged
+        staged = """
+        (SELECT DISTINCT ON (fk_measurement_series, time, measurement_type) *
+        FROM swmm_measurement_result
+        ORDER BY fk_measurement_series, time, measurement_type, staging_order DESC) s
+        """
+        try:
+            cur.execute(sql)
+            self.copy_rows(
+                cur,
+                "swmm_measurement_result",
+                [
+                    "fk_measurement_series",
+                    "measurement_type",
+                    "measuring_duration",
+                    "time",
+                    "value",
+                ],
+                results,
+            )
+            sql = """
+            UPDATE tww_od.measurement_result mr
+            SET measuring_duration = s.measuring_duration, value = s.value
+            FROM {staged}
+            WHERE mr.fk_measurement_series = s.fk_measurement_series
+            AND mr.time = s.time
+            AND mr.measurement_type = s.measurement_type
+            AND (mr.measuring_duration IS DISTINCT FROM s.measuring_duration
+            OR mr.value IS DISTINCT FROM s.value);
+            """.format(
+                staged=staged
+            )
+            cur.execute(sql)
+            sql = """
+            INSERT INTO tww_od.measurement_result
+            (identifier, measurement_type, measuring_duration,
+            time, value, fk_measurement_series)
+            SELECT null, s.measurement_type, s.measuring_duration,
+            s.time, s.value, s.fk_measurement_series
+            FROM {staged}
+            WHERE NOT EXISTS (
+                SELECT 1 FROM tww_od.measurement_result mr
+                WHERE mr.fk_measurement_series = s.fk_measurement_series
+                AND mr.time = s.time
+                AND mr.measurement_type = s.measurement_type
+            );
+            """.format(
+                staged=staged
+            )
+            cur.execute(sql)
+        except psycopg.ProgrammingError as e:
+            # The transaction is aborted, the results written so far can't be committed
+            self.con.rollback()
+            self.feedback_push("error", f"Error while excecuting: {sql}")
+            self.feedback_push("error", str(e))
+            raise
+        del cur
         return
 
     def get_full_results(self, start_index, end_index, swmm_type):
@@ -690,31 +1649,39 @@ class TwwSwmm:
         Returns:
         datas: array of dictionnary containing the data
         """
-        o = codecs.open(self.rpt_file, "r", encoding="utf-8")
-        line = o.readline()
-        no_line = -1
+        for obj_id, index in self.get_report().time_series_indexes.items():
+            if index["start_index"] == start_index:
+                return self.rows_to_results(self.get_report().time_series_rows(obj_id), swmm_type)
+
+        rows = []
+        with codecs.open(self.rpt_file, "r", encoding="utf-8") as o:
+            for no_line, line in enumerate(o):
+                if no_line >= end_index:
+                    break
+                if no_line >= start_index:
+                    values = line.split()
+                    if len(values) != 0:
+                        rows.append(values)
+        return self.rows_to_results(rows, swmm_type)
+
+    def rows_to_results(self, rows, swmm_type):
+        """
+        Convert the rows of a time series into dictionaries
+
+        Parameters:
+        rows (array): date, time and values of each time step
+        swmm_type (string): node or link
+
+        Returns:
+        datas: array of dictionnary containing the data
+        """
+        columns = SWMM_TIME_SERIES_COLUMNS[swmm_type]
         datas = []
-        while line:
-            no_line += 1
-            if no_line >= start_index and no_line < end_index:
-                values = line.strip().split()
-                data = {}
-                if len(values) != 0:
-                    data["date"] = values[0]
-                    data["time"] = values[1]
-                    if swmm_type == "node":
-                        data["inflow"] = values[2]
-                        data["flooding"] = values[3]
-                        data["depth"] = values[4]
-                        data["head"] = values[5]
-                    if swmm_type == "link":
-                        data["flow"] = values[2]
-                        data["velocity"] = values[3]
-                        data["depth"] = values[4]
-                        data["capacity"] = values[5]
-                    datas.append(data)
-            line = o.readline()
-        o.close()
+        for values in rows:
+            data = {"date": values[0], "time": values[1]}
+            for i, column in enumerate(columns):
+                data[column] = values[2 + i]
+            datas.append(data)
         return datas
 
     def import_summary(self, sim_description):
@@ -809,38 +1776,44 @@ class TwwSwmm:
 
         """
 
-        ndata = len(data)
-        # Loop over each line of the node summary
-        counter = 0
+        if obj_type == "node":
+            measuring_points = self.prepare_measuring_points(
+                sim_description, [ws["id"] for ws in data], []
+            )
+        else:
+            measuring_points = self.prepare_measuring_points(
+                sim_description, [], [ws["id"] for ws in data]
+            )
+        measurement_series = self.prepare_measurement_series(
+            set(measuring_points.values()), SWMM_SUMMARY_PARAMETERS
+        )
+
+        results = []
         for ws in data:
-            counter += 1
-            if obj_type == "node":
-                self.feedback_set_progress(counter * 50 / ndata)
-                mp_obj_id = self.create_measuring_point_node(ws["id"], sim_description)
-            else:
-                self.feedback_set_progress(50 + counter * 50 / ndata)
-                mp_obj_id = self.create_measuring_point_link(ws["id"], sim_description)
+            mp_obj_id = measuring_points.get(ws["id"])
             if mp_obj_id:
-                self.create_measuring_device(mp_obj_id)
                 delta = timedelta(
                     days=int(ws["time_max_day"]),
                     hours=int(ws["time_max_time"].split(":")[0]),
                     minutes=int(ws["time_max_time"].split(":")[1]),
                 )
+                time = (simulation_start_date + delta).isoformat()
                 for k in ws.keys():
                     if k in SWMM_SUMMARY_PARAMETERS.keys():
-                        if SWMM_SUMMARY_PARAMETERS[k]["recorded"]:
-                            ms_obj_id = self.create_measurement_series(
-                                mp_obj_id, k, SWMM_SUMMARY_PARAMETERS[k]["dimension"]
-                            )
-                            time = (simulation_start_date + delta).isoformat()
-                            self.create_measurement_result(
-                                ms_obj_id,
-                                SWMM_SUMMARY_PARAMETERS[k]["tww_measurement_type"],
-                                measuring_duration,
-                                time,
-                                ws[k],
+                        if (mp_obj_id, k) in measurement_series:
+                            results.append(
+                                (
+                                    measurement_series[(mp_obj_id, k)],
+                                    SWMM_SUMMARY_PARAMETERS[k]["tww_measurement_type"],
+                                    measuring_duration,
+                                    time,
+                                    ws[k],
+                                )
                             )
+        self.feedback_set_progress(25 if obj_type == "node" else 75)
+        self.upsert_measurement_results(results)
+        self.con.commit()
+        self.feedback_set_progress(50 if obj_type == "node" else 100)
         return
 
     def populate_attribute(self, data, table_name, attribute_name, swmm_attribute):
@@ -854,41 +1827,61 @@ class TwwSwmm:
         swmm_attribute (string): name of the swmm attribute (ie. maximum_hgl, max_over_full_flow)
         """
 
-        ndata = len(data)
         cur = self.con.cursor()
-        # Loop over each line of the node summary
-        counter = 0
-        for ws in data:
-            counter += 1
-            bf_level = ws[swmm_attribute]
-            obj_id = ws["id"]
-            sql = """
-            UPDATE tww_od.{table_name}
-            SET {attribute_name} = {bf_level}
-            WHERE obj_id = '{obj_id}'
-            RETURNING obj_id;
-            """.format(
-                table_name=table_name,
-                attribute_name=attribute_name,
-                bf_level=bf_level,
-                obj_id=obj_id,
+        # Stage all the values and update the table in one statement
+        sql = """
+        CREATE TEMP TABLE IF NOT EXISTS swmm_attribute_value
+        (obj_id text, value double precision);
+        TRUNCATE swmm_attribute_value;
+        """
+        try:
+            cur.execute(sql)
+            self.copy_rows(
+                cur,
+                "swmm_attribute_value",
+                ["obj_id", "value"],
+                ((ws["id"], ws[swmm_attribute]) for ws in data),
             )
-            try:
-                cur.execute(sql)
-            except psycopg.ProgrammingError:
-                self.feedback_push("error", f"Error while excecuting: {sql}")
-                self.feedback_push("error", str(psycopg.ProgrammingError))
-                return None, None
-            res = cur.fetchone()
-            if res is None:
-                self.feedback_push(
-                    "info",
-                    """{obj_id} in the output file has no correspondance in tww_od.{table_name}.""".format(
-                        obj_id=obj_id, table_name=table_name
-                    ),
-                )
-            self.feedback_set_progress(counter / ndata)
+            self.feedback_set_progress(50)
+            sql = pgsql.SQL(
+                """
+                UPDATE tww_od.{table_name} t
+                SET {attribute_name} = v.value
+                FROM swmm_attribute_value v
+                WHERE t.obj_id = v.obj_id
+                """
+            ).format(
+                table_name=pgsql.Identifier(table_name),
+                attribute_name=pgsql.Identifier(attribute_name),
+            )
+            cur.execute(sql)
+            # Report the values without correspondance
+            sql = pgsql.SQL(
+                """
+                SELECT v.obj_id
+                FROM swmm_attribute_value v
+                LEFT JOIN tww_od.{table_name} t ON t.obj_id = v.obj_id
+                WHERE t.obj_id IS NULL
+                ORDER BY v.obj_id
+                """
+            ).format(table_name=pgsql.Identifier(table_name))
+            cur.execute(sql)
+        except psycopg.Error as e:
+            self.con.rollback()
+            self.feedback_push("error", f"Error while excecuting: {sql}")
+            self.feedback_push("error", str(e))
+            return None, None
+        unmatched = [row[0] for row in cur.fetchall()]
+        if unmatched:
+            self.feedback_push(
+                "info",
+                """{count} objects in the output file have no correspondance in tww_od.{table_name}: {obj_ids}""".format(
+                    count=len(unmatched), table_name=table_name, obj_ids=", ".join(unmatched)
+                ),
+            )
+        self.feedback_set_progress(100)
         self.con.commit()
+        del cur
 
         return
 
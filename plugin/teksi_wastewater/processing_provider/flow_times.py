@@ -170,16 +170,22 @@ class FlowTimesAlgorithm(TwwAlgorithm):
             na.getEdgeLayer(), [edge[2]["feature"] for edge in edges]
         ).asDict()
 
+        # load the flow times of the reaches in the tree at once
+        reach_obj_ids = {
+            feature["obj_id"]
+            for feature in cache_edge_features.values()
+            if feature.attribute("type") == "reach"
+        }
+        flow_times = self.load_flow_times(
+            flow_layer, fk_reach_field, flow_time_field, reach_obj_ids
+        )
+
         # join and accumulate flow times
-        i = -1
         flow_time = 0.0
-        while True:
-            i += 1
+        output_features = []
+        for i, edge in enumerate(edges):
             feedback.setProgress(50 + i / len(edges) * 50)
-            if i >= len(edges):
-                break
 
-            edge = edges[i]
             edge_feature = cache_edge_features[edge[2]["feature"]]
             # TODO: if top_pos != 1 => merge
             if edge_feature.attribute("type") != "reach":
@@ -187,28 +193,45 @@ class FlowTimesAlgorithm(TwwAlgorithm):
             rate = edge_feature.attribute("to_pos") - edge_feature.attribute("from_pos")
             assert 0 < rate <= 1
 
-            expression = QgsExpression(
-                "{fk_reach} = '{obj_id}'".format(
-                    fk_reach=fk_reach_field, obj_id=edge_feature["obj_id"]
-                )
-            )
-            print(expression.expression())
-            request = QgsFeatureRequest(expression)
-            flow_time_feature = next(flow_layer.getFeatures(request))
-
-            if not flow_time_feature.isValid():
+            if edge_feature["obj_id"] not in flow_times:
                 break
 
-            flow_time += rate * flow_time_feature.attribute(flow_time_field)
+            flow_time += rate * flow_times[edge_feature["obj_id"]]
 
             sf = QgsFeature()
             sf.setFields(fields)
             sf.setAttribute("flow_time", flow_time)
             sf.setGeometry(edge_feature.geometry())
-            sink.addFeature(sf, QgsFeatureSink.FastInsert)
+            output_features.append(sf)
+
+        sink.addFeatures(output_features, QgsFeatureSink.FastInsert)
+        feedback.setProgress(100)
 
         # f.setAttributes(attrs)
         # sink.addFeature(f, QgsFeatureSink.FastInsert)
         # feedback.setProgress(int(current * total))
 
         return {self.OUTPUT: dest_id}
+
+    @staticmethod
+    def load_flow_times(flow_layer, fk_reach_field, flow_time_field, reach_obj_ids):
+        """
+        Loads the flow times of the given reaches in a single request
+        :return: A dictionary of the flow time by reach obj_id
+        """
+        flow_times = {}
+        if not reach_obj_ids:
+            return flow_times
+
+        expression = "{fk_reach} IN ({obj_ids})".format(
+            fk_reach=QgsExpression.quotedColumnRef(fk_reach_field),
+            obj_ids=", ".join(QgsExpression.quotedValue(obj_id) for obj_id in reach_obj_ids),
+        )
+        request = QgsFeatureRequest(QgsExpression(expression))
+        request.setFlags(QgsFeatureRequest.NoGeometry)
+        request.setSubsetOfAttributes([fk_reach_field, flow_time_field], flow_layer.fields())
+        for feature in flow_layer.getFeatures(request):
+            # keep the first flow time found per reach
+            flow_times.setdefault(feature[fk_reach_field], feature[flow_time_field])
+
+        return flow_times
@@ -0,0 +1,225 @@
+"""
+/***************************************************************************
+ TWW processing provider
+                              -------------------
+        begin                : 17.10.2026
+        copyright            : (C) 2026 by TEKSI
+        email                : info@teksi.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import qgis.utils as qgis_utils
+from PyQt5.QtCore import QVariant
+from qgis.core import (
+    NULL,
+    QgsFeature,
+    QgsFeatureSink,
+    QgsField,
+    QgsFields,
+    QgsProcessing,
+    QgsProcessingAlgorithm,
+    QgsProcessingContext,
+    QgsProcessingException,
+    QgsProcessingFeedback,
+    QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterField,
+    QgsProcessingParameterVectorLayer,
+    QgsWkbTypes,
+)
+
+from .flow_times import FlowTimesAlgorithm
+from .tww_algorithm import TwwAlgorithm
+
+__author__ = "TEKSI open source contributors"
+__date__ = "2026-10-17"
+__copyright__ = "(C) 2026 by TEKSI"
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = "$Format:%H$"
+
+
+class FlowTimesToOutletAlgorithm(TwwAlgorithm):
+    """
+    Calculates the flow time from every reach upstream of an outlet to this outlet
+    """
+
+    REACH_LAYER = "REACH_LAYER"
+    FLOWTIMES_LAYER = "FLOWTIMES_LAYER"
+    FK_REACH_FIELD = "FK_REACH_FIELD"
+    FLOWTIMES_FIELD = "FLOWTIMES_FIELD"
+    OUTPUT = "OUTPUT"
+
+    def name(self):
+        return "tww_flow_times_to_outlet"
+
+    def displayName(self):
+        return self.tr("Flow times to outlet")
+
+    def flags(self):
+        return super().flags() | QgsProcessingAlgorithm.FlagNoThreading
+
+    def initAlgorithm(self, config=None):
+        """Here we define the inputs and output of the algorithm, along
+        with some other properties.
+        """
+
+        # The parameters
+        description = self.tr("Reach layer (with the outlet reach selected)")
+        self.addParameter(
+            QgsProcessingParameterVectorLayer(
+                self.REACH_LAYER,
+                description=description,
+                types=[QgsProcessing.TypeVectorLine],
+            )
+        )
+        description = self.tr("Flow times layer")
+        self.addParameter(
+            QgsProcessingParameterVectorLayer(
+                self.FLOWTIMES_LAYER,
+                description=description,
+                types=[QgsProcessing.TypeVector],
+            )
+        )
+        description = self.tr("Reach id field")
+        self.addParameter(
+            QgsProcessingParameterField(
+                self.FK_REACH_FIELD,
+                description=description,
+                parentLayerParameterName=self.FLOWTIMES_LAYER,
+            )
+        )
+        description = self.tr("Flow times field")
+        self.addParameter(
+            QgsProcessingParameterField(
+                self.FLOWTIMES_FIELD,
+                description=description,
+                parentLayerParameterName=self.FLOWTIMES_LAYER,
+                type=QgsProcessingParameterField.Numeric,
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(self.OUTPUT, self.tr("Flow times to outlet"))
+        )
+
+    def processAlgorithm(
+        self, parameters, context: QgsProcessingContext, feedback: QgsProcessingFeedback
+    ):
+        """Here is where the processing itself takes place."""
+
+        feedback.setProgress(0)
+        na = qgis_utils.plugins["teksi_wastewater"].network_analyzer
+
+        # init params
+        reach_layer = self.parameterAsVectorLayer(parameters, self.REACH_LAYER, context)
+        flow_layer = self.parameterAsVectorLayer(parameters, self.FLOWTIMES_LAYER, context)
+        fk_reach_field = self.parameterAsFields(parameters, self.FK_REACH_FIELD, context)[0]
+        flow_time_field = self.parameterAsFields(parameters, self.FLOWTIMES_FIELD, context)[0]
+
+        # create feature sink
+        fields = QgsFields()
+        fields.append(QgsField("obj_id", QVariant.String))
+        fields.append(QgsField("flow_time", QVariant.Double))
+        (sink, dest_id) = self.parameterAsSink(
+            parameters,
+            self.OUTPUT,
+            context,
+            fields,
+            QgsWkbTypes.LineString,
+            reach_layer.sourceCrs(),
+        )
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        # get selected outlet reach
+        if reach_layer.selectedFeatureCount() != 1:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.REACH_LAYER))
+        outlet_reach = next(reach_layer.getSelectedFeatures())
+        tww_reach_obj_id = outlet_reach.attribute("obj_id")
+
+        # get the outlet node, the bottom end of the reach
+        reach_features = na.getFeaturesByAttr(
+            na.getEdgeLayer(), "obj_id", [tww_reach_obj_id]
+        ).asDict()
+        to_pos = 0
+        outlet_node = None
+        for reach_feature in reach_features.values():
+            if to_pos < reach_feature.attribute("to_pos"):
+                outlet_node = reach_feature.attribute("to_obj_id_interpolate")
+                to_pos = reach_feature.attribute("to_pos")
+        if outlet_node is None:
+            raise QgsProcessingException(
+                self.tr("Reach {} not found in the network").format(tww_reach_obj_id)
+            )
+        nodes = na.getFeaturesByAttr(na.getNodeLayer(), "obj_id", [outlet_node]).asDict()
+        if not nodes:
+            raise QgsProcessingException(
+                self.tr(
+                    "Outlet node {} of reach {} not found in the network, refresh the network"
+                ).format(outlet_node, tww_reach_obj_id)
+            )
+        outlet_node_id = next(iter(nodes.values())).id()
+
+        # upstream tree, edges are ordered from the outlet upwards
+        _, edges = na.getTree(outlet_node_id, upstream=True)
+        feedback.setProgress(30)
+        cache_edge_features = na.getFeaturesById(
+            na.getEdgeLayer(), [edge[2]["feature"] for edge in edges]
+        ).asDict()
+
+        reach_obj_ids = {
+            feature["obj_id"]
+            for feature in cache_edge_features.values()
+            if feature.attribute("type") == "reach"
+        }
+        flow_times = FlowTimesAlgorithm.load_flow_times(
+            flow_layer, fk_reach_field, flow_time_field, reach_obj_ids
+        )
+        feedback.setProgress(60)
+
+        # accumulate from the outlet upwards: every edge of the reversed graph goes from
+        # its downstream node to its upstream node, whose time is known first
+        times = {outlet_node_id: 0.0}
+        output_features = []
+        for i, (downstream_node, upstream_node, edge) in enumerate(edges):
+            if feedback.isCanceled():
+                break
+            feedback.setProgress(60 + i / len(edges) * 40)
+
+            edge_feature = cache_edge_features[edge["feature"]]
+            time = times.get(downstream_node)
+
+            if edge_feature.attribute("type") == "reach" and time is not None:
+                rate = edge_feature.attribute("to_pos") - edge_feature.attribute("from_pos")
+                flow_time = flow_times.get(edge_feature["obj_id"])
+                if flow_time is None or flow_time == NULL:
+                    time = None
+                else:
+                    time += rate * flow_time
+
+            times[upstream_node] = time
+
+            if edge_feature.attribute("type") != "reach":
+                continue
+
+            sf = QgsFeature()
+            sf.setFields(fields)
+            sf.setAttribute("obj_id", edge_feature["obj_id"])
+            sf.setAttribute("flow_time", NULL if time is None else time)
+            sf.setGeometry(edge_feature.geometry())
+            output_features.append(sf)
+
+        sink.addFeatures(output_features, QgsFeatureSink.FastInsert)
+        feedback.setProgress(100)
+
+        return {self.OUTPUT: dest_id}
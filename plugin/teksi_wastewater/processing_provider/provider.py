@@ -27,8 +27,10 @@ from qgis.utils import iface
 
 from .change_reach_direction import ChangeReachDirection
 from .flow_times import FlowTimesAlgorithm
+from .flow_times_outlet import FlowTimesToOutletAlgorithm
 from .snap_reach import SnapReachAlgorithm
 from .sum_up_upstream import SumUpUpstreamAlgorithm
+from .swmm_batch_execute import SwmmBatchExecuteAlgorithm
 from .swmm_create_input import SwmmCreateInputAlgorithm
 from .swmm_execute import SwmmExecuteAlgorithm
 from .swmm_extract_results import SwmmExtractResultsAlgorithm
@@ -57,12 +59,14 @@ class TwwProcessingProvider(QgsProcessingProvider):
         self.alglist = [
             SnapReachAlgorithm(),
             FlowTimesAlgorithm(),
+            FlowTimesToOutletAlgorithm(),
             ChangeReachDirection(),
             SumUpUpstreamAlgorithm(),
             SwmmCreateInputAlgorithm(),
             SwmmExtractResultsAlgorithm(),
             SwmmImportResultsAlgorithm(),
             SwmmExecuteAlgorithm(),
+            SwmmBatchExecuteAlgorithm(),
             SwmmSetFrictionAlgorithm(),
         ]
         try:
@@ -81,12 +85,14 @@ class TwwProcessingProvider(QgsProcessingProvider):
         algs = [
             SnapReachAlgorithm(),
             FlowTimesAlgorithm(),
+            FlowTimesToOutletAlgorithm(),
             SumUpUpstreamAlgorithm(),
             ChangeReachDirection(),
             SwmmCreateInputAlgorithm(),
             SwmmExtractResultsAlgorithm(),
             SwmmImportResultsAlgorithm(),
             SwmmExecuteAlgorithm(),
+            SwmmBatchExecuteAlgorithm(),
             SwmmSetFrictionAlgorithm(),
         ]
         try:
@@ -56,11 +56,14 @@ __revision__ = "$Format:%H$"
 
 
 class Reach:
-    def __init__(self, from_id, to_id, value, geometry):
+    __slots__ = ("from_id", "to_id", "value", "geometry", "fid")
+
+    def __init__(self, from_id, to_id, value, geometry, fid=None):
         self.from_id = from_id
         self.to_id = to_id
         self.value = value
         self.geometry = geometry
+        self.fid = fid
 
 
 class SumUpUpstreamAlgorithm(TwwAlgorithm):
@@ -258,19 +261,32 @@ class SumUpUpstreamAlgorithm(TwwAlgorithm):
         )
         expression.prepare(context)
 
+        # Only fetch the attributes needed, geometries are fetched later for blind connections
+        request = QgsFeatureRequest()
+        request.setFilterExpression(
+            f"{QgsExpression.quotedColumnRef(node_from_fk_name)} IS NOT NULL"
+        )
+        needs_geometry = expression.needsGeometry()
+        if not needs_geometry:
+            request.setFlags(QgsFeatureRequest.NoGeometry)
+        referenced_columns = expression.referencedColumns()
+        if QgsFeatureRequest.ALL_ATTRIBUTES not in referenced_columns:
+            request.setSubsetOfAttributes(
+                list(referenced_columns | {reach_pk_name, node_from_fk_name, node_to_fk_name}),
+                reach_layer.fields(),
+            )
+
         progress = 0
         feedback.setProgressText(self.tr("Indexing reaches"))
-        for reach in reach_layer.getFeatures(QgsFeatureRequest()):
-            if reach[node_from_fk_name] == NULL:
-                continue
-
+        for reach in reach_layer.getFeatures(request):
             context.setFeature(reach)
             value = expression.evaluate(context)
             reach_obj = Reach(
                 reach[node_from_fk_name],
                 reach[node_to_fk_name],
                 value,
-                reach.geometry(),
+                reach.geometry() if needs_geometry else None,
+                reach.id(),
             )
             reaches_by_from_node.setdefault(reach_obj.from_id, []).append(reach_obj)
             reaches_by_id[reach[reach_pk_name]] = reach_obj
@@ -278,49 +294,45 @@ class SumUpUpstreamAlgorithm(TwwAlgorithm):
             feedback.setProgress(progress / feature_count * 10)
             progress += 1
 
-        loop_nodes = []
+        if not needs_geometry:
+            self.fetch_blind_connection_geometries(reach_layer, reaches_by_id)
+
+        loop_nodes = set()
         current_feature = 0
-        calculated_values = {}
 
         feedback.setProgressText(self.tr("Analyzing network"))
+        calculated_values = self.calculate_values(
+            reaches_by_from_node, reaches_by_id, aggregate_method, loop_nodes, feedback
+        )
+        feedback.setProgress(50)
+
+        new_nodes = []
+        loop_nodes_features = []
+        node_count = wastewater_node_layer.featureCount()
         for node in wastewater_node_layer.getFeatures():
             from_node_id = node[node_pk_name]
 
-            processed_nodes = []
-            times = []
-            if from_node_id in reaches_by_from_node.keys():
-                for reach in reaches_by_from_node[from_node_id]:
-                    times.append(
-                        self.calculate_branch(
-                            reach,
-                            reaches_by_from_node,
-                            reaches_by_id,
-                            list(processed_nodes),
-                            calculated_values,
-                            aggregate_method,
-                            loop_nodes,
-                            feedback,
-                        )
-                    )
-
-            if times:
-                time = aggregate_method(times, feedback)
+            if from_node_id in reaches_by_from_node:
+                time = calculated_values.get(from_node_id, NULL)
             else:
                 time = 0
 
             current_feature += 1
 
-            calculated_values[node[node_pk_name]] = time
             new_node = QgsFeature(node)
             new_node.setFields(fields)
             new_node.setAttributes(node.attributes() + [time])
-
-            sink.addFeature(new_node, QgsFeatureSink.FastInsert)
+            new_nodes.append(new_node)
 
             if create_loop_layer and from_node_id in loop_nodes:
-                loop_sink.addFeature(node, QgsFeatureSink.FastInsert)
+                loop_nodes_features.append(node)
+
+            feedback.setProgress(50 + current_feature / node_count * 40)
 
-            feedback.setProgress(10 + current_feature / feature_count * 90)
+        feedback.setProgressText(self.tr("Writing results"))
+        sink.addFeatures(new_nodes, QgsFeatureSink.FastInsert)
+        if create_loop_layer:
+            loop_sink.addFeatures(loop_nodes_features, QgsFeatureSink.FastInsert)
 
         result = {self.OUTPUT: dest_id}
         if create_loop_layer:
@@ -328,98 +340,233 @@ class SumUpUpstreamAlgorithm(TwwAlgorithm):
 
         return result
 
-    def process_node(
-        self,
-        node_id,
-        previous_reach,
-        reaches_by_from_node,
-        reaches_by_id,
-        processed_nodes,
-        calculated_values,
-        aggregate_method,
-        loop_nodes,
-        feedback,
+    @staticmethod
+    def fetch_blind_connection_geometries(reach_layer, reaches_by_id):
+        """
+        Fetches the geometries needed to calculate blind connections: the ones of the reaches
+        ending on another reach and the ones of the reaches connected to.
+        """
+        reaches = []
+        for reach in reaches_by_id.values():
+            if reach.to_id in reaches_by_id:
+                reaches.append(reach)
+                reaches.append(reaches_by_id[reach.to_id])
+
+        if not reaches:
+            return
+
+        reaches_by_fid = {reach.fid: reach for reach in reaches}
+        request = QgsFeatureRequest().setFilterFids(list(reaches_by_fid.keys()))
+        request.setNoAttributes()
+        for feature in reach_layer.getFeatures(request):
+            reaches_by_fid[feature.id()].geometry = feature.geometry()
+
+    def calculate_values(
+        self, reaches_by_from_node, reaches_by_id, aggregate_method, loop_nodes, feedback
     ):
-        time = 0
-
-        while node_id in reaches_by_from_node.keys() or node_id in reaches_by_id.keys():
-            if node_id in calculated_values:
-                return calculated_values[node_id] + time
-            if node_id in processed_nodes:
-                # feedback.reportError(self.tr('Loop at node: {}'.format(node_id)))
-                loop_nodes.append(node_id)
-                return 0
-
-            processed_nodes.append(node_id)
+        """
+        Calculates the value of every node having downstream reaches, each one once.
+        The strongly connected components of the network are found with Tarjan's algorithm,
+        which yields them in reverse topological order: all downstream values are known when
+        a component is evaluated. Components with more than one node (or a reach to itself)
+        are loops, their nodes are added to loop_nodes. The values within a loop are the ones
+        of the node by node walk when the nodes downstream are calculated first.
+        """
+        # For every node: (reach, value of the blind connections, next node) per downstream reach
+        successors = {
+            node_id: [
+                (reach,)
+                + self.follow_reach(reach, reaches_by_from_node, reaches_by_id, loop_nodes)
+                for reach in reaches
+            ]
+            for node_id, reaches in reaches_by_from_node.items()
+        }
 
+        calculated_values = {}
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+
+        def visit(node_id):
+            index[node_id] = lowlink[node_id] = len(index)
+            stack.append(node_id)
+            on_stack.add(node_id)
+            return node_id, iter(successors[node_id])
+
+        node_count = len(successors)
+        for root in successors:
+            if root in index:
+                continue
             if feedback.isCanceled():
-                return NULL
-
-            if node_id not in reaches_by_from_node:
-                # Blind connection: add proportionally
-                reach = reaches_by_id[node_id]
-                offset = reach.geometry.lineLocatePoint(
-                    QgsGeometry(previous_reach.geometry.constGet().endPoint())
-                )
-                length = reach.geometry.length()
-                remaining_part = 1 - offset / length
-                # feedback.pushInfo('Length: {} Offset: {} Part: {}'.format(length, offset, remaining_part, reach.value * remaining_part))
-                time += reach.value * remaining_part
-                node_id = reach.to_id
-            else:
-                current_reaches = reaches_by_from_node[node_id]
-                if len(current_reaches) == 1:
-                    # In case there is just one downstream reach, calculate in here
-                    # Starting a recursive approach results in a maximum call stack exception
-                    time += current_reaches[0].value
-                    node_id = current_reaches[0].to_id
-                    previous_reach = current_reaches[0]
+                break
+
+            work = [visit(root)]
+            while work:
+                node_id, branches = work[-1]
+                for _, _, next_node in branches:
+                    if next_node is None:
+                        continue
+                    if next_node not in index:
+                        work.append(visit(next_node))
+                        break
+                    if next_node in on_stack:
+                        lowlink[node_id] = min(lowlink[node_id], index[next_node])
                 else:
-                    # Branching occurred: calculate every possible path and aggregate all values
-                    times = []
-                    for reach in current_reaches:
-                        times.append(
-                            self.calculate_branch(
-                                reach,
-                                reaches_by_from_node,
-                                reaches_by_id,
-                                list(processed_nodes),
-                                calculated_values,
-                                aggregate_method,
-                                loop_nodes,
-                                feedback,
-                            )
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node_id])
+
+                    if lowlink[node_id] == index[node_id]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node_id:
+                                break
+                        self.evaluate_component(
+                            component,
+                            successors,
+                            calculated_values,
+                            aggregate_method,
+                            loop_nodes,
+                            feedback,
                         )
 
-                    if times:
-                        time += aggregate_method(times, feedback)
+            feedback.setProgress(10 + len(index) / node_count * 40)
+
+        return calculated_values
+
+    def follow_reach(self, reach, reaches_by_from_node, reaches_by_id, loop_nodes):
+        """
+        Follows a reach to the next node with downstream reaches.
+        A reach ending on another reach (blind connection) adds the value of that
+        reach proportionally to the remaining part after the connection.
+        :return: The value of the blind connections and the next node id (None if the
+                 network ends there)
+        """
+        blind_value = 0
+        node_id = reach.to_id
+        visited = set()
+
+        while node_id not in reaches_by_from_node and node_id in reaches_by_id:
+            if node_id in visited:
+                loop_nodes.add(node_id)
+                return blind_value, None
+            visited.add(node_id)
+
+            # Blind connection: add proportionally
+            blind_reach = reaches_by_id[node_id]
+            offset = blind_reach.geometry.lineLocatePoint(
+                QgsGeometry(reach.geometry.constGet().endPoint())
+            )
+            length = blind_reach.geometry.length()
+            remaining_part = 1 - offset / length
+            blind_value += blind_reach.value * remaining_part
+            node_id = blind_reach.to_id
+
+        if node_id in reaches_by_from_node:
+            return blind_value, node_id
 
-                    return time
+        return blind_value, None
 
-        return time
+    def evaluate_component(
+        self, component, successors, calculated_values, aggregate_method, loop_nodes, feedback
+    ):
+        """
+        Calculates the values of the nodes of a strongly connected component, all its
+        downstream components being calculated already.
+        """
+        if len(component) == 1:
+            node_id = component[0]
+            branches = successors[node_id]
+            if all(next_node != node_id for _, _, next_node in branches):
+                times = [
+                    reach.value + (blind_value + self.next_value(next_node, calculated_values))
+                    for reach, blind_value, next_node in branches
+                ]
+                if len(times) == 1:
+                    calculated_values[node_id] = times[0]
+                else:
+                    calculated_values[node_id] = aggregate_method(times, feedback)
+                return
+
+        # Loop: walk every path from each node like the node by node walk did, the values
+        # of the nodes of the loop already calculated are used
+        loop_nodes.update(component)
+        for node_id in component:
+            times = [
+                reach.value
+                + self.process_loop_node(
+                    blind_value,
+                    next_node,
+                    set(),
+                    successors,
+                    calculated_values,
+                    aggregate_method,
+                    feedback,
+                )
+                for reach, blind_value, next_node in successors[node_id]
+            ]
+            if len(times) == 1:
+                calculated_values[node_id] = times[0]
+            else:
+                calculated_values[node_id] = aggregate_method(times, feedback)
+
+    @staticmethod
+    def next_value(next_node, calculated_values):
+        if next_node is None:
+            return 0
+        return calculated_values[next_node]
 
-    def calculate_branch(
+    def process_loop_node(
         self,
-        reach,
-        reaches_by_from_node,
-        reaches_by_id,
+        time,
+        node_id,
         processed_nodes,
+        successors,
         calculated_values,
         aggregate_method,
-        loop_nodes,
         feedback,
     ):
-        return reach.value + self.process_node(
-            reach.to_id,
-            reach,
-            reaches_by_from_node,
-            reaches_by_id,
-            processed_nodes,
-            calculated_values,
-            aggregate_method,
-            loop_nodes,
-            feedback,
-        )
+        """
+        Walks downstream within a loop from a node reached with the given value.
+        When the walk comes back to a node it already passed, the branch adds nothing:
+        the values collected since the last branching are dropped.
+        """
+        while True:
+            if node_id is None:
+                return time
+            if node_id in calculated_values:
+                return time + calculated_values[node_id]
+            if node_id in processed_nodes:
+                return 0
+            processed_nodes.add(node_id)
+
+            branches = successors[node_id]
+            if len(branches) == 1:
+                # In case there is just one downstream reach, calculate in here
+                # Starting a recursive approach results in a maximum call stack exception
+                reach, blind_value, node_id = branches[0]
+                time += reach.value + blind_value
+            else:
+                # Branching occurred: calculate every possible path and aggregate all values
+                times = [
+                    reach.value
+                    + self.process_loop_node(
+                        blind_value,
+                        next_node,
+                        set(processed_nodes),
+                        successors,
+                        calculated_values,
+                        aggregate_method,
+                        feedback,
+                    )
+                    for reach, blind_value, next_node in branches
+                ]
+                return time + aggregate_method(times, feedback)
 
     @staticmethod
     def aggregate_method_min(values, feedback=QgsProcessingFeedback()):
@@ -0,0 +1,169 @@
+"""
+/***************************************************************************
+ TWW-swmm processing provider
+                              -------------------
+        begin                : 17.10.2026
+        copyright            : (C) 2026 by TEKSI
+        email                : info@teksi.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import json
+import os
+
+from processing.core.ProcessingConfig import ProcessingConfig
+from qgis.core import (
+    QgsProcessingContext,
+    QgsProcessingException,
+    QgsProcessingFeedback,
+    QgsProcessingParameterBoolean,
+    QgsProcessingParameterFile,
+    QgsProcessingParameterNumber,
+    QgsProcessingParameterString,
+)
+
+from .tww_algorithm import TwwAlgorithm
+from .TwwSwmm import TwwSwmm
+
+__author__ = "TEKSI open source contributors"
+__date__ = "2026-10-17"
+__copyright__ = "(C) 2026 by TEKSI"
+
+# This will get replaced with a git SHA1 when you do a git archive
+
+__revision__ = "$Format:%H$"
+
+
+class SwmmBatchExecuteAlgorithm(TwwAlgorithm):
+    """"""
+
+    DATABASE = "DATABASE"
+    SCENARIOS_FILE = "SCENARIOS_FILE"
+    WORKERS = "WORKERS"
+    IMPORT_SUMMARY = "IMPORT_SUMMARY"
+
+    def name(self):
+        return "swmm_batch_execute"
+
+    def displayName(self):
+        return self.tr("SWMM Batch Execute")
+
+    def shortHelpString(self):
+        return self.tr(
+            """
+        Create the input files of several scenarios and run SWMM on them in parallel.
+        The scenarios file is a JSON list of objects with the keys "title", "inp_template",
+        "inp_file", "rpt_file" and optionally "state" (current or planned), "hierarchy",
+        "selected_structures" and "selected_reaches". Relative paths are relative to the scenarios file.
+        If "Import summary" is checked, the summary of each successful run is imported using its title as simulation name.
+        """
+        )
+
+    def initAlgorithm(self, config=None):
+        """Here we define the inputs and output of the algorithm, along
+        with some other properties.
+        """
+
+        # The parameters
+        description = self.tr("Database")
+        self.addParameter(
+            QgsProcessingParameterString(
+                self.DATABASE, description=description, defaultValue="pg_tww"
+            )
+        )
+
+        description = self.tr("Scenarios file")
+        self.addParameter(
+            QgsProcessingParameterFile(
+                self.SCENARIOS_FILE, description=description, extension="json"
+            )
+        )
+
+        description = self.tr("Number of parallel runs (0 = number of processors)")
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.WORKERS,
+                description=description,
+                type=QgsProcessingParameterNumber.Integer,
+                minValue=0,
+                defaultValue=0,
+            )
+        )
+
+        description = self.tr("Import summary")
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.IMPORT_SUMMARY, description=description, defaultValue=False
+            )
+        )
+
+    def processAlgorithm(
+        self, parameters, context: QgsProcessingContext, feedback: QgsProcessingFeedback
+    ):
+        """Here is where the processing itself takes place."""
+
+        feedback.setProgress(0)
+
+        # init params
+        database = self.parameterAsString(parameters, self.DATABASE, context)
+        scenarios_file = self.parameterAsFile(parameters, self.SCENARIOS_FILE, context)
+        workers = self.parameterAsInt(parameters, self.WORKERS, context)
+        import_summary = self.parameterAsBoolean(parameters, self.IMPORT_SUMMARY, context)
+        swmm_cli = ProcessingConfig.getSetting("SWMM_PATH")
+        if not swmm_cli:
+            raise QgsProcessingException(
+                self.tr(
+                    "Swmm command line tool is not configured.\n\
+                    Please configure it before running Swmm algorithms."
+                )
+            )
+        swmm_cli = os.path.abspath(swmm_cli)
+
+        with open(scenarios_file, encoding="utf-8") as f:
+            scenarios = json.load(f)
+
+        # Paths are relative to the scenarios file
+        scenarios_dir = os.path.dirname(os.path.abspath(scenarios_file))
+        titles = set()
+        for scenario in scenarios:
+            # The title names the results of the scenario, it must identify it
+            title = scenario.get("title")
+            if not isinstance(title, str) or not title.strip():
+                raise QgsProcessingException(self.tr("Every scenario needs a title"))
+            if title in titles:
+                raise QgsProcessingException(
+                    self.tr("The title {title} is used by several scenarios").format(title=title)
+                )
+            titles.add(title)
+            for key in ("inp_template", "inp_file", "rpt_file"):
+                if key not in scenario:
+                    raise QgsProcessingException(
+                        self.tr("Scenario {title} has no {key}").format(
+                            title=scenario.get("title"), key=key
+                        )
+                    )
+                scenario[key] = os.path.join(scenarios_dir, scenario[key])
+
+        with TwwSwmm(None, database, None, None, None, None, swmm_cli, feedback) as qs:
+            results = qs.run_scenarios(scenarios, workers or None, import_summary)
+
+        failed = [result["title"] for result in results if result["errors"]]
+        if failed:
+            feedback.reportError(
+                "There were errors in: {titles}, run the files in SWMM GUI for more details".format(
+                    titles=", ".join(failed)
+                )
+            )
+
+        feedback.setProgress(100)
+
+        return {}
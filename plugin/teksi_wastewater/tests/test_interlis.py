@@ -32,6 +32,30 @@ MINIMAL_DATASET_KEK_MANHOLE_DAMAGE = "minimal-dataset-VSA-KEK-manhole-damage.xtf
 TEST_DATASET_DSS = "test-dataset-DSS.xtf"
 TEST_DATASET_ORGANISATIONS = "test-dataset-organisations.xtf"
 
+# Tables written by the fast import of the minimal sia405 dataset, parents first
+FAST_IMPORT_TABLES = [
+    "wastewater_structure",
+    "channel",
+    "manhole",
+    "wastewater_networkelement",
+    "wastewater_node",
+    "reach",
+    "reach_point",
+    "structure_part",
+    "cover",
+]
+MINIMAL_DATASET_SIA405_ABWASSER_OBJ_IDS = [
+    "ch000000WS000001",
+    "ch000000WS000002",
+    "ch000000WN000001",
+    "ch000000WN000002",
+    "ch000000RE000001",
+    "ch000000RP000002",
+    "ch000000RP000003",
+    "ch000000CO000001",
+    "ch000000CO000002",
+]
+
 
 class TestInterlis(unittest.TestCase):
     def _get_data_filename(self, name):
@@ -80,6 +104,64 @@ class TestInterlis(unittest.TestCase):
         DatabaseUtils.databaseConfig.PGPASS = "postgres"
         DatabaseUtils.databaseConfig.PGPORT = str(PG_PORT)
 
+    @staticmethod
+    def _delete_fast_import_objects(obj_ids):
+        # The child rows are deleted by cascade
+        for table in [
+            "reach_point",
+            "structure_part",
+            "wastewater_networkelement",
+            "wastewater_structure",
+        ]:
+            DatabaseUtils.execute(
+                "DELETE FROM tww_od.{} WHERE obj_id IN ({});".format(
+                    table, ", ".join(f"'{obj_id}'" for obj_id in obj_ids)
+                )
+            )
+
+    @staticmethod
+    def _fetch_fast_import_tables(obj_ids):
+        # last_modification is set by the modification triggers
+        return {
+            table: DatabaseUtils.fetchall(
+                "SELECT obj_id, to_jsonb(t) - 'last_modification' FROM tww_od.{} t WHERE obj_id IN ({}) ORDER BY obj_id;".format(
+                    table, ", ".join(f"'{obj_id}'" for obj_id in obj_ids)
+                )
+            )
+            for table in FAST_IMPORT_TABLES
+        }
+
+    def test_minimal_fast_import(self):
+        # Import organisation
+        xtf_file_input = self._get_data_filename(MINIMAL_DATASET_ORGANISATION_ARBON_ONLY)
+        interlisImporterExporter = InterlisImporterExporter()
+        interlisImporterExporter.interlis_import(xtf_file_input=xtf_file_input)
+
+        # Import minimal sia405 with the ORM
+        self._delete_fast_import_objects(MINIMAL_DATASET_SIA405_ABWASSER_OBJ_IDS)
+        xtf_file_input = self._get_data_filename(MINIMAL_DATASET_SIA405_ABWASSER)
+        interlisImporterExporter = InterlisImporterExporter()
+        interlisImporterExporter.interlis_import(xtf_file_input=xtf_file_input)
+        orm_tables = self._fetch_fast_import_tables(MINIMAL_DATASET_SIA405_ABWASSER_OBJ_IDS)
+
+        # Import minimal sia405 with set-based statements
+        self._delete_fast_import_objects(MINIMAL_DATASET_SIA405_ABWASSER_OBJ_IDS)
+        interlisImporterExporter = InterlisImporterExporter()
+        interlisImporterExporter.interlis_import(xtf_file_input=xtf_file_input, fast_import=True)
+        fast_tables = self._fetch_fast_import_tables(MINIMAL_DATASET_SIA405_ABWASSER_OBJ_IDS)
+
+        for table in FAST_IMPORT_TABLES:
+            self.assertEqual(fast_tables[table], orm_tables[table], table)
+        self.assertTrue(orm_tables["reach"])
+        self.assertTrue(orm_tables["cover"])
+
+        # Importing again only updates the changed rows, it must not change anything
+        interlisImporterExporter = InterlisImporterExporter()
+        interlisImporterExporter.interlis_import(xtf_file_input=xtf_file_input, fast_import=True)
+        self.assertEqual(
+            self._fetch_fast_import_tables(MINIMAL_DATASET_SIA405_ABWASSER_OBJ_IDS), orm_tables
+        )
+
     def test_minimal_import_export(self):
         # Import organisation
         xtf_file_input = self._get_data_filename(MINIMAL_DATASET_ORGANISATION_ARBON_ONLY)
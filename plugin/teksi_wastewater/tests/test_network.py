@@ -0,0 +1,214 @@
+import networkx as nx
+from qgis.core import QgsFeature, QgsField, QgsFields, QgsGeometry
+from qgis.PyQt.QtCore import QVariant
+from qgis.testing import start_app, unittest
+from teksi_wastewater.tools.twwnetwork import TwwFeatureCache, TwwNetworkArrays
+
+start_app()
+
+# (from node, to node, weight, reach feature id, reach obj_id)
+NETWORK_EDGES = [
+    (1, 2, 1.0, 10, "reach_1"),
+    (2, 3, 1.0, 11, "reach_2"),
+    (1, 4, 5.0, 12, "reach_3"),
+    (4, 3, 1.0, 13, "reach_4"),
+    (3, 5, 2.0, 14, "reach_5"),
+    (5, 6, 1.0, 15, "reach_6"),
+]
+
+
+def network_graph(edges):
+    graph = nx.DiGraph()
+    for from_fid, to_fid, weight, feature, obj_id in edges:
+        graph.add_edge(from_fid, to_fid, weight=weight, feature=feature, baseFeature=obj_id)
+    return graph
+
+
+class TestTwwNetworkArrays(unittest.TestCase):
+    def setUp(self):
+        self.graph = network_graph(NETWORK_EDGES)
+        self.arrays = TwwNetworkArrays(self.graph)
+
+    def test_arrays(self):
+        self.assertEqual(self.arrays.nodeFids.tolist(), [1, 2, 3, 4, 5, 6])
+        # Edges are ordered by from node, like networkx yields them
+        self.assertEqual(self.arrays.featureIds.tolist(), [10, 12, 11, 14, 13, 15])
+        self.assertEqual(
+            self.arrays.objIds.tolist(),
+            ["reach_1", "reach_3", "reach_2", "reach_5", "reach_4", "reach_6"],
+        )
+        self.assertEqual(self.arrays.weights.tolist(), [1.0, 5.0, 1.0, 2.0, 1.0, 1.0])
+
+    def test_shortest_path(self):
+        self.assertEqual(self.arrays.shortestPath(1, 5), [1, 2, 3, 5])
+        self.assertEqual(self.arrays.shortestPath(1, 5), nx.dijkstra_path(self.graph, 1, 5))
+        self.assertEqual(self.arrays.shortestPath(4, 6), [4, 3, 5, 6])
+        self.assertEqual(self.arrays.shortestPath(3, 3), [3])
+
+    def test_shortest_path_unreachable(self):
+        # Edges are only followed in their direction
+        self.assertEqual(self.arrays.shortestPath(5, 1), [])
+        self.assertEqual(self.arrays.shortestPath(1, 99), [])
+
+    def test_tree_downstream(self):
+        self.assertEqual(self.arrays.tree(1), [(1, 2), (1, 4), (2, 3), (3, 5), (5, 6)])
+        self.assertEqual(self.arrays.tree(1), list(nx.bfs_edges(self.graph, 1)))
+
+    def test_tree_upstream(self):
+        # The edges keep their direction
+        self.assertEqual(
+            self.arrays.tree(6, reverse=True), [(5, 6), (3, 5), (2, 3), (4, 3), (1, 2)]
+        )
+
+    def test_tree_max_depth(self):
+        self.assertEqual(self.arrays.tree(1, max_depth=2), [(1, 2), (1, 4), (2, 3)])
+        self.assertEqual(self.arrays.tree(6, reverse=True, max_depth=1), [(5, 6)])
+
+    def test_tree_max_distance(self):
+        # Node 4 is 5 away, it is reached by the shortest path through 2 and 3 only
+        self.assertEqual(self.arrays.tree(1, max_distance=3), [(1, 2), (2, 3)])
+        self.assertEqual(
+            self.arrays.tree(1, max_distance=10), [(1, 2), (2, 3), (3, 5), (1, 4), (5, 6)]
+        )
+        self.assertEqual(
+            self.arrays.tree(1, max_distance=10, max_depth=2), [(1, 2), (2, 3), (1, 4)]
+        )
+
+    def test_tree_unknown_node(self):
+        self.assertEqual(self.arrays.tree(99), [])
+
+    def test_cycle_nodes(self):
+        graph = network_graph(NETWORK_EDGES + [(6, 5, 1.0, 16, "reach_7")])
+        arrays = TwwNetworkArrays(graph)
+
+        # 5 and 6 are a loop, nothing is behind it
+        self.assertEqual(sorted(arrays.cycleNodes(graph.nodes)), [5, 6])
+        self.assertEqual(arrays.cycleNodes([1, 2, 3, 4]), [])
+        self.assertEqual(self.arrays.cycleNodes(self.graph.nodes), [])
+
+    def test_cycle_nodes_behind_loop(self):
+        graph = network_graph(
+            [
+                (1, 2, 1.0, 10, "reach_1"),
+                (2, 3, 1.0, 11, "reach_2"),
+                (3, 2, 1.0, 12, "reach_3"),
+                (3, 4, 1.0, 13, "reach_4"),
+                (4, 5, 1.0, 14, "reach_5"),
+                (5, 6, 1.0, 15, "reach_6"),
+                (6, 5, 1.0, 16, "reach_7"),
+                (6, 7, 1.0, 17, "reach_8"),
+                (7, 7, 1.0, 18, "reach_9"),
+            ]
+        )
+        arrays = TwwNetworkArrays(graph)
+
+        # The nodes between and behind the loops are not on a loop
+        self.assertEqual(sorted(arrays.cycleNodes(graph.nodes)), [2, 3, 5, 6, 7])
+        self.assertEqual(
+            sorted(arrays.cycleNodes(graph.nodes)),
+            sorted(
+                node
+                for component in nx.strongly_connected_components(graph)
+                for node in component
+                if len(component) > 1 or graph.has_edge(node, node)
+            ),
+        )
+        # Only the edges between the given nodes are followed
+        self.assertEqual(sorted(arrays.cycleNodes([2, 3, 4, 5])), [2, 3])
+        self.assertEqual(arrays.cycleNodes([3, 4, 5]), [])
+
+
+class TestTwwFeatureCache(unittest.TestCase):
+    def setUp(self):
+        self.fields = QgsFields()
+        self.fields.append(QgsField("obj_id", QVariant.String))
+        self.fields.append(QgsField("value", QVariant.Double))
+
+    def feature(self, fid, obj_id, value=None):
+        feat = QgsFeature(self.fields, fid)
+        feat["obj_id"] = obj_id
+        if value is not None:
+            feat["value"] = value
+        feat.setGeometry(QgsGeometry.fromWkt("LineString(0 0, 10 10)"))
+        return feat
+
+    def test_lookup(self):
+        cache = TwwFeatureCache(None)
+        cache.addFeature(self.feature(1, "reach_1", 2.5))
+        cache.addFeature(self.feature(2, "reach_2"))
+
+        self.assertEqual(len(cache), 2)
+        self.assertTrue(cache.hasFeature(1))
+        self.assertTrue(cache.hasObjId("reach_2"))
+        self.assertFalse(cache.hasObjId("reach_3"))
+        self.assertEqual(cache[2]["obj_id"], "reach_2")
+        self.assertEqual(cache.featureByObjId("reach_1").id(), 1)
+        self.assertEqual(cache.attrAsFloat(cache[1], "value"), 2.5)
+        self.assertIsNone(cache.attrAsFloat(cache[2], "value"))
+        self.assertEqual(sorted(cache.asObjIdDict()), ["reach_1", "reach_2"])
+
+    def test_statistics(self):
+        cache = TwwFeatureCache(None)
+        cache.addFeature(self.feature(1, "reach_1"))
+
+        self.assertEqual(cache.findFeatureById(1).id(), 1)
+        self.assertEqual(cache.findFeatureByObjId("reach_1").id(), 1)
+        self.assertIsNone(cache.findFeatureById(2))
+        self.assertIsNone(cache.findFeatureByObjId("reach_2"))
+
+        statistics = cache.statistics()
+        self.assertEqual(statistics["features"], 1)
+        self.assertGreater(statistics["bytes"], 0)
+        self.assertEqual(statistics["hits"], 2)
+        self.assertEqual(statistics["misses"], 2)
+
+    def test_replace_feature(self):
+        cache = TwwFeatureCache(None)
+        cache.addFeature(self.feature(1, "reach_1"))
+        size = cache.sizeInBytes
+        cache.addFeature(self.feature(1, "reach_9"))
+
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.sizeInBytes, size)
+        self.assertFalse(cache.hasObjId("reach_1"))
+        self.assertEqual(cache.featureByObjId("reach_9").id(), 1)
+
+    def test_max_size_evicts_least_recently_used(self):
+        cache = TwwFeatureCache(None, max_size=2)
+        cache.addFeature(self.feature(1, "reach_1"))
+        cache.addFeature(self.feature(2, "reach_2"))
+        # Reading the first feature makes the second one the least recently used
+        cache.featureById(1)
+        cache.addFeature(self.feature(3, "reach_3"))
+
+        self.assertEqual(len(cache), 2)
+        self.assertTrue(cache.hasFeature(1))
+        self.assertFalse(cache.hasFeature(2))
+        self.assertFalse(cache.hasObjId("reach_2"))
+        self.assertTrue(cache.hasFeature(3))
+
+    def test_max_bytes(self):
+        cache = TwwFeatureCache(None)
+        cache.addFeature(self.feature(1, "reach_1"))
+        feature_size = cache.sizeInBytes
+
+        cache = TwwFeatureCache(None, max_bytes=feature_size * 2)
+        for fid in range(1, 6):
+            cache.addFeature(self.feature(fid, f"reach_{fid}"))
+
+        self.assertLessEqual(cache.sizeInBytes, feature_size * 2)
+        self.assertEqual(len(cache), 2)
+        self.assertTrue(cache.hasFeature(5))
+
+    def test_store_geometry(self):
+        cache = TwwFeatureCache(None, store_geometry=False)
+        feat = self.feature(1, "reach_1")
+        cache.addFeature(feat)
+
+        self.assertFalse(cache[1].hasGeometry())
+        # The feature given is not modified
+        self.assertTrue(feat.hasGeometry())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+from qgis.core import QgsProcessingFeedback
+from qgis.testing import start_app, unittest
+from teksi_wastewater.processing_provider.sum_up_upstream import (
+    Reach,
+    SumUpUpstreamAlgorithm,
+)
+
+start_app()
+
+
+class TestCalculateValues(unittest.TestCase):
+    def calculate_values(self, reaches, aggregate_method=None):
+        """
+        Calculates the values of a network given as (from_id, to_id, value) reaches
+        without blind connections, returns the values and the loop nodes
+        """
+        algorithm = SumUpUpstreamAlgorithm()
+        if aggregate_method is None:
+            aggregate_method = algorithm.aggregate_method_max
+
+        reaches_by_from_node = {}
+        reaches_by_id = {}
+        for i, (from_id, to_id, value) in enumerate(reaches):
+            reach = Reach(from_id, to_id, value, None, i)
+            reaches_by_from_node.setdefault(from_id, []).append(reach)
+            reaches_by_id[f"reach_{i}"] = reach
+
+        loop_nodes = set()
+        values = algorithm.calculate_values(
+            reaches_by_from_node,
+            reaches_by_id,
+            aggregate_method,
+            loop_nodes,
+            QgsProcessingFeedback(),
+        )
+        return values, loop_nodes
+
+    def test_chain(self):
+        values, loop_nodes = self.calculate_values([("a", "b", 1), ("b", "c", 2), ("c", "d", 4)])
+
+        self.assertEqual(values, {"a": 7, "b": 6, "c": 4})
+        self.assertEqual(loop_nodes, set())
+
+    def test_branches_are_aggregated(self):
+        reaches = [("a", "b", 1), ("b", "c", 2), ("a", "d", 5), ("d", "c", 1), ("c", "e", 3)]
+
+        values, _ = self.calculate_values(reaches)
+        self.assertEqual(values, {"a": 9, "b": 5, "c": 3, "d": 4})
+
+        values, _ = self.calculate_values(reaches, SumUpUpstreamAlgorithm.aggregate_method_min)
+        self.assertEqual(values["a"], 6)
+
+    def test_long_chain(self):
+        # Deeper than the recursion limit
+        count = 5000
+        values, _ = self.calculate_values([(i, i + 1, 1) for i in range(count)])
+
+        self.assertEqual(len(values), count)
+        self.assertEqual(values[0], count)
+        self.assertEqual(values[count - 1], 1)
+
+    def test_loop(self):
+        reaches = [("a", "b", 1), ("b", "c", 1), ("c", "b", 2), ("c", "d", 4), ("d", "e", 8)]
+
+        values, loop_nodes = self.calculate_values(reaches)
+
+        self.assertEqual(loop_nodes, {"b", "c"})
+        self.assertEqual(values["d"], 8)
+        # Values of the node by node walk with d calculated first, then c and b:
+        # from c the branch c, b, c adds nothing, b then uses the value of c
+        self.assertEqual(values["c"], 15)
+        self.assertEqual(values["b"], 16)
+        self.assertEqual(values["a"], 17)
+
+    def test_loop_without_exit(self):
+        values, loop_nodes = self.calculate_values([("a", "b", 1), ("b", "c", 2), ("c", "a", 4)])
+
+        self.assertEqual(loop_nodes, {"a", "b", "c"})
+        # c is calculated first: the walk comes back to a node it passed without branching,
+        # only the first reach is counted. b and a then use the value of c.
+        self.assertEqual(values, {"c": 4, "b": 6, "a": 7})
+
+    def test_reach_to_itself(self):
+        values, loop_nodes = self.calculate_values([("a", "a", 1), ("a", "b", 2)])
+
+        self.assertEqual(loop_nodes, {"a"})
+        # The reach to itself is passed once
+        self.assertEqual(values, {"a": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
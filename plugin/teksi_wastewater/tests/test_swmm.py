@@ -0,0 +1,534 @@
+import os
+import struct
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+from teksi_wastewater.processing_provider.TwwSwmm import (
+    SWMM_OUTPUT_MAGIC_NUMBER,
+    SWMM_RESULTS_PARAMETERS,
+    SwmmOutput,
+    SwmmReport,
+    TwwSwmm,
+    psycopg,
+    read_swmm_template,
+)
+
+REPORT_HEADER = """
+  EPA STORM WATER MANAGEMENT MODEL - VERSION 5.2
+
+  *************
+  Analysis Options
+  *************
+  Starting Date ............ 01/01/2020 00:00:00
+  Ending Date .............. 01/01/2020 00:10:00
+
+  ****************
+  Link Results
+  ****************
+"""
+
+REPORT_TIME_SERIES = """
+  <<< {swmm_type} {obj_id} >>>
+  ----
+  hdr
+  hdr
+  ----
+  01/01/2020  00:00:00   {value} 2.0 3.0 4.0
+  01/01/2020  00:05:00   {value} 2.0 3.0 4.0
+"""
+
+
+REPORT_NODE_DEPTH_SUMMARY = """
+  ******************
+  Node Depth Summary
+  ******************
+
+  ---------------------------------------------------------------------
+                                 Average  Maximum  Maximum  Time of Max
+                                   Depth    Depth      HGL   Occurrence
+  Node                 Type       Meters   Meters   Meters  days hr:min
+  ---------------------------------------------------------------------
+  J1                   JUNCTION     0.10     0.50   400.50     0  00:05
+  J2                   JUNCTION     0.20     0.70   399.70     0  00:10
+
+"""
+
+
+def write_report(directory, time_series, summary=""):
+    """
+    Writes a minimal swmm report with the given (swmm_type, obj_id, value) time series
+    """
+    rpt_file = os.path.join(directory, "test.rpt")
+    with open(rpt_file, "w") as f:
+        f.write(REPORT_HEADER)
+        for swmm_type, obj_id, value in time_series:
+            f.write(REPORT_TIME_SERIES.format(swmm_type=swmm_type, obj_id=obj_id, value=value))
+        f.write(summary)
+    return rpt_file
+
+
+def write_output(directory, node_ids, link_ids, periods, start_date=43831.0):
+    """
+    Writes a minimal swmm binary output file with one subcatchment.
+    Variable v of node n at period p is p * 10 + n * 100 + v, links add 0.5.
+    The start date is in days since 30.12.1899, 01.01.2020 by default.
+    """
+    subcatchment_ids = ["S1"]
+    variable_counts = (8, 6, 5, 15)
+    report_step = 300
+
+    data = bytearray(
+        struct.pack(
+            "<7i",
+            SWMM_OUTPUT_MAGIC_NUMBER,
+            51000,
+            4,
+            len(subcatchment_ids),
+            len(node_ids),
+            len(link_ids),
+            0,
+        )
+    )
+    ids_position = len(data)
+    for obj_id in subcatchment_ids + node_ids + link_ids:
+        data += struct.pack("<i", len(obj_id)) + obj_id.encode()
+
+    properties_position = len(data)
+    data += struct.pack("<2i", 1, 1) + struct.pack("<f", 1.0) * len(subcatchment_ids)
+    data += struct.pack("<4i", 3, 0, 2, 3) + struct.pack("<3f", 0, 1, 2) * len(node_ids)
+    data += struct.pack("<6i", 5, 0, 4, 5, 3, 6) + struct.pack("<5f", 0, 0, 0, 1, 10) * len(
+        link_ids
+    )
+    for count in variable_counts:
+        data += struct.pack("<i", count) + struct.pack(f"<{count}i", *range(count))
+    data += struct.pack("<di", start_date, report_step)
+
+    results_position = len(data)
+    for p in range(periods):
+        data += struct.pack("<d", start_date + (p + 1) * report_step / 86400)
+        data += np.zeros(len(subcatchment_ids) * variable_counts[0], "<f4").tobytes()
+        data += np.array(
+            [
+                [p * 10 + n * 100 + v for v in range(variable_counts[1])]
+                for n in range(len(node_ids))
+            ],
+            "<f4",
+        ).tobytes()
+        data += np.array(
+            [
+                [p * 10 + n * 100 + v + 0.5 for v in range(variable_counts[2])]
+                for n in range(len(link_ids))
+            ],
+            "<f4",
+        ).tobytes()
+        data += np.zeros(variable_counts[3], "<f4").tobytes()
+    data += struct.pack(
+        "<6i",
+        ids_position,
+        properties_position,
+        results_position,
+        periods,
+        0,
+        SWMM_OUTPUT_MAGIC_NUMBER,
+    )
+
+    out_file = os.path.join(directory, "test.out")
+    with open(out_file, "wb") as f:
+        f.write(data)
+    return out_file
+
+
+class TestReadSwmmTemplate(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_sections(self):
+        template_file = os.path.join(self.directory.name, "template.inp")
+        with open(template_file, "w") as f:
+            f.write(
+                ";; comment before the first section\n"
+                "[TITLE]\n"
+                "Test\n"
+                "\n"
+                " [OPTIONS]\n"
+                "FLOW_UNITS LPS\n"
+                "[TITLE]\n"
+                "Ignored\n"
+                "[CURVES]\n"
+                ";;Name Type\n"
+            )
+
+        sections = read_swmm_template(template_file)
+
+        self.assertEqual(list(sections), ["TITLE", "OPTIONS", "CURVES"])
+        self.assertEqual(sections["TITLE"], "[TITLE]\nTest\n\n")
+        # Only the first section of a name is used
+        self.assertEqual(sections["OPTIONS"], " [OPTIONS]\nFLOW_UNITS LPS\n")
+        self.assertEqual(sections["CURVES"], "[CURVES]\n;;Name Type\n")
+
+
+class TestSwmmReport(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        rpt_file = write_report(
+            self.directory.name,
+            [("Node", "J1", 1.0), ("Link", "C1", 5.0), ("Node", "J2", 2.0)],
+            REPORT_NODE_DEPTH_SUMMARY,
+        )
+        self.report = SwmmReport(rpt_file)
+
+    def test_analysis_option(self):
+        self.assertEqual(self.report.analysis_option("Starting Date"), "01/01/2020 00:00:00")
+        self.assertEqual(self.report.analysis_option("Ending"), "01/01/2020 00:10:00")
+        self.assertIsNone(self.report.analysis_option("Report Step"))
+
+    def test_summary_lines(self):
+        lines = self.report.summary_lines("Node Depth Summary")
+
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0][:4], ["J1", "JUNCTION", "0.10", "0.50"])
+        self.assertEqual(lines[1][0], "J2")
+        self.assertEqual(self.report.summary_lines("Depth Summary"), lines)
+        self.assertEqual(self.report.summary_lines("Link Flow Summary"), [])
+
+    def test_time_series_indexes(self):
+        self.assertEqual(list(self.report.time_series_indexes), ["J1", "C1", "J2"])
+        self.assertEqual(self.report.time_series_indexes["J1"]["type"], "node")
+        self.assertEqual(self.report.time_series_indexes["C1"]["type"], "link")
+
+    def test_time_series_rows(self):
+        rows = self.report.time_series_rows("C1")
+
+        self.assertEqual(
+            rows,
+            [
+                ["01/01/2020", "00:00:00", "5.0", "2.0", "3.0", "4.0"],
+                ["01/01/2020", "00:05:00", "5.0", "2.0", "3.0", "4.0"],
+            ],
+        )
+
+    def test_time_series_arrays(self):
+        columns = self.report.time_series_arrays("J2")
+
+        np.testing.assert_array_equal(
+            columns["time"],
+            np.array(["2020-01-01T00:00:00", "2020-01-01T00:05:00"], dtype="datetime64[s]"),
+        )
+        np.testing.assert_array_equal(columns["inflow"], [2.0, 2.0])
+        np.testing.assert_array_equal(columns["flooding"], [2.0, 2.0])
+        np.testing.assert_array_equal(columns["head"], [4.0, 4.0])
+
+    def test_iter_time_series_arrays(self):
+        series = list(self.report.iter_time_series_arrays())
+
+        self.assertEqual(
+            [(obj_id, swmm_type) for obj_id, swmm_type, _ in series],
+            [
+                ("J1", "node"),
+                ("C1", "link"),
+                ("J2", "node"),
+            ],
+        )
+        np.testing.assert_array_equal(series[1][2]["flow"], [5.0, 5.0])
+        np.testing.assert_array_equal(series[1][2]["capacity"], [4.0, 4.0])
+
+
+class TestSwmmOutput(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.out_file = write_output(self.directory.name, ["J1", "J2", "O1"], ["C1", "C2"], 4)
+
+    def test_header(self):
+        output = SwmmOutput(self.out_file)
+        self.addCleanup(output.close)
+
+        self.assertEqual(output.node_ids, ["J1", "J2", "O1"])
+        self.assertEqual(output.link_ids, ["C1", "C2"])
+        self.assertEqual(output.periods, 4)
+        self.assertEqual(output.report_step, 300)
+        np.testing.assert_array_equal(
+            output.times,
+            np.array(
+                [
+                    "2020-01-01T00:05:00",
+                    "2020-01-01T00:10:00",
+                    "2020-01-01T00:15:00",
+                    "2020-01-01T00:20:00",
+                ],
+                dtype="datetime64[s]",
+            ),
+        )
+
+    def test_time_series_arrays(self):
+        output = SwmmOutput(self.out_file)
+        self.addCleanup(output.close)
+
+        # Second node: 100 + variable index + 10 per period
+        node = output.time_series_arrays("J2")
+        np.testing.assert_array_equal(node["depth"], [100, 110, 120, 130])
+        np.testing.assert_array_equal(node["head"], [101, 111, 121, 131])
+        np.testing.assert_array_equal(node["inflow"], [104, 114, 124, 134])
+        np.testing.assert_array_equal(node["flooding"], [105, 115, 125, 135])
+
+        link = output.time_series_arrays("C1")
+        np.testing.assert_array_equal(link["flow"], [0.5, 10.5, 20.5, 30.5])
+        np.testing.assert_array_equal(link["depth"], [1.5, 11.5, 21.5, 31.5])
+        np.testing.assert_array_equal(link["velocity"], [2.5, 12.5, 22.5, 32.5])
+        np.testing.assert_array_equal(link["capacity"], [4.5, 14.5, 24.5, 34.5])
+
+    def test_obj_ids(self):
+        output = SwmmOutput(self.out_file, {"J2", "C2", "unknown"})
+        self.addCleanup(output.close)
+
+        self.assertEqual(
+            [(obj_id, swmm_type) for obj_id, swmm_type, _ in output.iter_time_series_arrays()],
+            [("J2", "node"), ("C2", "link")],
+        )
+        with self.assertRaises(KeyError):
+            output.time_series_arrays("J1")
+
+    def test_close(self):
+        output = SwmmOutput(self.out_file)
+        output.close()
+
+        self.assertIsNone(output.results)
+        # The file is not mapped anymore and can be replaced
+        os.remove(self.out_file)
+
+    def test_not_an_output_file(self):
+        rpt_file = write_report(self.directory.name, [("Node", "J1", 1.0)])
+
+        with self.assertRaises(ValueError):
+            SwmmOutput(rpt_file)
+
+
+class TestExecuteSwmm(unittest.TestCase):
+    def test_first_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            rpt_file = os.path.join(directory, "test.rpt")
+            swmm = TwwSwmm("test", None, "current", "test.inp", None, rpt_file, "swmm5", None)
+            with mock.patch("subprocess.run") as run:
+                swmm.execute_swmm()
+
+        self.assertEqual(
+            run.call_args.args[0],
+            ["swmm5", "test.inp", rpt_file, os.path.join(directory, "test.out")],
+        )
+
+
+class TestSwmmTimeSeriesReader(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.inp_file = os.path.join(self.directory.name, "test.inp")
+
+    def run_files(self, node_ids=("J1",), link_ids=("C1",), periods=2):
+        """
+        Writes the files of a run in the order of swmm: the input file, the binary output
+        matching the report time steps (00:00 and 00:05), then the report
+        """
+        with open(self.inp_file, "w") as f:
+            f.write("[TITLE]\n")
+        out_file = write_output(
+            self.directory.name, list(node_ids), list(link_ids), periods, 43831.0 - 300 / 86400
+        )
+        rpt_file = write_report(self.directory.name, [("Node", "J1", 1.0), ("Link", "C1", 5.0)])
+        now = time.time()
+        os.utime(self.inp_file, (now - 20, now - 20))
+        os.utime(out_file, (now - 10, now - 10))
+        os.utime(rpt_file, (now, now))
+        return rpt_file
+
+    def get_time_series_reader(self, rpt_file, inp_file=None):
+        swmm = TwwSwmm("test", None, "current", inp_file, None, rpt_file, None, None)
+        reader = swmm.get_time_series_reader()
+        self.addCleanup(reader.close)
+        return reader
+
+    def test_binary_output_of_a_run(self):
+        rpt_file = self.run_files()
+
+        reader = self.get_time_series_reader(rpt_file, self.inp_file)
+
+        self.assertIsInstance(reader, SwmmOutput)
+        self.assertEqual(sorted(reader.time_series_indexes), ["C1", "J1"])
+
+    def test_binary_output_without_input_file(self):
+        rpt_file = self.run_files()
+
+        self.assertIsInstance(self.get_time_series_reader(rpt_file), SwmmOutput)
+
+    def test_binary_output_older_than_input_file(self):
+        rpt_file = self.run_files()
+        os.utime(self.inp_file)
+
+        self.assertIsInstance(self.get_time_series_reader(rpt_file, self.inp_file), SwmmReport)
+
+    def test_binary_output_of_another_network(self):
+        rpt_file = self.run_files(node_ids=("J2",))
+
+        self.assertIsInstance(self.get_time_series_reader(rpt_file), SwmmReport)
+
+    def test_binary_output_of_other_time_steps(self):
+        rpt_file = self.run_files(periods=3)
+
+        self.assertIsInstance(self.get_time_series_reader(rpt_file), SwmmReport)
+
+    def test_missing_binary_output(self):
+        rpt_file = write_report(self.directory.name, [("Node", "J1", 1.0)])
+
+        self.assertIsInstance(self.get_time_series_reader(rpt_file), SwmmReport)
+
+
+class TestPopulateAttribute(unittest.TestCase):
+    def test_copy_error_is_rolled_back(self):
+        swmm = TwwSwmm("test", None, "current", None, None, None, None, mock.Mock())
+        swmm.con = mock.MagicMock()
+        cursor = swmm.con.cursor.return_value
+        cursor.copy.side_effect = psycopg.Error("value too long")
+
+        result = swmm.populate_attribute(
+            [{"id": "from_node@ch000000reach001", "maximum_hgl": 401.2}],
+            "wastewater_node",
+            "_backflow_level_current",
+            "maximum_hgl",
+        )
+
+        self.assertEqual(result, (None, None))
+        swmm.con.rollback.assert_called_once()
+        swmm.con.commit.assert_not_called()
+        swmm.feedback.reportError.assert_any_call("value too long")
+
+    def test_long_ids_are_staged(self):
+        swmm = TwwSwmm("test", None, "current", None, None, None, None, mock.Mock())
+        swmm.con = mock.MagicMock()
+        cursor = swmm.con.cursor.return_value
+        cursor.fetchall.return_value = [("from_node@ch000000reach001",)]
+
+        swmm.populate_attribute(
+            [{"id": "from_node@ch000000reach001", "maximum_hgl": 401.2}],
+            "wastewater_node",
+            "_backflow_level_current",
+            "maximum_hgl",
+        )
+
+        self.assertIn("obj_id text", cursor.execute.call_args_list[0].args[0])
+        copy = cursor.copy.return_value.__enter__.return_value
+        copy.write_row.assert_called_once_with(("from_node@ch000000reach001", 401.2))
+        swmm.con.commit.assert_called_once()
+
+
+class TestRecordSummary(unittest.TestCase):
+    def test_reaches_of_one_channel_are_recorded_at_their_time(self):
+        swmm = TwwSwmm("test", None, "current", None, None, None, None, None)
+        swmm.con = mock.Mock()
+        swmm.prepare_measuring_points = mock.Mock(
+            return_value={"reach_1": "mp_channel", "reach_2": "mp_channel"}
+        )
+        swmm.prepare_measurement_series = mock.Mock(
+            return_value={("mp_channel", "maximum_flow"): "ms_maximum_flow"}
+        )
+        swmm.upsert_measurement_results = mock.Mock()
+
+        swmm.record_summary(
+            [
+                {
+                    "id": "reach_1",
+                    "time_max_day": "0",
+                    "time_max_time": "00:05",
+                    "maximum_flow": 1.0,
+                },
+                {
+                    "id": "reach_2",
+                    "time_max_day": "0",
+                    "time_max_time": "01:10",
+                    "maximum_flow": 2.0,
+                },
+            ],
+            datetime(2020, 1, 1),
+            "test",
+            600,
+            "link",
+        )
+
+        results = swmm.upsert_measurement_results.call_args.args[0]
+        self.assertEqual(
+            [(ms, time, value) for ms, _, _, time, value in results],
+            [
+                ("ms_maximum_flow", "2020-01-01T00:05:00", 1.0),
+                ("ms_maximum_flow", "2020-01-01T01:10:00", 2.0),
+            ],
+        )
+
+    def test_error_is_raised(self):
+        swmm = TwwSwmm("test", None, "current", None, None, None, None, mock.Mock())
+        swmm.con = mock.MagicMock()
+        swmm.con.cursor.return_value.execute.side_effect = psycopg.ProgrammingError("error")
+
+        with self.assertRaises(psycopg.ProgrammingError):
+            swmm.prepare_measuring_points("test", ["node_1"], [])
+        swmm.con.rollback.assert_called_once()
+
+
+class TestSwmmImport(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def _import_full_results(self, rpt_file, measuring_points):
+        swmm = TwwSwmm("test", None, "current", None, None, rpt_file, None, None)
+        swmm.con = mock.Mock()
+        swmm.prepare_measuring_points = mock.Mock(return_value=measuring_points)
+        swmm.prepare_measurement_series = mock.Mock(
+            return_value={
+                (mp, name): f"{mp}_{name}"
+                for mp in set(measuring_points.values())
+                for name in SWMM_RESULTS_PARAMETERS
+            }
+        )
+        swmm.upsert_measurement_results = mock.Mock()
+
+        swmm.import_full_results("test")
+
+        results = []
+        for call in swmm.upsert_measurement_results.call_args_list:
+            results.extend(call.args[0])
+        return results
+
+    def test_reaches_of_one_channel_are_staged(self):
+        rpt_file = write_report(
+            self.directory.name, [("Link", "reach_1", 1.0), ("Link", "reach_2", 9.0)]
+        )
+
+        # Both reaches belong to the same channel, they share its measuring point
+        results = self._import_full_results(
+            rpt_file, {"reach_1": "mp_channel", "reach_2": "mp_channel"}
+        )
+
+        # 4 link columns with 2 time steps for each reach, upsert_measurement_results
+        # writes the last one staged for the same serie and time
+        self.assertEqual(len(results), 16)
+        flows = [value for ms, _, _, _, value in results if ms == "mp_channel_flow"]
+        self.assertEqual(flows, [1.0, 1.0, 9.0, 9.0])
+
+    def test_reaches_of_two_channels_are_staged(self):
+        rpt_file = write_report(
+            self.directory.name, [("Link", "reach_1", 1.0), ("Link", "reach_2", 9.0)]
+        )
+
+        results = self._import_full_results(
+            rpt_file, {"reach_1": "mp_channel_1", "reach_2": "mp_channel_2"}
+        )
+
+        self.assertEqual(len(results), 16)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+import struct
+import unittest
+
+from geoalchemy2.elements import WKBElement
+from teksi_wastewater.interlis.utils import wkb
+
+SRID = 2056
+
+
+def ewkb_header(geometry_type, srid=None, flags=0, endian="<"):
+    if srid is None:
+        return struct.pack(f"{endian}BI", endian == "<", geometry_type | flags)
+    return struct.pack(f"{endian}BII", endian == "<", geometry_type | flags | wkb.EWKB_SRID, srid)
+
+
+def ewkb_points(coordinates, endian="<"):
+    return struct.pack(f"{endian}{len(coordinates)}d", *coordinates)
+
+
+class TestForce3d(unittest.TestCase):
+    def assertHeader(self, data, pos, geometry_type, srid=None):
+        """
+        Checks a little endian EWKB header with Z flag, returns the position after it
+        """
+        byte_order, type_flags = struct.unpack_from("<BI", data, pos)
+        self.assertEqual(byte_order, 1)
+        self.assertEqual(type_flags & 0x0FFFFFFF, geometry_type)
+        self.assertTrue(type_flags & wkb.EWKB_Z)
+        self.assertFalse(type_flags & wkb.EWKB_M)
+        pos += 5
+        if srid is None:
+            self.assertFalse(type_flags & wkb.EWKB_SRID)
+            return pos
+        self.assertTrue(type_flags & wkb.EWKB_SRID)
+        self.assertEqual(struct.unpack_from("<I", data, pos)[0], srid)
+        return pos + 4
+
+    def test_none(self):
+        self.assertIsNone(wkb.force_3d(None, 412.5))
+
+    def test_point(self):
+        data = ewkb_header(wkb.WKB_POINT, SRID) + ewkb_points([1, 2])
+        result = wkb.force_3d(WKBElement(data, srid=SRID, extended=True), 412.5)
+
+        self.assertEqual(result.srid, SRID)
+        pos = self.assertHeader(result.data, 0, wkb.WKB_POINT, SRID)
+        self.assertEqual(struct.unpack_from("<3d", result.data, pos), (1, 2, 412.5))
+        self.assertEqual(len(result.data), pos + 24)
+
+    def test_point_without_z_value(self):
+        data = ewkb_header(wkb.WKB_POINT, SRID) + ewkb_points([1, 2])
+        result = wkb.force_3d(WKBElement(data, srid=SRID, extended=True))
+
+        pos = self.assertHeader(result.data, 0, wkb.WKB_POINT, SRID)
+        self.assertEqual(struct.unpack_from("<3d", result.data, pos), (1, 2, 0))
+
+    def test_hex_input(self):
+        data = ewkb_header(wkb.WKB_POINT, SRID) + ewkb_points([1, 2])
+        result = wkb.force_3d(WKBElement(data.hex(), srid=SRID, extended=True), 3)
+
+        pos = self.assertHeader(result.data, 0, wkb.WKB_POINT, SRID)
+        self.assertEqual(struct.unpack_from("<3d", result.data, pos), (1, 2, 3))
+
+    def test_line(self):
+        data = (
+            ewkb_header(wkb.WKB_LINESTRING, SRID)
+            + struct.pack("<I", 2)
+            + ewkb_points([0, 0, 10, 5])
+        )
+        result = wkb.force_3d(WKBElement(data, srid=SRID, extended=True), 400)
+
+        pos = self.assertHeader(result.data, 0, wkb.WKB_LINESTRING, SRID)
+        self.assertEqual(struct.unpack_from("<I", result.data, pos)[0], 2)
+        self.assertEqual(struct.unpack_from("<6d", result.data, pos + 4), (0, 0, 400, 10, 5, 400))
+
+    def test_polygon(self):
+        ring = [0, 0, 1, 0, 1, 1, 0, 0]
+        data = ewkb_header(wkb.WKB_POLYGON, SRID) + struct.pack("<II", 1, 4) + ewkb_points(ring)
+        result = wkb.force_3d(WKBElement(data, srid=SRID, extended=True), 7)
+
+        pos = self.assertHeader(result.data, 0, wkb.WKB_POLYGON, SRID)
+        self.assertEqual(struct.unpack_from("<II", result.data, pos), (1, 4))
+        self.assertEqual(
+            struct.unpack_from("<12d", result.data, pos + 8),
+            (0, 0, 7, 1, 0, 7, 1, 1, 7, 0, 0, 7),
+        )
+        self.assertEqual(len(result.data), pos + 8 + 12 * 8)
+
+    def test_compound_curve_srid_only_at_top_level(self):
+        arc = (
+            ewkb_header(wkb.WKB_CIRCULARSTRING)
+            + struct.pack("<I", 3)
+            + ewkb_points([0, 0, 1, 1, 2, 0])
+        )
+        line = ewkb_header(wkb.WKB_LINESTRING) + struct.pack("<I", 2) + ewkb_points([2, 0, 3, 0])
+        data = ewkb_header(9, SRID) + struct.pack("<I", 2) + arc + line
+        result = wkb.force_3d(WKBElement(data, srid=SRID, extended=True), 5)
+
+        pos = self.assertHeader(result.data, 0, 9, SRID)
+        self.assertEqual(struct.unpack_from("<I", result.data, pos)[0], 2)
+        pos = self.assertHeader(result.data, pos + 4, wkb.WKB_CIRCULARSTRING)
+        self.assertEqual(struct.unpack_from("<I", result.data, pos)[0], 3)
+        self.assertEqual(
+            struct.unpack_from("<9d", result.data, pos + 4), (0, 0, 5, 1, 1, 5, 2, 0, 5)
+        )
+        pos = self.assertHeader(result.data, pos + 4 + 9 * 8, wkb.WKB_LINESTRING)
+        self.assertEqual(struct.unpack_from("<I", result.data, pos)[0], 2)
+        self.assertEqual(struct.unpack_from("<6d", result.data, pos + 4), (2, 0, 5, 3, 0, 5))
+        self.assertEqual(len(result.data), pos + 4 + 6 * 8)
+
+    def test_big_endian(self):
+        data = (
+            ewkb_header(wkb.WKB_LINESTRING, SRID, endian=">")
+            + struct.pack(">I", 2)
+            + ewkb_points([1, 2, 3, 4], endian=">")
+        )
+        result = wkb.force_3d(WKBElement(data, srid=SRID, extended=True), 9)
+
+        # The output is always little endian
+        pos = self.assertHeader(result.data, 0, wkb.WKB_LINESTRING, SRID)
+        self.assertEqual(struct.unpack_from("<I", result.data, pos)[0], 2)
+        self.assertEqual(struct.unpack_from("<6d", result.data, pos + 4), (1, 2, 9, 3, 4, 9))
+
+    def test_existing_z_is_kept(self):
+        data = (
+            ewkb_header(wkb.WKB_LINESTRING, SRID, flags=wkb.EWKB_Z)
+            + struct.pack("<I", 2)
+            + ewkb_points([1, 2, 100, 3, 4, 200])
+        )
+        result = wkb.force_3d(WKBElement(data, srid=SRID, extended=True), 9)
+
+        pos = self.assertHeader(result.data, 0, wkb.WKB_LINESTRING, SRID)
+        self.assertEqual(struct.unpack_from("<6d", result.data, pos + 4), (1, 2, 100, 3, 4, 200))
+
+    def test_iso_z_is_kept(self):
+        data = ewkb_header(1001) + ewkb_points([1, 2, 100])
+        result = wkb.force_3d(WKBElement(data, srid=-1), 9)
+
+        pos = self.assertHeader(result.data, 0, wkb.WKB_POINT)
+        self.assertEqual(struct.unpack_from("<3d", result.data, pos), (1, 2, 100))
+
+    def test_m_is_dropped(self):
+        data = (
+            ewkb_header(wkb.WKB_LINESTRING, SRID, flags=wkb.EWKB_M)
+            + struct.pack("<I", 2)
+            + ewkb_points([1, 2, 0.5, 3, 4, 0.7])
+        )
+        result = wkb.force_3d(WKBElement(data, srid=SRID, extended=True), 9)
+
+        pos = self.assertHeader(result.data, 0, wkb.WKB_LINESTRING, SRID)
+        self.assertEqual(struct.unpack_from("<6d", result.data, pos + 4), (1, 2, 9, 3, 4, 9))
+        self.assertEqual(len(result.data), pos + 4 + 6 * 8)
+
+    def test_zm_keeps_z_and_drops_m(self):
+        data = ewkb_header(3001) + ewkb_points([1, 2, 100, 0.5])
+        result = wkb.force_3d(WKBElement(data, srid=-1), 9)
+
+        pos = self.assertHeader(result.data, 0, wkb.WKB_POINT)
+        self.assertEqual(struct.unpack_from("<3d", result.data, pos), (1, 2, 100))
+        self.assertEqual(len(result.data), pos + 24)
+
+    def test_srid_of_element(self):
+        # WKB without SRID in the geometry takes the SRID of the element
+        data = ewkb_header(wkb.WKB_POINT) + ewkb_points([1, 2])
+        result = wkb.force_3d(WKBElement(data, srid=SRID), 3)
+
+        self.assertEqual(result.srid, SRID)
+        self.assertHeader(result.data, 0, wkb.WKB_POINT, SRID)
+
+    def test_unsupported_type(self):
+        data = ewkb_header(99) + ewkb_points([1, 2])
+        with self.assertRaises(wkb.WkbException):
+            wkb.force_3d(WKBElement(data, srid=-1), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -26,23 +26,87 @@
 Manages a graph of a wastewater network
 """
 
-import copyreg
+import hashlib
+import heapq
+import os
 import re
+import sys
 import time
 
 # pylint: disable=no-name-in-module
-from collections import defaultdict
+from collections import OrderedDict, defaultdict, deque
 
 import networkx as nx
-from qgis.core import NULL, Qgis, QgsGeometry, QgsMessageLog, QgsPointXY
+import numpy as np
+from qgis.core import (
+    NULL,
+    Qgis,
+    QgsDataSourceUri,
+    QgsExpression,
+    QgsFeature,
+    QgsFeatureRequest,
+    QgsGeometry,
+    QgsMessageLog,
+    QgsPointXY,
+    QgsProject,
+    QgsSettings,
+)
 from qgis.PyQt.QtCore import QObject, Qt, pyqtSignal
 
+from ..utils.database_utils import DatabaseUtils
+from ..utils.plugin_utils import logger
 from ..utils.qt_utils import OverrideCursor
 
+# Bump whenever the layout of the graph cache file changes
+GRAPH_CACHE_VERSION = 2
+
+# Maximum number of ids or values sent to the provider in a single request
+FEATURE_REQUEST_BATCH_SIZE = 1000
+
+# Default budget of the feature caches kept per layer by the graph manager across calls,
+# overridable with the tww_plugin/feature_cache_max_features and
+# tww_plugin/feature_cache_max_mb settings
+SHARED_FEATURE_CACHE_SIZE = 50000
+SHARED_FEATURE_CACHE_MB = 256
+
+
+def _batches(items, size):
+    """
+    Splits a list into chunks of at most size items
+    """
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _toStringArray(values):
+    """
+    Converts a list of strings, which may hold NULL values, to a unicode array and a null mask
+    """
+    nulls = np.array([value is None or value == NULL for value in values], dtype=bool)
+    strings = np.array(
+        ["" if null else str(value) for value, null in zip(values, nulls.tolist())], dtype=str
+    )
+    return strings, nulls
+
+
+def _fromStringArray(strings, nulls):
+    """
+    Reverts _toStringArray
+    """
+    return [NULL if null else value for value, null in zip(strings.tolist(), nulls.tolist())]
+
 
 class TwwGraphManager(QObject):
     """
     Manages a graph
+
+    The graph is built lazily on first use. The node and reach layers are materialized
+    views, rewritten as a whole by the network refresh, so the graph is rebuilt by refresh().
+    It is not patched from layer edits: edits don't change these views before the next
+    refresh, which renumbers all their features.
+
+    Once built, the graph is stored in a cache file next to the project and
+    reloaded from there as long as the network in the database is unchanged.
     """
 
     edge_layer = None
@@ -51,6 +115,7 @@ class TwwGraphManager(QObject):
     nodeLayerId = -1
     dirty = True
     graph = None
+    arrays = None
     vertexIds = {}
     nodesOnStructure = defaultdict(list)
     # Logs performance of graph creation
@@ -60,6 +125,7 @@ class TwwGraphManager(QObject):
 
     def __init__(self):
         QObject.__init__(self)
+        self._featureCaches = {}
 
     def setReachLayer(self, reach_layer):
         """
@@ -73,9 +139,6 @@ class TwwGraphManager(QObject):
         else:
             self.edge_layer_id = 0
 
-        if self.nodeLayer and self.edge_layer:
-            self.createGraph()
-
     def setNodeLayer(self, node_layer):
         """
         Set the node layer
@@ -90,9 +153,6 @@ class TwwGraphManager(QObject):
         else:
             self.nodeLayerId = 0
 
-        if self.nodeLayer and self.edge_layer:
-            self.createGraph()
-
     def _addVertices(self):
         """
         Initializes the graph with the vertices from the node layer
@@ -103,21 +163,27 @@ class TwwGraphManager(QObject):
 
         # Add all vertices
         for feat in features:
-            fid = feat.id()
+            self._addVertex(feat)
 
-            obj_id = feat["obj_id"]
-            obj_type = feat["type"]
+        self._profile("add vertices")
+
+    def _addVertex(self, feat):
+        """
+        Adds the vertex of a node feature
+        """
+        fid = feat.id()
 
-            try:
-                vertex = feat.geometry().asPoint()
-            except ValueError:
-                raise ValueError(f"No Point Geometry found for Node {obj_id} (Type: {obj_type})")
+        obj_id = feat["obj_id"]
+        obj_type = feat["type"]
 
-            self.graph.add_node(fid, point=vertex, objType=obj_type, objId=obj_id)
+        try:
+            vertex = feat.geometry().asPoint()
+        except ValueError:
+            raise ValueError(f"No Point Geometry found for Node {obj_id} (Type: {obj_type})")
 
-            self.vertexIds[str(obj_id)] = fid
+        self.graph.add_node(fid, point=vertex, objType=obj_type, objId=obj_id)
 
-        self._profile("add vertices")
+        self.vertexIds[str(obj_id)] = fid
 
     def _addEdges(self):
         """
@@ -130,34 +196,42 @@ class TwwGraphManager(QObject):
 
         # Loop through all reaches
         for feat in features:
-            try:
-                obj_id = feat["obj_id"]
-                obj_type = feat["type"]
-                from_obj_id = feat["from_obj_id"]
-                to_obj_id = feat["to_obj_id"]
-
-                length = feat["length_calc"]
-
-                pt_id1 = self.vertexIds[from_obj_id]
-                pt_id2 = self.vertexIds[to_obj_id]
-
-                self.graph.add_edge(
-                    pt_id1,
-                    pt_id2,
-                    weight=length,
-                    feature=feat.id(),
-                    baseFeature=obj_id,
-                    objType=obj_type,
-                )
-            except KeyError as e:
-                print(e)
+            self._addEdge(feat)
 
         self._profile("add edges")
 
+    def _addEdge(self, feat):
+        """
+        Adds the edge of a reach feature
+        """
+        try:
+            obj_id = feat["obj_id"]
+            obj_type = feat["type"]
+            from_obj_id = feat["from_obj_id"]
+            to_obj_id = feat["to_obj_id"]
+
+            length = feat["length_calc"]
+
+            pt_id1 = self.vertexIds[from_obj_id]
+            pt_id2 = self.vertexIds[to_obj_id]
+
+            self.graph.add_edge(
+                pt_id1,
+                pt_id2,
+                weight=length,
+                feature=feat.id(),
+                baseFeature=obj_id,
+                objType=obj_type,
+            )
+        except KeyError as e:
+            print(e)
+
     def refresh(self):
         """
         Refreshes the network graph. It will force a refresh of the materialized views in the database and then reload
         and recreate the graph.
+        The network refresh in the database truncates and refills the network tables, renumbering all the
+        network features, hence the graph is rebuilt.
         """
         with OverrideCursor(Qt.WaitCursor):
             transaction = self.nodeLayer.dataProvider().transaction()
@@ -190,8 +264,15 @@ class TwwGraphManager(QObject):
                 self.nodeLayer.commitChanges()
 
             # recreate networkx graph
+            self.rebuild()
+
+    def rebuild(self):
+        """
+        Drops the current graph and recreates it from the node and reach layers
+        """
+        if self.graph is not None:
             self.graph.clear()
-            self.createGraph()
+        self.createGraph(use_cache=False)
 
     def _profile(self, name):
         """
@@ -203,9 +284,10 @@ class TwwGraphManager(QObject):
         self.timings.append((name, spenttime))
 
     # Creates a network graph
-    def createGraph(self):
+    def createGraph(self, use_cache=True):
         """
         Create a graph
+        :param use_cache: Load the graph from the cache file if it is still valid
         """
         self._profile("create graph")
         # try:
@@ -213,15 +295,156 @@ class TwwGraphManager(QObject):
         self.nodesOnStructure = defaultdict(list)
         self._profile("initiate dicts")
         self.graph = nx.DiGraph()
+        self.arrays = None
+        self._featureCaches = {}
 
         self._profile("initiate graph")
 
-        self._addVertices()
-        self._addEdges()
+        fingerprint = self._networkFingerprint()
+
+        if not use_cache or not self._loadGraphCache(fingerprint):
+            self._addVertices()
+            self._addEdges()
+            self._saveGraphCache(fingerprint)
 
         self.print_profile()
         self.dirty = False
 
+    def _graphCachePath(self):
+        """
+        The path of the graph cache file, next to the project file.
+        None if the project has not been saved yet.
+        """
+        project = QgsProject.instance()
+        if not project.fileName():
+            return None
+
+        return os.path.join(project.absolutePath(), f"{project.baseName()}.twwnetwork")
+
+    # pylint: disable=no-self-use
+    def _networkFingerprint(self):
+        """
+        Returns a value identifying the current state of the network in the database.
+        The network refresh truncates and refills the network tables, their row count
+        and highest id therefore change with every refresh.
+        """
+        try:
+            return DatabaseUtils.fetchone(
+                "SELECT"
+                " (SELECT count(*) FROM tww_od.network_node),"
+                " (SELECT max(id) FROM tww_od.network_node),"
+                " (SELECT count(*) FROM tww_od.network_segment),"
+                " (SELECT max(id) FROM tww_od.network_segment);"
+            )
+        except Exception as exception:
+            logger.warning(f"Could not determine the network state: {exception}")
+            return None
+
+    def _cacheKey(self, fingerprint):
+        """
+        Returns a hash identifying the network state and the layers the graph was built from.
+        Only the database and table of the layers are used, the credentials of their source
+        never end up in the cache file.
+        """
+        key = hashlib.sha256()
+        key.update(str(GRAPH_CACHE_VERSION).encode())
+        key.update(str(tuple(fingerprint)).encode())
+        for layer in (self.nodeLayer, self.edge_layer):
+            uri = QgsDataSourceUri(layer.source())
+            for part in (
+                uri.service(),
+                uri.database(),
+                uri.host(),
+                uri.port(),
+                uri.schema(),
+                uri.table(),
+            ):
+                key.update(b"\0" + part.encode())
+        return key.hexdigest()
+
+    def _loadGraphCache(self, fingerprint):
+        """
+        Loads the graph from the cache file
+        :return: True if the graph was loaded, False if there is no valid cache
+        """
+        path = self._graphCachePath()
+        if fingerprint is None or path is None or not os.path.exists(path):
+            return False
+
+        try:
+            # Plain arrays only, a cache file must never be able to run code when loaded
+            with np.load(path, allow_pickle=False) as npz:
+                if str(npz["key"]) != self._cacheKey(fingerprint):
+                    return False
+                data = {name: npz[name] for name in npz.files}
+        except Exception as exception:
+            logger.warning(f"Could not read the network cache {path}: {exception}")
+            return False
+
+        for fid, x, y, obj_type, obj_id in zip(
+            data["node_fids"].tolist(),
+            data["node_x"].tolist(),
+            data["node_y"].tolist(),
+            _fromStringArray(data["node_types"], data["node_types_null"]),
+            _fromStringArray(data["node_obj_ids"], data["node_obj_ids_null"]),
+        ):
+            self.graph.add_node(fid, point=QgsPointXY(x, y), objType=obj_type, objId=obj_id)
+            self.vertexIds[str(obj_id)] = fid
+
+        for fid, u, v, weight, obj_id, obj_type in zip(
+            data["edge_fids"].tolist(),
+            data["edge_from"].tolist(),
+            data["edge_to"].tolist(),
+            data["edge_weights"].tolist(),
+            _fromStringArray(data["edge_obj_ids"], data["edge_obj_ids_null"]),
+            _fromStringArray(data["edge_types"], data["edge_types_null"]),
+        ):
+            self.graph.add_edge(
+                u, v, weight=weight, feature=fid, baseFeature=obj_id, objType=obj_type
+            )
+
+        self._profile("load graph cache")
+        return True
+
+    def _saveGraphCache(self, fingerprint):
+        """
+        Writes the graph to the cache file
+        """
+        path = self._graphCachePath()
+        if fingerprint is None or path is None:
+            return
+
+        nodes = self.graph.nodes(data=True)
+        edges = self.graph.edges(data=True)
+        data = {
+            "key": np.array(self._cacheKey(fingerprint)),
+            "node_fids": np.array([fid for fid, _ in nodes], dtype=np.int64),
+            "node_x": np.array([node["point"].x() for _, node in nodes], dtype=np.float64),
+            "node_y": np.array([node["point"].y() for _, node in nodes], dtype=np.float64),
+            "edge_fids": np.array([edge["feature"] for _, _, edge in edges], dtype=np.int64),
+            "edge_from": np.array([u for u, _, _ in edges], dtype=np.int64),
+            "edge_to": np.array([v for _, v, _ in edges], dtype=np.int64),
+            "edge_weights": np.array(
+                [edge["weight"] or 0.0 for _, _, edge in edges], dtype=np.float64
+            ),
+        }
+        for name, values in (
+            ("node_types", [node["objType"] for _, node in nodes]),
+            ("node_obj_ids", [node["objId"] for _, node in nodes]),
+            ("edge_obj_ids", [edge["baseFeature"] for _, _, edge in edges]),
+            ("edge_types", [edge["objType"] for _, _, edge in edges]),
+        ):
+            data[name], data[f"{name}_null"] = _toStringArray(values)
+
+        try:
+            # Written through a file object, np.savez would append .npz to a path
+            with open(path, "wb") as f:
+                np.savez(f, **data)
+        except Exception as exception:
+            logger.warning(f"Could not write the network cache {path}: {exception}")
+
+        self._profile("save graph cache")
+
     def getNodeLayer(self):
         """
         Getter for the node layer
@@ -247,6 +470,20 @@ class TwwGraphManager(QObject):
         """
         return self.edge_layer_id
 
+    def getNetworkArrays(self):
+        """
+        Getter for the array backed copy of the graph used for traversals.
+        It is created on demand and dropped whenever the graph changes.
+        """
+        if self.dirty:
+            self.createGraph()
+
+        if self.arrays is None:
+            self.arrays = TwwNetworkArrays(self.graph)
+            self._profile("create network arrays")
+
+        return self.arrays
+
     def shortestPath(self, start_point, end_point):
         """
         Finds the shortest path from the start point
@@ -255,54 +492,52 @@ class TwwGraphManager(QObject):
         :param end_point:   The end node
         :return:       A (path, edges) tuple
         """
-        if self.dirty:
-            self.createGraph()
-
-        try:
-            path = nx.algorithms.dijkstra_path(self.graph, start_point, end_point)
-            edges = [(u, v, self.graph.edges[u, v]) for (u, v) in zip(path[0:], path[1:])]
-
-            p = (path, edges)
+        path = self.getNetworkArrays().shortestPath(start_point, end_point)
 
-        except nx.NetworkXNoPath:
+        if not path:
             print("no path found")
-            p = ([], [])
+            return [], []
+
+        edges = [(u, v, self.graph.edges[u, v]) for (u, v) in zip(path[0:], path[1:])]
 
-        return p
+        return path, edges
 
-    def getTree(self, node, upstream=False):
+    def getTree(self, node, upstream=False, max_depth=None, max_distance=None):
         """
         Get
         :param node:    A start node
         :param upstream: Should the graph be reversed (upstream search)
+        :param max_depth: Stop the search after this number of edges
+        :param max_distance: Stop the search at this distance (sum of the edge weights)
         :return:        A list of edges
         """
-        if self.dirty:
-            self.createGraph()
-
-        # fix point pickle
-        def pickle_point(p):
-            return QgsPointXY, (
-                p.x(),
-                p.y(),
+        arrays = self.getNetworkArrays()
+
+        tree_edges = arrays.tree(
+            node, reverse=upstream, max_depth=max_depth, max_distance=max_distance
+        )
+
+        # Edges are oriented in search direction, as on the reversed graph for upstream searches
+        edges = []
+        node_fids = {node} if node in arrays.nodeIndex else set()
+        for from_fid, to_fid in tree_edges:
+            if upstream:
+                edges.append((to_fid, from_fid, self.graph.edges[from_fid, to_fid]))
+            else:
+                edges.append((from_fid, to_fid, self.graph.edges[from_fid, to_fid]))
+            node_fids.add(from_fid)
+            node_fids.add(to_fid)
+
+        nodes = [self.graph.nodes[n] for n in node_fids]
+
+        loop_nodes = arrays.cycleNodes(node_fids)
+        if loop_nodes:
+            self.message_emitted.emit(
+                self.tr("Warning"),
+                self.tr("The network contains loops at {} nodes").format(len(loop_nodes)),
+                Qgis.Warning,
             )
 
-        copyreg.pickle(QgsPointXY, pickle_point)
-
-        if upstream:
-            my_graph = self.graph.reverse()
-        else:
-            my_graph = self.graph
-
-        # Returns pred, weight
-        pred, _ = nx.bellman_ford_predecessor_and_distance(my_graph, node)
-        edges = [(v[0], u, my_graph.edges[v[0], u]) for (u, v) in list(pred.items()) if v]
-        nodes = [
-            my_graph.nodes[n]
-            for n in set(list(pred.keys()) + [v[0] for v in list(pred.values()) if v])
-            if n is not None
-        ]
-
         return nodes, edges
 
     def getEdgeGeometry(self, edges):
@@ -315,39 +550,74 @@ class TwwGraphManager(QObject):
         polylines = [feat.geometry().asPolyline() for feat in list(cache.asDict().values())]
         return polylines
 
-    # pylint: disable=no-self-use
     def getFeaturesById(self, layer, ids):
         """
         Get some features by their id
+        Features already fetched before are taken from the layer's shared cache,
+        the others are requested from the provider in batches.
         """
+        shared_cache = self._sharedFeatureCache(layer)
         feat_cache = TwwFeatureCache(layer)
-        data_provider = layer.dataProvider()
 
-        features = data_provider.getFeatures()
+        missing_ids = []
+        for fid in set(ids):
+            feat = shared_cache.findFeatureById(fid)
+            if feat is not None:
+                feat_cache.addFeature(feat)
+            else:
+                missing_ids.append(fid)
 
-        for feat in features:
-            if feat.id() in ids:
+        data_provider = layer.dataProvider()
+        for batch in _batches(missing_ids, FEATURE_REQUEST_BATCH_SIZE):
+            request = QgsFeatureRequest().setFilterFids(batch)
+            for feat in data_provider.getFeatures(request):
+                shared_cache.addFeature(feat)
                 feat_cache.addFeature(feat)
 
         return feat_cache
 
-    # pylint: disable=no-self-use
     def getFeaturesByAttr(self, layer, attr, values):
         """
         Get some features by an attribute value
+        The filter is evaluated by the provider, in batches of IN (...) expressions.
         """
+        shared_cache = self._sharedFeatureCache(layer)
         feat_cache = TwwFeatureCache(layer)
         data_provider = feat_cache.layer.dataProvider()
 
-        # Batch query and filter locally
-        features = data_provider.getFeatures()
-
-        for feat in features:
-            if feat_cache.attrAsUnicode(feat, attr) in values:
+        # Always ask the provider: attribute values such as obj_id are not unique in the
+        # network views, the shared cache can't tell whether it holds all matching features
+        for batch in _batches(list(set(values)), FEATURE_REQUEST_BATCH_SIZE):
+            expression = "{} IN ({})".format(
+                QgsExpression.quotedColumnRef(attr),
+                ", ".join(QgsExpression.quotedValue(value) for value in batch),
+            )
+            request = QgsFeatureRequest().setFilterExpression(expression)
+            for feat in data_provider.getFeatures(request):
+                shared_cache.addFeature(feat)
                 feat_cache.addFeature(feat)
 
         return feat_cache
 
+    def _sharedFeatureCache(self, layer):
+        """
+        Returns the cache kept for a layer across calls
+        """
+        if layer.id() not in self._featureCaches:
+            settings = QgsSettings()
+            self._featureCaches[layer.id()] = TwwFeatureCache(
+                layer,
+                max_size=settings.value(
+                    "tww_plugin/feature_cache_max_features", SHARED_FEATURE_CACHE_SIZE, type=int
+                ),
+                max_bytes=settings.value(
+                    "tww_plugin/feature_cache_max_mb", SHARED_FEATURE_CACHE_MB, type=int
+                )
+                * 1024
+                * 1024,
+            )
+        return self._featureCaches[layer.id()]
+
     def print_profile(self):
         """
         Will print some performance profiling information
@@ -361,42 +631,155 @@ class TwwFeatureCache:
     A feature cache.
     The DB can be slow sometimes, so if we know, that we'll be using some features
     several times consecutively it's better to keep it in memory.
-    There is no check done for maximum size. You have to care for your memory
-    yourself, when using this class!
+    With max_size (number of features) or max_bytes set, the least recently used
+    features are evicted once the cache grows beyond. Without, there is no check
+    done for maximum size and you have to care for your memory yourself!
     """
 
     _featuresById = None
-    _featuresByObjId = None
+    _objIds = None
+    _featureSizes = None
     objIdField = None
     layer = None
-
-    def __init__(self, layer, obj_id_field="obj_id"):
-        self._featuresById = {}
-        self._featuresByObjId = {}
+    maxSize = None
+    maxBytes = None
+    storeGeometry = True
+    sizeInBytes = 0
+    hits = 0
+    misses = 0
+
+    def __init__(
+        self, layer, obj_id_field="obj_id", max_size=None, max_bytes=None, store_geometry=True
+    ):
+        self._featuresById = OrderedDict()
+        # Object id to feature id, features are only stored once
+        self._objIds = {}
+        self._featureSizes = {}
         self.objIdField = obj_id_field
         self.layer = layer
+        self.maxSize = max_size
+        self.maxBytes = max_bytes
+        self.storeGeometry = store_geometry
+        self.sizeInBytes = 0
+        self.hits = 0
+        self.misses = 0
 
     def __getitem__(self, key):
         return self.featureById(key)
 
+    def __len__(self):
+        return len(self._featuresById)
+
     def addFeature(self, feat):
         """
         Add a feature to the cache
         """
-        self._featuresById[feat.id()] = feat
-        self._featuresByObjId[self.attrAsUnicode(feat, self.objIdField)] = feat
+        if not self.storeGeometry and feat.hasGeometry():
+            feat = QgsFeature(feat)
+            feat.clearGeometry()
+
+        fid = feat.id()
+        if fid in self._featuresById:
+            self._removeFeature(fid)
+
+        size = self._estimateSize(feat)
+        self._featuresById[fid] = feat
+        self._featureSizes[fid] = size
+        self.sizeInBytes += size
+        self._objIds[self.attrAsUnicode(feat, self.objIdField)] = fid
+
+        self._evict()
+
+    def _removeFeature(self, fid):
+        feat = self._featuresById.pop(fid)
+        self.sizeInBytes -= self._featureSizes.pop(fid)
+        obj_id = self.attrAsUnicode(feat, self.objIdField)
+        if self._objIds.get(obj_id) == fid:
+            del self._objIds[obj_id]
+
+    def _evict(self):
+        """
+        Evicts the least recently used features until the cache is within its budget
+        """
+        while self._featuresById and (
+            (self.maxSize is not None and len(self._featuresById) > self.maxSize)
+            or (self.maxBytes is not None and self.sizeInBytes > self.maxBytes)
+        ):
+            self._removeFeature(next(iter(self._featuresById)))
+
+    @staticmethod
+    def _estimateSize(feat):
+        """
+        Rough estimate of the memory used by a feature: its geometry as WKB and
+        its attribute values
+        """
+        size = sys.getsizeof(feat)
+        if feat.hasGeometry():
+            size += feat.geometry().constGet().wkbSize()
+        for value in feat.attributes():
+            size += sys.getsizeof(value)
+        return size
+
+    def hasFeature(self, fid):
+        """
+        Check if a feature id is in the cache
+        """
+        return fid in self._featuresById
+
+    def hasObjId(self, obj_id):
+        """
+        Check if an object id is in the cache
+        """
+        return obj_id in self._objIds
 
     def featureById(self, fid):
         """
         Get a feature by its feature id
         """
-        return self._featuresById[fid]
+        feat = self._featuresById[fid]
+        self._featuresById.move_to_end(fid)
+        return feat
 
     def featureByObjId(self, obj_id):
         """
         Get a feature by its object id
         """
-        return self._featuresByObjId[obj_id]
+        return self.featureById(self._objIds[obj_id])
+
+    def findFeatureById(self, fid):
+        """
+        Get a feature by its feature id, None if it is not cached.
+        Counts the cache hits and misses.
+        """
+        if fid in self._featuresById:
+            self.hits += 1
+            return self.featureById(fid)
+
+        self.misses += 1
+        return None
+
+    def findFeatureByObjId(self, obj_id):
+        """
+        Get a feature by its object id, None if it is not cached.
+        Counts the cache hits and misses.
+        """
+        if obj_id in self._objIds:
+            self.hits += 1
+            return self.featureByObjId(obj_id)
+
+        self.misses += 1
+        return None
+
+    def statistics(self) -> dict:
+        """
+        Returns the number of cached features, their estimated size and the hit/miss counters
+        """
+        return {
+            "features": len(self._featuresById),
+            "bytes": self.sizeInBytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
 
     def attrAsFloat(self, feat, attr):
         """
@@ -446,4 +829,265 @@ class TwwFeatureCache:
         """
         Returns all features as a dictionary with object ids as keys.
         """
-        return self._featuresById
+        return {obj_id: self._featuresById[fid] for obj_id, fid in self._objIds.items()}
+
+
+class TwwNetworkArrays:
+    """
+    An array backed copy of a network graph.
+    The forward and reverse adjacency are stored in compressed sparse row (CSR)
+    form, edge weights, feature ids and object ids in arrays parallel to the edges.
+    Traversals run over these arrays instead of the networkx dict of dicts.
+    """
+
+    def __init__(self, graph):
+        node_count = graph.number_of_nodes()
+        self.nodeFids = np.fromiter(graph.nodes, dtype=np.int64, count=node_count)
+        self.nodeIndex = {fid: idx for idx, fid in enumerate(self.nodeFids.tolist())}
+
+        edges = list(graph.edges(data=True))
+        edge_count = len(edges)
+        self.edgeFrom = np.fromiter(
+            (self.nodeIndex[u] for u, _, _ in edges), dtype=np.int64, count=edge_count
+        )
+        self.edgeTo = np.fromiter(
+            (self.nodeIndex[v] for _, v, _ in edges), dtype=np.int64, count=edge_count
+        )
+        self.weights = np.fromiter(
+            (edge["weight"] or 0.0 for _, _, edge in edges), dtype=np.float64, count=edge_count
+        )
+        self.featureIds = np.fromiter(
+            (edge["feature"] for _, _, edge in edges), dtype=np.int64, count=edge_count
+        )
+        self.objIds = np.array([edge["baseFeature"] for _, _, edge in edges], dtype=object)
+
+        self.forward = self._csr(self.edgeFrom, self.edgeTo, node_count)
+        self.reverse = self._csr(self.edgeTo, self.edgeFrom, node_count)
+
+        # Plain lists are much faster than numpy scalars for the per node loops,
+        # they are converted once so a traversal only costs the part of the graph it reaches
+        self._nodeFidList = self.nodeFids.tolist()
+        self._edgeFromList = self.edgeFrom.tolist()
+        self._edgeToList = self.edgeTo.tolist()
+        self._weightList = self.weights.tolist()
+        self._adjacencyLists = {
+            False: tuple(part.tolist() for part in self.forward),
+            True: tuple(part.tolist() for part in self.reverse),
+        }
+
+    @staticmethod
+    def _csr(sources, targets, node_count):
+        """
+        Builds the CSR adjacency (indptr, neighbour indices, edge indices)
+        """
+        order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=node_count), out=indptr[1:])
+        return indptr, targets[order], order
+
+    def _adjacency(self, reverse):
+        return self._adjacencyLists[reverse]
+
+    def bfs(self, source, reverse=False, max_depth=None):
+        """
+        Runs a breadth first search from the source node index,
+        in linear time of the reached part of the graph
+        :param source:    The index of the start node
+        :param reverse:   Follow the edges against their direction
+        :param max_depth: Do not follow more than this number of edges
+        :return:          The edge index used to reach every reached node but the source
+                          and the reached node indices in the order they were visited
+        """
+        indptr, neighbours, edge_indices = self._adjacency(reverse)
+
+        depth = {source: 0}
+        pred_edge = {}
+        order = [source]
+
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            if max_depth is not None and depth[u] >= max_depth:
+                continue
+            for i in range(indptr[u], indptr[u + 1]):
+                v = neighbours[i]
+                if v not in depth:
+                    depth[v] = depth[u] + 1
+                    pred_edge[v] = edge_indices[i]
+                    order.append(v)
+                    queue.append(v)
+
+        return pred_edge, order
+
+    def dijkstra(self, source, target=None, reverse=False, max_distance=None):
+        """
+        Runs Dijkstra from the source node index
+        :param source:  The index of the start node
+        :param target:  Stop as soon as the node with this index is settled
+        :param reverse: Follow the edges against their direction
+        :param max_distance: Do not reach nodes further away than this distance
+        :return:        The edge index used to reach every reached node but the source
+                        and the settled node indices in the order of their distance
+        """
+        indptr, neighbours, edge_indices = self._adjacency(reverse)
+        weights = self._weightList
+
+        dist = {source: 0.0}
+        pred_edge = {}
+        settled = set()
+        order = []
+
+        queue = [(0.0, source)]
+        while queue:
+            d, u = heapq.heappop(queue)
+            if u in settled:
+                continue
+            settled.add(u)
+            order.append(u)
+            if u == target:
+                break
+            for i in range(indptr[u], indptr[u + 1]):
+                v = neighbours[i]
+                nd = d + weights[edge_indices[i]]
+                if max_distance is not None and nd > max_distance:
+                    continue
+                if nd < dist.get(v, float("inf")):
+                    dist[v] = nd
+                    pred_edge[v] = edge_indices[i]
+                    heapq.heappush(queue, (nd, v))
+
+        return pred_edge, order
+
+    def shortestPath(self, start_fid, end_fid):
+        """
+        Finds the shortest path between two nodes
+        :return: The node feature ids along the path, empty if there is none
+        """
+        if start_fid not in self.nodeIndex or end_fid not in self.nodeIndex:
+            return []
+
+        source = self.nodeIndex[start_fid]
+        target = self.nodeIndex[end_fid]
+        pred_edge, _ = self.dijkstra(source, target)
+
+        if source != target and target not in pred_edge:
+            return []
+
+        path = [target]
+        while path[-1] != source:
+            path.append(self._edgeFromList[pred_edge[path[-1]]])
+
+        return [self._nodeFidList[idx] for idx in reversed(path)]
+
+    def tree(self, start_fid, reverse=False, max_depth=None, max_distance=None):
+        """
+        Extracts the tree reachable from a node.
+        Without distance limit a breadth first search is used, with a distance limit
+        the tree is made of the shortest paths.
+        :param reverse:      Follow the edges against their direction (upstream)
+        :param max_depth:    Do not follow more than this number of edges
+        :param max_distance: Do not reach nodes further away than this distance
+        :return:             A list of (from, to) node feature ids of the tree edges,
+                             oriented like in the graph. Without distance limit they are
+                             ordered by depth (number of edges) from the start node, with a
+                             distance limit by distance from the start node.
+        """
+        if start_fid not in self.nodeIndex:
+            return []
+
+        source = self.nodeIndex[start_fid]
+        if max_distance is None:
+            pred_edge, order = self.bfs(source, reverse=reverse, max_depth=max_depth)
+        else:
+            pred_edge, order = self.dijkstra(source, reverse=reverse, max_distance=max_distance)
+            if max_depth is not None:
+                pred_edge = self._limitDepth(pred_edge, order, source, reverse, max_depth)
+
+        node_fids = self._nodeFidList
+        edge_from = self._edgeFromList
+        edge_to = self._edgeToList
+
+        return [
+            (node_fids[edge_from[pred_edge[idx]]], node_fids[edge_to[pred_edge[idx]]])
+            for idx in order
+            if idx in pred_edge
+        ]
+
+    def _limitDepth(self, pred_edge, order, source, reverse, max_depth):
+        """
+        Drops the tree edges deeper than max_depth from a predecessor dict.
+        The order lists every node after its predecessor, as Dijkstra settles them.
+        """
+        parents = self._edgeToList if reverse else self._edgeFromList
+        depth = {source: 0}
+        limited = {}
+        for idx in order:
+            if idx not in pred_edge:
+                continue
+            parent = parents[pred_edge[idx]]
+            if parent not in depth:
+                # the predecessor is already too deep
+                continue
+            d = depth[parent] + 1
+            if d <= max_depth:
+                depth[idx] = d
+                limited[idx] = pred_edge[idx]
+
+        return limited
+
+    def cycleNodes(self, node_fids):
+        """
+        Detects loops within a set of nodes: the strongly connected components with more than
+        one node or with an edge to itself, found with Tarjan's algorithm in linear time.
+        :param node_fids: The feature ids of the nodes to check
+        :return:          The feature ids of the nodes on a loop
+        """
+        indptr, neighbours, _ = self._adjacency(False)
+        nodes = {self.nodeIndex[fid] for fid in node_fids if fid in self.nodeIndex}
+
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        loop_nodes = []
+
+        def visit(u):
+            index[u] = lowlink[u] = len(index)
+            stack.append(u)
+            on_stack.add(u)
+            return u, iter(range(indptr[u], indptr[u + 1]))
+
+        for root in nodes:
+            if root in index:
+                continue
+
+            work = [visit(root)]
+            while work:
+                u, edges = work[-1]
+                for i in edges:
+                    v = neighbours[i]
+                    if v not in nodes:
+                        continue
+                    if v not in index:
+                        work.append(visit(v))
+                        break
+                    if v in on_stack:
+                        lowlink[u] = min(lowlink[u], index[v])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[u])
+
+                    if lowlink[u] == index[u]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == u:
+                                break
+                        if len(component) > 1 or u in neighbours[indptr[u] : indptr[u + 1]]:
+                            loop_nodes.extend(component)
+
+        return [self._nodeFidList[idx] for idx in loop_nodes]
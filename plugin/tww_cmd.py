@@ -51,6 +51,11 @@ class TeksiWastewaterCmd:
             help="Put log files next to XTF import file",
             action="store_true",
         )
+        subparser.add_argument(
+            "--fast_import",
+            help="Import the core SIA405 classes with set-based SQL (ignored with --show_selection_dialog)",
+            action="store_true",
+        )
 
         self._add_postgres_connection_args(subparser)
 
@@ -171,6 +176,7 @@ class TeksiWastewaterCmd:
                 xtf_file_input=self.args.xtf_file,
                 show_selection_dialog=self.args.show_selection_dialog,
                 logs_next_to_file=self.args.logs_next_to_file,
+                fast_import=self.args.fast_import,
             )
 
             print(f"\nData successfully imported from {self.args.xtf_file}")